@@ -1,14 +1,20 @@
-from typing import Optional
+from typing import Callable, Optional
 from a1_support import *
+from bitboard import Bitboard
 
 FORWARD_DELTA = (1, 1)
 BACKWARD_DELTA = (-1, 1)
+# (column, row) steps for the four line directions a win can run along
+LINE_DELTAS = [(0, 1), (1, 0), FORWARD_DELTA, BACKWARD_DELTA]
 HELP_COMMAND = ["h", "H"]
 QUIT_COMMAND = ["q", "Q"]
 SPECIAL_COMMANDS = HELP_COMMAND + QUIT_COMMAND
 ADD_COMMAND = ["a", "A"]
 REMOVE_COMMAND = ["r", "R"]
 ACTIONS = ADD_COMMAND + REMOVE_COMMAND
+# Invalid commands a computer player may give in a row before play_game
+# gives up on it
+MAX_AGENT_RETRIES = 100
 
 def num_hours() -> float:
     """
@@ -79,39 +85,56 @@ def display_board(board: list[str]) -> None:
 
     print(display)
 
-def check_input(command: str) -> bool:
+def get_input_error(command: str) -> Optional[str]:
     """
-    Validate the user input command. A valid command format is 
-    1. "{action}{column}", where {action} may be "a", "A", "r" or "R"
-    and {column} is an integer with in the range of the board.
-    2. "h" or "H" or "q" or "Q"
+    Find what is wrong with a user input command, without printing it. 
+    See check_input for the valid command formats.
     
     Parameter:
         command (str): the user's input 
     
     Returns:
-        (bool): True if the command is well-fromatted, otherwise False
+        Optional[str]: the message describing the problem, or None if the
+        command is well-formatted
     """
     if command == "":
-        print(INVALID_FORMAT_MESSAGE)
-        return False
+        return INVALID_FORMAT_MESSAGE
     
     # Special commands
     if command in SPECIAL_COMMANDS:
-        return True
+        return None
     
     if command[0] in ACTIONS:
-        # Columns must be integers within the valid range
-        if command[1:].isdigit():
-            column_index = int(command[1:])
+        # Columns must be integers within the valid range. isdigit alone
+        # accepts characters such as "²" which int cannot parse
+        column = command[1:]
+        if column.isascii() and column.isdecimal():
+            column_index = int(column)
             if (1 <= column_index) and (column_index <= BOARD_SIZE):
-                return True
+                return None
             else:
-                print(INVALID_COLUMN_MESSAGE)
-                return False
+                return INVALID_COLUMN_MESSAGE
             
-    print(INVALID_FORMAT_MESSAGE)
-    return False
+    return INVALID_FORMAT_MESSAGE
+
+def check_input(command: str) -> bool:
+    """
+    Validate the user input command. A valid command format is 
+    1. "{action}{column}", where {action} may be "a", "A", "r" or "R"
+    and {column} is an integer with in the range of the board.
+    2. "h" or "H" or "q" or "Q"
+    
+    Parameter:
+        command (str): the user's input 
+    
+    Returns:
+        (bool): True if the command is well-fromatted, otherwise False
+    """
+    error = get_input_error(command)
+    if error is not None:
+        print(error)
+        return False
+    return True
 
 def get_action() -> str:
     """
@@ -127,6 +150,35 @@ def get_action() -> str:
     return command
 
 
+def get_agent_action(agent: Callable[[list[str], str], str],
+                     board: list[str], piece: str) -> str:
+    """
+    Get a command from a computer player, validated as get_action validates
+    the user's input, asking again after each invalid command
+
+    Parameters:
+        agent (Callable[[list[str], str], str]): the computer player, called
+            with a copy of the board and its piece
+        board (list[str]): the current game state
+        piece (str): the piece of the player to move
+
+    Returns:
+        (str): the well-formatted command
+
+    Raises:
+        ValueError: if the agent gives MAX_AGENT_RETRIES invalid commands in
+        a row
+    """
+    for _ in range(MAX_AGENT_RETRIES):
+        command = agent(list(board), piece)
+        print(f"{ENTER_COMMAND_MESSAGE}{command}")
+        if not isinstance(command, str):
+            print(INVALID_FORMAT_MESSAGE)
+        elif check_input(command):
+            return command
+    raise ValueError(f"agent gave {MAX_AGENT_RETRIES} invalid commands "
+                     f"in a row")
+
 def add_piece(board: list[str], piece: str, column_index: int) -> bool:
     """
     Add a piece to the top of a specific column in the board, 
@@ -147,14 +199,10 @@ def add_piece(board: list[str], piece: str, column_index: int) -> bool:
         print(FULL_COLUMN_MESSAGE)
         return False
     
-    # Extract old pieces in the column
-    old_pieces = ""
-    for old_piece in old_col:
-        if old_piece in PLAYER_1_PIECE + PLAYER_2_PIECE:
-            old_pieces += old_piece
-            
-    new_pieces = piece + old_pieces 
-    new_col = (BOARD_SIZE - len(new_pieces)) * BLANK_PIECE + new_pieces
+    # The pieces sit below every blank, so the new piece goes on top of
+    # them and the column loses one blank
+    top = old_col.count(BLANK_PIECE)
+    new_col = old_col[1:top] + piece + old_col[top:]
     
     board[column_index] = new_col
     return True
@@ -266,6 +314,20 @@ def check_win(board: list[str]) -> Optional[str]:
         Optional[str]: PLAYER_1_PIECE if player1 wins, PLAYER_2_PIECE 
         if player2 wins, BLANK_PIECE if it is a draw
     """
+    return Bitboard.from_board(board).winner()
+
+
+def _check_win_by_lines(board: list[str]) -> Optional[str]:
+    """
+    The original check_win, which extracts every column, row and diagonal
+    as a string and searches each for a winning run
+
+    Parameter:
+        board (list[str]): the current game state
+
+    Returns:
+        Optional[str]: the same result as check_win
+    """
     player1_win = False
     player2_win = False
     
@@ -282,47 +344,143 @@ def check_win(board: list[str]) -> Optional[str]:
     elif player2_win:
         return PLAYER_2_PIECE
     
+def get_changed_cells(board: list[str], column_index: int,
+                      added: bool) -> list[tuple[int, int]]:
+    """
+    Get the occupied cells changed by a successful add or remove
+
+    Parameters:
+        board (list[str]): the game state after the action
+        column_index (int): the column the action was applied to
+        added (bool): True if a piece was added, False if one was removed
+
+    Returns:
+        (list[tuple[int, int]]): the (column, row) of each changed cell
+    """
+    top_row = board[column_index].count(BLANK_PIECE)
+    if added:
+        return [(column_index, top_row)]
+
+    # Removing shifts every remaining piece in the column down by one
+    return [(column_index, row) for row in range(top_row, BOARD_SIZE)]
+
+def check_win_around(board: list[str],
+                     cells: list[tuple[int, int]]) -> Optional[str]:
+    """
+    Validate the game state by only inspecting lines through the given 
+    cells, with the same results as check_win
+
+    Pre-condition:
+        Nobody had won before the action that changed the cells
+    
+    Parameters:
+        board (list[str]): the current game state
+        cells (list[tuple[int, int]]): the (column, row) of each changed cell
+
+    Returns:
+        Optional[str]: PLAYER_1_PIECE if player1 wins, PLAYER_2_PIECE 
+        if player2 wins, BLANK_PIECE if it is a draw
+    """
+    player1_win = False
+    player2_win = False
+
+    for column, row in cells:
+        piece = board[column][row]
+        if piece == BLANK_PIECE:
+            continue
+        
+        for delta_col, delta_row in LINE_DELTAS:
+            # Count matching pieces on both sides of the cell
+            length = 1
+            for sign in (1, -1):
+                i = column + sign * delta_col
+                j = row + sign * delta_row
+                while length < REQUIRED_WIN_LENGTH and \
+                        0 <= i < BOARD_SIZE and 0 <= j < BOARD_SIZE and \
+                        board[i][j] == piece:
+                    length += 1
+                    i += sign * delta_col
+                    j += sign * delta_row
+            
+            if length >= REQUIRED_WIN_LENGTH:
+                if piece == PLAYER_1_PIECE:
+                    player1_win = True
+                else:
+                    player2_win = True
+                break
+
+    if player1_win and player2_win:
+        return BLANK_PIECE
+    elif player1_win:
+        return PLAYER_1_PIECE
+    elif player2_win:
+        return PLAYER_2_PIECE
+
 ####################################################################
 # Another way to approach the check_win by checking all neighbours #
 ####################################################################
-# def check_win(board: list[str]) -> Optional[str]:
-#     victor = None
+def _check_win_by_neighbours(board: list[str]) -> Optional[str]:
+    """
+    Validate the game state by checking the line of REQUIRED_WIN_LENGTH 
+    pieces starting at every piece, with the same results as check_win
+
+    Parameter:
+        board (list[str]): the current game state
 
-#     # Only need to check half the valid directions at each piece
-#     DELTAS = [(1,0),(0,1),(1,1),(1,-1)]
+    Returns:
+        Optional[str]: PLAYER_1_PIECE if player1 wins, PLAYER_2_PIECE 
+        if player2 wins, BLANK_PIECE if it is a draw
+    """
+    victor = None
+
+    # Only need to check half the valid directions at each piece
+    DELTAS = [(1,0),(0,1),(1,1),(1,-1)]
     
-#     for curr_col in range(BOARD_SIZE):
-#         for curr_row in range(BOARD_SIZE):
-#             candidate = board[curr_col][curr_row]
-#             # No point checking an empty space
-#             if not candidate == BLANK_PIECE: 
+    for curr_col in range(BOARD_SIZE):
+        for curr_row in range(BOARD_SIZE):
+            candidate = board[curr_col][curr_row]
+            # No point checking an empty space
+            if not candidate == BLANK_PIECE: 
                 
-#                 # Check victory along 4 potential vectors
-#                 for delta in DELTAS: 
-#                     won = True
-#                     for i in range(REQUIRED_WIN_LENGTH - 1):
-#                         check_col = curr_col + ((i+1) * delta[0])
-#                         check_row = curr_row + ((i+1) * delta[1])
-#                         if (not check_col in range(BOARD_SIZE)) or \
-#                                 (not check_row in range(BOARD_SIZE)) or \
-#                                 (not board[check_col][check_row] == \
-#                                   candidate):
-#                                     won = False
-#                                     break
-#                     if won:
-#                         if victor == None:
-#                             victor = candidate
-#                         elif victor != candidate:
-#                             victor = BLANK_PIECE
-#                             return victor
-    
-#     return victor
-
-def play_game() -> None:
+                # Check victory along 4 potential vectors
+                for delta in DELTAS: 
+                    won = True
+                    for i in range(REQUIRED_WIN_LENGTH - 1):
+                        check_col = curr_col + ((i+1) * delta[0])
+                        check_row = curr_row + ((i+1) * delta[1])
+                        if (not check_col in range(BOARD_SIZE)) or \
+                                (not check_row in range(BOARD_SIZE)) or \
+                                (not board[check_col][check_row] == \
+                                  candidate):
+                                    won = False
+                                    break
+                    if won:
+                        if victor == None:
+                            victor = candidate
+                        elif victor != candidate:
+                            victor = BLANK_PIECE
+                            return victor
+    
+    return victor
+
+def play_game(agents: Optional[dict[str, Callable[[list[str], str], str]]]
+              = None, record: Optional[Callable[[str], None]] = None
+              ) -> None:
     """
     Play one exact game until reaching a win condition or a player wants
     to quit
+
+    Parameters:
+        agents (Optional[dict[str, Callable[[list[str], str], str]]]): 
+            computer players by piece, each called with the board and its
+            piece to choose a command instead of prompting with get_action;
+            their commands are validated by get_agent_action
+        record (Optional[Callable[[str], None]]): called with the command
+            of every successful move, e.g. a MoveLogWriter
     """
+    if agents is None:
+        agents = {}
+    
     # Set up the game
     board = generate_initial_board()
     turn_count = 0
@@ -342,7 +500,10 @@ def play_game() -> None:
             display_board(board)
             print(player_move)
 
-        command = get_action()
+        if piece in agents:
+            command = get_agent_action(agents[piece], board, piece)
+        else:
+            command = get_action()
 
         if command in HELP_COMMAND:
             print(HELP_MESSAGE)
@@ -353,7 +514,8 @@ def play_game() -> None:
         else: # handle adding and removing the piece
             successful_move = False
             target_col = int(command[1:]) - 1
-            if command[0] in ADD_COMMAND:
+            added = command[0] in ADD_COMMAND
+            if added:
                 successful_move = add_piece(board, piece, target_col)
 
             elif command[0] in REMOVE_COMMAND:
@@ -361,8 +523,11 @@ def play_game() -> None:
 
             if successful_move:
                 turn_count += 1
-
-        winning_player = check_win(board)
+                if record is not None:
+                    record(command)
+                # Only lines through the changed cells can have a new winner
+                changed = get_changed_cells(board, target_col, added)
+                winning_player = check_win_around(board, changed)
 
     # Someone has won (Or the game was quit)
     if not winning_player == None:
@@ -0,0 +1,154 @@
+from typing import Optional
+import numpy as np
+from a1_support import *
+
+# Cell codes in a board array. Player 2 is negative so a window's sum is
+# +win_length or -win_length exactly when one player fills it.
+BLANK_CODE = 0
+PLAYER_1_CODE = 1
+PLAYER_2_CODE = -1
+
+# Result codes from get_winner_codes
+NO_WINNER = 0
+PLAYER_1_WINS = 1
+PLAYER_2_WINS = 2
+DRAW = 3
+
+RESULTS = [None, PLAYER_1_PIECE, PLAYER_2_PIECE, BLANK_PIECE]
+
+# Boards evaluated at once, bounding the temporary window-sum arrays
+CHUNK_SIZE = 1 << 16
+
+_PIECE_TO_CODE = np.zeros(256, dtype=np.int8)
+_PIECE_TO_CODE[ord(PLAYER_1_PIECE)] = PLAYER_1_CODE
+_PIECE_TO_CODE[ord(PLAYER_2_PIECE)] = PLAYER_2_CODE
+
+_CODE_TO_PIECE = np.full(256, ord(BLANK_PIECE), dtype=np.uint8)
+_CODE_TO_PIECE[PLAYER_1_CODE] = ord(PLAYER_1_PIECE)
+_CODE_TO_PIECE[PLAYER_2_CODE & 0xFF] = ord(PLAYER_2_PIECE)
+
+
+def boards_to_array(boards: list[list[str]]) -> np.ndarray:
+    """
+    Convert list[str] column boards to a board array
+
+    Parameter:
+        boards (list[list[str]]): the game states, one string per column,
+            all the same size
+
+    Returns:
+        (np.ndarray): an (N, rows, cols) int8 array of cell codes, with
+        row 0 at the top
+    """
+    if not boards:
+        return np.zeros((0, BOARD_SIZE, BOARD_SIZE), dtype=np.int8)
+
+    columns = len(boards[0])
+    rows = len(boards[0][0])
+    raw = "".join("".join(board) for board in boards).encode("ascii")
+    codes = _PIECE_TO_CODE[np.frombuffer(raw, dtype=np.uint8)]
+    return codes.reshape(len(boards), columns, rows).transpose(0, 2, 1).copy()
+
+
+def array_to_boards(array: np.ndarray) -> list[list[str]]:
+    """
+    Convert a board array back to list[str] column boards
+
+    Parameter:
+        array (np.ndarray): an (N, rows, cols) int8 array of cell codes
+
+    Returns:
+        (list[list[str]]): the game states, one string per column
+    """
+    count, rows, columns = array.shape
+    pieces = _CODE_TO_PIECE[array.transpose(0, 2, 1).astype(np.uint8)]
+    raw = np.ascontiguousarray(pieces).tobytes().decode("ascii")
+
+    size = rows * columns
+    return [[raw[start + c * rows:start + (c + 1) * rows]
+             for c in range(columns)]
+            for start in range(0, count * size, size)]
+
+
+def _window_extremes(boards: np.ndarray,
+                     win_length: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Find each board's largest and smallest sum over every window of
+    win_length cells in a line
+
+    Parameters:
+        boards (np.ndarray): an (N, rows, cols) int8 array of cell codes
+        win_length (int): the number of pieces in a line needed to win
+
+    Returns:
+        (tuple[np.ndarray, np.ndarray]): the (N,) maximum and minimum sums
+    """
+    count, rows, columns = boards.shape
+    span = win_length - 1
+    highest = np.full(count, -win_length, dtype=np.int8)
+    lowest = np.full(count, win_length, dtype=np.int8)
+
+    # (row step, column step) for vertical, horizontal and both diagonals
+    for delta_row, delta_col in ((1, 0), (0, 1), (1, 1), (-1, 1)):
+        row_count = rows - span * abs(delta_row)
+        column_count = columns - span * delta_col
+        if row_count <= 0 or column_count <= 0:
+            continue
+
+        sums = np.zeros((count, row_count, column_count), dtype=np.int8)
+        for k in range(win_length):
+            # Row offset of the k-th cell, counted from the top of the slice
+            row = k * delta_row if delta_row >= 0 else span - k
+            column = k * delta_col
+            sums += boards[:, row:row + row_count,
+                           column:column + column_count]
+
+        flat = sums.reshape(count, -1)
+        np.maximum(highest, flat.max(axis=1), out=highest)
+        np.minimum(lowest, flat.min(axis=1), out=lowest)
+
+    return highest, lowest
+
+
+def get_winner_codes(boards: np.ndarray,
+                     win_length: int = REQUIRED_WIN_LENGTH) -> np.ndarray:
+    """
+    Find the result of many boards at once
+
+    Parameters:
+        boards (np.ndarray): an (N, rows, cols) int8 array of cell codes
+        win_length (int): the number of pieces in a line needed to win
+
+    Returns:
+        (np.ndarray): an (N,) int8 array of NO_WINNER, PLAYER_1_WINS,
+        PLAYER_2_WINS or DRAW
+    """
+    boards = np.asarray(boards, dtype=np.int8)
+    results = np.empty(len(boards), dtype=np.int8)
+
+    for start in range(0, len(boards), CHUNK_SIZE):
+        chunk = boards[start:start + CHUNK_SIZE]
+        highest, lowest = _window_extremes(chunk, win_length)
+        player1_win = highest == win_length
+        player2_win = lowest == -win_length
+        results[start:start + CHUNK_SIZE] = player1_win + 2 * player2_win
+
+    return results
+
+
+def check_win_batch(boards: np.ndarray,
+                    win_length: int = REQUIRED_WIN_LENGTH
+                    ) -> list[Optional[str]]:
+    """
+    Validate many game states at once, with the same results as check_win
+
+    Parameters:
+        boards (np.ndarray): an (N, rows, cols) int8 array of cell codes
+        win_length (int): the number of pieces in a line needed to win
+
+    Returns:
+        (list[Optional[str]]): for each board, PLAYER_1_PIECE if player1
+        wins, PLAYER_2_PIECE if player2 wins, BLANK_PIECE if it is a draw,
+        otherwise None
+    """
+    return [RESULTS[code] for code in get_winner_codes(boards, win_length)]
@@ -0,0 +1,254 @@
+import argparse
+import csv
+import math
+import random
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+from a1_support import *
+import a1_solution
+from bitboard import Bitboard
+from game import Game, get_win_windows
+
+try:
+    from batch_win import boards_to_array, check_win_batch
+except ImportError:
+    # numpy is optional here; the batched strategy is skipped without it
+    check_win_batch = None
+
+DEFAULT_SIZES = [8, 16, 32, 64]
+DEFAULT_DENSITIES = [0.25, 0.5, 0.75]
+DEFAULT_BOARDS = 200
+DEFAULT_REPEAT = 3
+CSV_FIELDS = ["strategy", "size", "density", "boards", "seconds",
+              "microseconds_per_board"]
+
+
+@contextmanager
+def board_size(size: int) -> Iterator[None]:
+    """
+    Temporarily set a1_solution's BOARD_SIZE, which the original check_win
+    versions read as a global, so they can be timed on other board sizes
+
+    Parameter:
+        size (int): the board size to use inside the with block
+    """
+    original = a1_solution.BOARD_SIZE
+    a1_solution.BOARD_SIZE = size
+    try:
+        yield
+    finally:
+        a1_solution.BOARD_SIZE = original
+
+
+def random_board(size: int, density: float, rng: random.Random) -> list[str]:
+    """
+    Generate a reachable-looking board, with pieces stacked from the bottom
+    of each column
+
+    Parameters:
+        size (int): the number of rows and columns
+        density (float): the expected fraction of cells holding a piece
+        rng (random.Random): the source of randomness
+
+    Returns:
+        (list[str]): the board, one string per column
+    """
+    board = []
+    for _ in range(size):
+        height = sum(rng.random() < density for _ in range(size))
+        pieces = "".join(rng.choice(PLAYER_1_PIECE + PLAYER_2_PIECE)
+                         for _ in range(height))
+        board.append(BLANK_PIECE * (size - height) + pieces)
+    return board
+
+
+def _by_game(board: list[str]) -> Optional[str]:
+    """
+    (Optional[str]) Returns check_win's result using the win-window Game
+    """
+    return Game.from_board(board).get_winner()
+
+
+def _by_bitboard(board: list[str]) -> Optional[str]:
+    """
+    (Optional[str]) Returns check_win's result using the Bitboard engine
+    """
+    return Bitboard.from_board(board).winner()
+
+
+# Strategies called once per board
+STRATEGIES: dict[str, Callable[[list[str]], Optional[str]]] = {
+    "lines": a1_solution._check_win_by_lines,
+    "neighbours": a1_solution._check_win_by_neighbours,
+    "bitboard": _by_bitboard,
+    "game": _by_game,
+}
+
+
+def time_strategy(name: str, boards: list[list[str]],
+                  repeat: int) -> tuple[float, list[Optional[str]]]:
+    """
+    Time one strategy over a set of boards, keeping the best of several runs
+
+    Parameters:
+        name (str): the strategy name, a STRATEGIES key or "numpy_batch"
+        boards (list[list[str]]): the boards to evaluate
+        repeat (int): the number of timed runs
+
+    Returns:
+        (tuple[float, list[Optional[str]]]): the best run's seconds, and the
+        results for checking against the other strategies
+    """
+    best = math.inf
+    results = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if name == "numpy_batch":
+            results = check_win_batch(boards_to_array(boards))
+        else:
+            strategy = STRATEGIES[name]
+            results = [strategy(board) for board in boards]
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+def run_benchmark(sizes: list[int], densities: list[float], boards: int,
+                  repeat: int, seed: int) -> list[dict]:
+    """
+    Time every strategy on random boards of each size and density
+
+    Parameters:
+        sizes (list[int]): the board sizes to test
+        densities (list[float]): the piece densities to test
+        boards (int): the number of boards per size and density
+        repeat (int): the number of timed runs per measurement
+        seed (int): the seed for generating the boards
+
+    Returns:
+        (list[dict]): one row per measurement, with the CSV_FIELDS keys
+
+    Raises:
+        AssertionError: if any strategy disagrees with the line version
+    """
+    names = list(STRATEGIES)
+    if check_win_batch is not None:
+        names.append("numpy_batch")
+
+    rng = random.Random(seed)
+    rows = []
+    for size in sizes:
+        # Build the win windows outside the timed runs, as a Game would
+        get_win_windows(size, size, REQUIRED_WIN_LENGTH)
+        for density in densities:
+            sample = [random_board(size, density, rng)
+                      for _ in range(boards)]
+            expected = None
+            with board_size(size):
+                for name in names:
+                    seconds, results = time_strategy(name, sample, repeat)
+                    if expected is None:
+                        expected = results
+                    assert results == expected, f"{name} disagrees"
+                    rows.append({
+                        "strategy": name,
+                        "size": size,
+                        "density": density,
+                        "boards": boards,
+                        "seconds": seconds,
+                        "microseconds_per_board": 1e6 * seconds / boards,
+                    })
+    return rows
+
+
+def write_csv(rows: list[dict], path: str) -> None:
+    """
+    Write benchmark rows to a CSV file
+
+    Parameters:
+        rows (list[dict]): the rows from run_benchmark
+        path (str): the file to write
+    """
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def scaling_report(rows: list[dict]) -> str:
+    """
+    Summarise how each strategy's cost grows with board size
+
+    The exponent is the least squares slope of log(time per board) against
+    log(size), averaged over densities, so 2 means cost grows with the
+    number of cells.
+
+    Parameter:
+        rows (list[dict]): the rows from run_benchmark
+
+    Returns:
+        (str): a table of microseconds per board by size, with the fitted
+        exponent and the fastest strategy at each size
+    """
+    sizes = sorted({row["size"] for row in rows})
+    names = list(dict.fromkeys(row["strategy"] for row in rows))
+    mean_time = {}
+    for name in names:
+        for size in sizes:
+            times = [row["microseconds_per_board"] for row in rows
+                     if row["strategy"] == name and row["size"] == size]
+            mean_time[name, size] = sum(times) / len(times)
+
+    header = f"{'strategy':<12}" + "".join(f"{size:>12}" for size in sizes)
+    lines = ["Mean microseconds per board by board size",
+             header + f"{'exponent':>10}"]
+    for name in names:
+        times = [mean_time[name, size] for size in sizes]
+        line = f"{name:<12}" + "".join(f"{t:>12.1f}" for t in times)
+        lines.append(line + f"{_slope(sizes, times):>10.2f}")
+
+    fastest = [min(names, key=lambda name: mean_time[name, size])
+               for size in sizes]
+    lines.append(f"{'fastest':<12}" + "".join(f"{name:>12}"
+                                              for name in fastest))
+    return "\n".join(lines)
+
+
+def _slope(sizes: list[int], times: list[float]) -> float:
+    """
+    (float) Returns the least squares slope of log(times) on log(sizes)
+    """
+    if len(sizes) < 2:
+        return math.nan
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(t) for t in times]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return covariance / variance
+
+
+def main() -> None:
+    """
+    Run the benchmark from the command line, writing the CSV and printing
+    the scaling report
+    """
+    parser = argparse.ArgumentParser(
+        description="Compare check_win strategies across board sizes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--densities", type=float, nargs="+",
+                        default=DEFAULT_DENSITIES)
+    parser.add_argument("--boards", type=int, default=DEFAULT_BOARDS)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="check_win_benchmark.csv")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.sizes, args.densities, args.boards,
+                         args.repeat, args.seed)
+    write_csv(rows, args.output)
+    print(scaling_report(rows))
+
+if __name__ == "__main__":
+    main()
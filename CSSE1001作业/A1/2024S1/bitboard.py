@@ -0,0 +1,309 @@
+from typing import Optional
+from a1_support import *
+
+# Bit layout: column c owns bits c * (rows + 1) ... c * (rows + 1) + rows - 1,
+# bottom piece first. The extra bit on top of every column is a permanently
+# empty sentinel so horizontal and diagonal shifts never wrap between columns.
+
+# A move is (is_add, column_index)
+Move = tuple[bool, int]
+
+
+class Bitboard:
+    """
+    A connect-four board stored as one integer mask per player
+    """
+
+    def __init__(self, rows: int = BOARD_SIZE, columns: int = BOARD_SIZE,
+                 win_length: int = REQUIRED_WIN_LENGTH) -> None:
+        """
+        Construct an empty bitboard
+
+        Parameters:
+            rows (int): the number of rows on the board
+            columns (int): the number of columns on the board
+            win_length (int): the number of pieces in a line needed to win
+        """
+        self._rows = rows
+        self._columns = columns
+        self._win_length = win_length
+        self._stride = rows + 1
+
+        self._masks = {PLAYER_1_PIECE: 0, PLAYER_2_PIECE: 0}
+        self._heights = [0] * columns
+
+        # The legal moves in each column, by whether it is empty, partly
+        # filled or full; only a column whose state changes is refreshed
+        self._move_table = [(((True, c),), ((True, c), (False, c)),
+                             ((False, c),)) for c in range(columns)]
+        self._column_moves = [moves[0] for moves in self._move_table]
+        self._legal_moves = None
+
+        # Vertical, horizontal and the two diagonal directions
+        self._shifts = (1, self._stride, self._stride - 1, self._stride + 1)
+
+        # Run lengths double each step, so a line needs O(log win_length)
+        # shifts: after shifting by each step in turn, bit i is set iff bits
+        # i, i + shift, ..., i + (win_length - 1) * shift all were
+        steps = []
+        length = 1
+        while length < win_length:
+            step = min(length, win_length - length)
+            steps.append(step)
+            length += step
+        self._line_shifts = tuple(tuple(shift * step for step in steps)
+                                  for shift in self._shifts)
+        self._column_masks = [((1 << rows) - 1) << (c * self._stride)
+                              for c in range(columns)]
+
+    @classmethod
+    def from_board(cls, board: list[str],
+                   win_length: int = REQUIRED_WIN_LENGTH) -> "Bitboard":
+        """
+        Build a bitboard from the list[str] column representation
+
+        Parameters:
+            board (list[str]): the game state, one string per column
+            win_length (int): the number of pieces in a line needed to win
+
+        Returns:
+            (Bitboard): the equivalent bitboard
+        """
+        rows = len(board[0]) if board else 0
+        bitboard = cls(rows, len(board), win_length)
+        masks = bitboard._masks
+        for c, column in enumerate(board):
+            base = c * bitboard._stride
+            # Set every piece, even ones floating above a blank, so wins
+            # match check_win on any board
+            for height, piece in enumerate(reversed(column)):
+                if piece != BLANK_PIECE:
+                    masks[piece] |= 1 << (base + height)
+            bitboard._heights[c] = rows - column.count(BLANK_PIECE)
+            bitboard._refresh_column(c)
+        return bitboard
+
+    def to_board(self) -> list[str]:
+        """
+        Convert the bitboard back to the list[str] column representation
+
+        Returns:
+            (list[str]): the game state, one string per column
+        """
+        player_1 = self._masks[PLAYER_1_PIECE]
+        board = []
+        for c in range(self._columns):
+            base = c * self._stride
+            pieces = ""
+            for height in range(self._heights[c] - 1, -1, -1):
+                if player_1 >> (base + height) & 1:
+                    pieces += PLAYER_1_PIECE
+                else:
+                    pieces += PLAYER_2_PIECE
+            board.append(BLANK_PIECE * (self._rows - len(pieces)) + pieces)
+        return board
+
+    def copy(self) -> "Bitboard":
+        """
+        (Bitboard) Returns an independent copy of this bitboard
+        """
+        other = Bitboard.__new__(Bitboard)
+        other.__dict__.update(self.__dict__)
+        other._masks = dict(self._masks)
+        other._heights = list(self._heights)
+        other._column_moves = list(self._column_moves)
+        return other
+
+    def get_state(self) -> tuple:
+        """
+        (tuple) Returns a snapshot of the player masks, column heights and
+        legal moves which can be passed back to set_state
+        """
+        return (self._masks[PLAYER_1_PIECE], self._masks[PLAYER_2_PIECE],
+                tuple(self._heights), tuple(self._column_moves),
+                self._legal_moves)
+
+    def set_state(self, state: tuple) -> None:
+        """
+        Restore a snapshot taken by get_state
+
+        Parameter:
+            state (tuple): the snapshot to restore
+        """
+        player_1, player_2, heights, column_moves, legal_moves = state
+        self._masks[PLAYER_1_PIECE] = player_1
+        self._masks[PLAYER_2_PIECE] = player_2
+        self._heights[:] = heights
+        self._column_moves[:] = column_moves
+        self._legal_moves = legal_moves
+
+    def set_masks(self, player_1: int, player_2: int) -> None:
+        """
+        Replace the position with the given player masks, whose pieces
+        must be stacked from the bottom of each column
+
+        Parameters:
+            player_1 (int): the occupancy mask of player 1's pieces
+            player_2 (int): the occupancy mask of player 2's pieces
+        """
+        self._masks[PLAYER_1_PIECE] = player_1
+        self._masks[PLAYER_2_PIECE] = player_2
+        occupied = player_1 | player_2
+        for c, column_mask in enumerate(self._column_masks):
+            self._heights[c] = (occupied & column_mask).bit_count()
+            self._refresh_column(c)
+
+    def get_dimensions(self) -> tuple[int, int]:
+        """
+        (tuple[int, int]) Returns the (rows, columns) of the board
+        """
+        return self._rows, self._columns
+
+    def get_mask(self, piece: str) -> int:
+        """
+        (int) Returns the occupancy mask of the given player's pieces
+        """
+        return self._masks[piece]
+
+    def get_win_length(self) -> int:
+        """
+        (int) Returns the number of pieces in a line needed to win
+        """
+        return self._win_length
+
+    def get_bit(self, column_index: int, height: int) -> int:
+        """
+        (int) Returns the bit index of the cell at the given height
+        (0 at the bottom) of a column
+        """
+        return column_index * self._stride + height
+
+    def get_height(self, column_index: int) -> int:
+        """
+        (int) Returns the number of pieces in the given column
+        """
+        return self._heights[column_index]
+
+    def is_column_full(self, column_index: int) -> bool:
+        """
+        (bool) Returns True if the given column has no room left
+        """
+        return self._heights[column_index] == self._rows
+
+    def is_column_empty(self, column_index: int) -> bool:
+        """
+        (bool) Returns True if the given column has no pieces
+        """
+        return self._heights[column_index] == 0
+
+    def add_piece(self, piece: str, column_index: int) -> bool:
+        """
+        Add a piece to the top of a column, if the column is not full
+
+        Parameters:
+            piece (str): the type of piece to be added
+            column_index (int): the index of the column to add to
+
+        Returns:
+            (bool): True if the piece was added, otherwise False
+        """
+        height = self._heights[column_index]
+        if height == self._rows:
+            return False
+
+        self._masks[piece] |= 1 << (column_index * self._stride + height)
+        self._heights[column_index] = height + 1
+        if height == 0 or height + 1 == self._rows:
+            self._refresh_column(column_index)
+        return True
+
+    def remove_piece(self, column_index: int) -> bool:
+        """
+        Remove the bottom piece of a column, if the column is not empty,
+        dropping the rest of the column down by one
+
+        Parameters:
+            column_index (int): the index of the column to remove from
+
+        Returns:
+            (bool): True if a piece was removed, otherwise False
+        """
+        height = self._heights[column_index]
+        if height == 0:
+            return False
+
+        column_mask = self._column_masks[column_index]
+        for piece, mask in self._masks.items():
+            shifted = ((mask & column_mask) >> 1) & column_mask
+            self._masks[piece] = (mask & ~column_mask) | shifted
+        self._heights[column_index] = height - 1
+        if height == 1 or height == self._rows:
+            self._refresh_column(column_index)
+        return True
+
+    def legal_moves(self) -> list[Move]:
+        """
+        Get every legal move, by column, with a column's add before its
+        remove. The list is shared until a column fills or empties, so it
+        must not be changed.
+
+        Returns:
+            (list[Move]): the legal (is_add, column_index) moves
+        """
+        if self._legal_moves is None:
+            self._legal_moves = [move for moves in self._column_moves
+                                 for move in moves]
+        return self._legal_moves
+
+    def _refresh_column(self, column_index: int) -> None:
+        """
+        Update the legal moves of a column after its height changed
+        """
+        height = self._heights[column_index]
+        if height == 0:
+            state = 0
+        elif height < self._rows:
+            state = 1
+        else:
+            state = 2
+        self._column_moves[column_index] = \
+            self._move_table[column_index][state]
+        self._legal_moves = None
+
+    def has_won(self, piece: str) -> bool:
+        """
+        Check if a player has win_length pieces in a line
+
+        Parameter:
+            piece (str): the player to check
+
+        Returns:
+            (bool): True if the player has a winning line, otherwise False
+        """
+        mask = self._masks[piece]
+        for shifts in self._line_shifts:
+            line = mask
+            for shift in shifts:
+                line &= line >> shift
+            if line:
+                return True
+        return False
+
+    def winner(self) -> Optional[str]:
+        """
+        Determine the result of the current position with the same rules
+        as check_win
+
+        Returns:
+            Optional[str]: PLAYER_1_PIECE if player1 wins, PLAYER_2_PIECE
+            if player2 wins, BLANK_PIECE if both win, otherwise None
+        """
+        player1_win = self.has_won(PLAYER_1_PIECE)
+        player2_win = self.has_won(PLAYER_2_PIECE)
+
+        if player1_win and player2_win:
+            return BLANK_PIECE
+        elif player1_win:
+            return PLAYER_1_PIECE
+        elif player2_win:
+            return PLAYER_2_PIECE
@@ -0,0 +1,721 @@
+import mmap
+import os
+import struct
+import sys
+from typing import Iterator, Optional
+import numpy as np
+from a1_support import *
+from bitboard import Bitboard, Move
+
+# File layout:
+#   header: MAGIC, rows, columns, win length, the index size N and the
+#           number of reachable positions
+#   values: N little-endian uint16 values, one per canonical index, with
+#           UNREACHABLE for indices no game reaches
+#
+# A position's key numbers each column by its pieces, bottom first: a
+# column of h pieces with player 2 pieces at the set bits of b has code
+# 2 ** h - 1 + b. The key is the column codes as digits in base
+# 2 ** (rows + 1) - 1, and the canonical position is the one of the
+# position and its mirror image with the smaller key, which always has
+# the same value. Its last column's code is never larger than its first
+# column's, so the canonical index numbers the (last, first) pair among
+# the base * (base + 1) / 2 such pairs, then the inner columns as digits.
+# Only the few canonical positions with equal outer columns whose mirror
+# has a smaller key are wasted.
+#
+# Adds and removes both change the piece count by one, so the player to
+# move is always player 1 when the count is even and is not stored.
+MAGIC = b"C4EGDB02"
+HEADER = struct.Struct("<8sHHHxxQQ")
+
+# Values are from the point of view of the player to move. The top two
+# bits give the result, the rest the number of moves until it with perfect
+# play: the winner ends the game as soon as possible, the loser as late as
+# possible. Drawn positions either end in a draw or can be played forever.
+DRAW = 0
+WIN = 1
+LOSS = 2
+RESULT_SHIFT = 14
+DISTANCE_MASK = (1 << RESULT_SHIFT) - 1
+# The unused fourth result marks indices no game reaches, and while
+# solving, reached positions whose value is not yet known
+UNREACHABLE = 0xFFFF
+_UNKNOWN = 0xFFFE
+
+# Largest index the solver will accept. Solving holds a uint16 value and a
+# uint8 move count per index, so this is about 3 GB of memory; a 5x5 board
+# has 5.0e8 indices. The frontiers between passes are held as uint32,
+# which fits every index below it.
+MAX_INDEX_SIZE = 1 << 30
+# Positions handled at once by the vectorized passes, bounding the
+# temporary arrays of their moves
+SOLVE_CHUNK = 1 << 18
+# Indices scanned at once for the positions finished on the first move
+SCAN_CHUNK = 1 << 24
+
+
+class _Encoding:
+    """
+    Tables for moving between column codes, canonical indices and
+    bitboards for one board configuration
+    """
+
+    def __init__(self, rows: int, columns: int) -> None:
+        """
+        Build the tables
+
+        Parameters:
+            rows (int): the number of rows on the board
+            columns (int): the number of columns on the board
+        """
+        self.rows = rows
+        self.columns = columns
+        self.base = (1 << (rows + 1)) - 1
+        self.powers = [self.base ** c for c in range(columns)]
+        self.inner_size = self.base ** max(columns - 2, 0)
+        if columns == 1:
+            self.size = self.base
+        else:
+            self.size = self.base * (self.base + 1) // 2 * self.inner_size
+
+        # Per column code: height, player masks, and the codes after moves
+        self.heights = []
+        self.player_1_bits = []
+        self.player_2_bits = []
+        self.added = []
+        self.removed = []
+        for code in range(self.base):
+            height = (code + 1).bit_length() - 1
+            player_2 = code - ((1 << height) - 1)
+            self.heights.append(height)
+            self.player_2_bits.append(player_2)
+            self.player_1_bits.append(((1 << height) - 1) & ~player_2)
+            if height < rows:
+                start = (1 << (height + 1)) - 1
+                self.added.append((start + player_2,
+                                   start + player_2 + (1 << height)))
+            else:
+                self.added.append(None)
+            if height > 0:
+                self.removed.append((1 << (height - 1)) - 1 + (player_2 >> 1))
+            else:
+                self.removed.append(None)
+
+    def key(self, codes: list[int]) -> int:
+        """
+        (int) Returns the key of a list of column codes
+        """
+        return sum(code * power for code, power in zip(codes, self.powers))
+
+    def index(self, codes: list[int]) -> int:
+        """
+        (int) Returns the canonical index of a position, folding in the
+        mirror image
+        """
+        if self.key(codes[::-1]) < self.key(codes):
+            codes = codes[::-1]
+        if self.columns == 1:
+            return codes[0]
+        first, last = codes[0], codes[-1]
+        return ((first * (first + 1) // 2 + last) * self.inner_size
+                + self.key(codes[1:-1]))
+
+    def from_bitboard(self, bitboard: Bitboard) -> list[int]:
+        """
+        (list[int]) Returns the column codes of a bitboard position
+        """
+        player_2 = bitboard.get_mask(PLAYER_2_PIECE)
+        codes = []
+        for c in range(self.columns):
+            height = bitboard.get_height(c)
+            bits = (player_2 >> bitboard.get_bit(c, 0)) & ((1 << height) - 1)
+            codes.append((1 << height) - 1 + bits)
+        return codes
+
+    def piece_to_move(self, codes: list[int]) -> str:
+        """
+        (str) Returns the piece of the player to move in a position
+        """
+        pieces = sum(self.heights[code] for code in codes)
+        return PLAYER_1_PIECE if pieces % 2 == 0 else PLAYER_2_PIECE
+
+    def successors(self, codes: list[int]) -> list[tuple[Move, list[int]]]:
+        """
+        (list[tuple[Move, list[int]]]) Returns every legal move with the
+        column codes after it
+        """
+        is_player_1 = self.piece_to_move(codes) == PLAYER_1_PIECE
+        moves = []
+        for c, code in enumerate(codes):
+            if self.added[code] is not None:
+                child = list(codes)
+                child[c] = self.added[code][0 if is_player_1 else 1]
+                moves.append(((True, c), child))
+            if self.removed[code] is not None:
+                child = list(codes)
+                child[c] = self.removed[code]
+                moves.append(((False, c), child))
+        return moves
+
+
+def _line_shifts(rows: int, win_length: int) -> list[list[int]]:
+    """
+    (list[list[int]]) Returns the shifts which find lines in a player mask,
+    as Bitboard.has_won applies them: for each direction, shifting by each
+    in turn leaves bit i set iff a line starts there
+    """
+    steps = []
+    length = 1
+    while length < win_length:
+        step = min(length, win_length - length)
+        steps.append(step)
+        length += step
+    stride = rows + 1
+    return [[shift * step for step in steps]
+            for shift in (1, stride, stride - 1, stride + 1)]
+
+
+def _chunks(indices: np.ndarray) -> Iterator[np.ndarray]:
+    """
+    (Iterator[np.ndarray]) Yields an index array SOLVE_CHUNK at a time
+    """
+    for start in range(0, len(indices), SOLVE_CHUNK):
+        yield indices[start:start + SOLVE_CHUNK]
+
+
+def _unique(indices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Find the distinct values of an index array by sorting, which is much
+    faster than np.unique on these arrays
+
+    Returns:
+        (tuple[np.ndarray, np.ndarray]): the sorted distinct values and the
+        number of times each appears
+    """
+    ordered = np.sort(indices)
+    if not len(ordered):
+        return ordered, ordered
+    starts = np.flatnonzero(np.concatenate(([True],
+                                            ordered[1:] != ordered[:-1])))
+    return ordered[starts], np.diff(np.append(starts, len(ordered)))
+
+
+class _Batch:
+    """
+    The column codes of a batch of positions as a (columns, N) array, with
+    the parts of their canonical indices: the keys of the positions and of
+    their mirror images, and the inner columns as digits read either way
+    """
+
+    def __init__(self, solver: "_Solver", codes: np.ndarray) -> None:
+        self.codes = codes
+        self.keys = solver.powers @ codes
+        self.mirror_keys = solver.powers[::-1] @ codes
+        self.inner = solver.inner_powers @ codes[1:-1]
+        self.mirror_inner = solver.inner_powers @ codes[-2:0:-1]
+
+
+class _Solver:
+    """
+    Values every position of a configuration with vectorized passes over
+    arrays indexed by canonical index
+    """
+
+    def __init__(self, rows: int, columns: int, win_length: int) -> None:
+        """
+        Allocate the value and move count arrays and build the tables
+
+        Parameters:
+            rows (int): the number of rows on the board
+            columns (int): the number of columns on the board
+            win_length (int): the number of pieces in a line needed to win
+        """
+        encoding = self._encoding = _Encoding(rows, columns)
+        self.values = np.full(encoding.size, UNREACHABLE, dtype=np.uint16)
+        # The moves of each unfinished position not yet known to lead to a
+        # win for the opponent
+        self._open_moves = np.zeros(encoding.size, dtype=np.uint8)
+
+        self.powers = np.array(encoding.powers, dtype=np.int64)
+        self.inner_powers = self.powers[:max(columns - 2, 0)]
+        self._shifts = np.arange(columns, dtype=np.int64)[:, None] * (rows + 1)
+        self._line_shifts = _line_shifts(rows, win_length)
+        self._heights = np.array(encoding.heights, dtype=np.int64)
+        self._player_1_bits = np.array(encoding.player_1_bits, dtype=np.int64)
+        self._player_2_bits = np.array(encoding.player_2_bits, dtype=np.int64)
+        self._move_counts = np.array(
+            [(added is not None) + (removed is not None)
+             for added, removed in zip(encoding.added, encoding.removed)],
+            dtype=np.uint8)
+
+        # Codes after each move, or -1 where it is illegal. Adds are by the
+        # piece to move, player 1 first; undoing a remove puts either piece
+        # back at the bottom; undoing an add needs the top piece to be that
+        # of the player who moved, player 1 first.
+        self._added = np.full((2, encoding.base), -1, dtype=np.int64)
+        self._removed = np.full(encoding.base, -1, dtype=np.int64)
+        self._unremoved = np.full((2, encoding.base), -1, dtype=np.int64)
+        self._unadded = np.full((2, encoding.base), -1, dtype=np.int64)
+        for code in range(encoding.base):
+            if encoding.added[code] is not None:
+                self._added[:, code] = encoding.added[code]
+                self._unadded[0, encoding.added[code][0]] = code
+                self._unadded[1, encoding.added[code][1]] = code
+                start = (1 << (encoding.heights[code] + 1)) - 1
+                bits = encoding.player_2_bits[code] << 1
+                self._unremoved[:, code] = (start + bits, start + bits + 1)
+            if encoding.removed[code] is not None:
+                self._removed[code] = encoding.removed[code]
+
+    def _decode(self, indices: np.ndarray) -> _Batch:
+        """
+        (_Batch) Returns the canonical positions at some indices
+        """
+        encoding = self._encoding
+        indices = indices.astype(np.int64)
+        codes = np.empty((encoding.columns, len(indices)), dtype=np.int64)
+        if encoding.columns == 1:
+            codes[0] = indices
+            return _Batch(self, codes)
+
+        pair, inner = np.divmod(indices, encoding.inner_size)
+        first = ((np.sqrt(8 * pair + 1) - 1) // 2).astype(np.int64)
+        # Correct any rounding of the square root
+        first -= first * (first + 1) // 2 > pair
+        first += (first + 1) * (first + 2) // 2 <= pair
+        codes[0] = first
+        codes[-1] = pair - first * (first + 1) // 2
+        for c in range(1, encoding.columns - 1):
+            inner, codes[c] = np.divmod(inner, encoding.base)
+        return _Batch(self, codes)
+
+    def _changed(self, batch: _Batch, column_index: int,
+                 new_codes: np.ndarray
+                 ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find the canonical positions after changing one column of each
+        position in a batch, without building their codes
+
+        Parameters:
+            batch (_Batch): the positions
+            column_index (int): the column to change
+            new_codes (np.ndarray): each position's new code for the column,
+                or -1 where the change is illegal
+
+        Returns:
+            (tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]): which
+            changes are legal, then for every position the canonical index
+            and the keys of the changed position and of its mirror image,
+            which are meaningless where the change is illegal
+        """
+        encoding = self._encoding
+        last_column = encoding.columns - 1
+        # Masking out the illegal changes only at the end is faster than
+        # masking every array
+        codes = batch.codes
+        delta = new_codes - codes[column_index]
+        keys = batch.keys + delta * self.powers[column_index]
+        mirror_keys = batch.mirror_keys \
+            + delta * self.powers[last_column - column_index]
+        if encoding.columns == 1:
+            return new_codes >= 0, keys, keys, mirror_keys
+
+        first = new_codes if column_index == 0 else codes[0]
+        last = new_codes if column_index == last_column else codes[-1]
+        inner = batch.inner
+        mirror_inner = batch.mirror_inner
+        if 0 < column_index < last_column:
+            inner = inner + delta * self.powers[column_index - 1]
+            mirror_inner = mirror_inner \
+                + delta * self.powers[last_column - 1 - column_index]
+
+        flip = mirror_keys < keys
+        indices = np.where(
+            flip, (last * (last + 1) // 2 + first) * encoding.inner_size
+            + mirror_inner,
+            (first * (first + 1) // 2 + last) * encoding.inner_size + inner)
+        return new_codes >= 0, indices, keys, mirror_keys
+
+    def _pieces(self, batch: _Batch) -> np.ndarray:
+        """
+        (np.ndarray) Returns the number of pieces on each board of a batch
+        """
+        return self._heights[batch.codes].sum(axis=0)
+
+    def _has_won(self, mask: np.ndarray) -> np.ndarray:
+        """
+        (np.ndarray) Returns which of a batch of player masks hold a line
+        """
+        won = np.zeros(len(mask), dtype=bool)
+        for shifts in self._line_shifts:
+            line = mask
+            for shift in shifts:
+                line = line & (line >> shift)
+            won |= line != 0
+        return won
+
+    def _finished_values(self, batch: _Batch) -> np.ndarray:
+        """
+        (np.ndarray) Returns the values of the finished games in a batch of
+        positions, and _UNKNOWN for the others
+        """
+        player_1_won = self._has_won(
+            (self._player_1_bits[batch.codes] << self._shifts).sum(axis=0))
+        player_2_won = self._has_won(
+            (self._player_2_bits[batch.codes] << self._shifts).sum(axis=0))
+        player_2_to_move = self._pieces(batch) % 2 == 1
+
+        values = np.full(len(batch.keys), _UNKNOWN, dtype=np.uint16)
+        values[player_1_won | player_2_won] = LOSS << RESULT_SHIFT
+        values[np.where(player_2_to_move, player_2_won & ~player_1_won,
+                        player_1_won & ~player_2_won)] = WIN << RESULT_SHIFT
+        values[player_1_won & player_2_won] = DRAW << RESULT_SHIFT
+        return values
+
+    def _visit(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Record positions as reached, valuing the finished games among them
+
+        Parameter:
+            indices (np.ndarray): canonical indices, possibly repeated or
+                already reached
+
+        Returns:
+            (np.ndarray): the indices of the newly reached positions whose
+            games are not finished
+        """
+        indices, _ = _unique(indices[self.values[indices] == UNREACHABLE])
+        batch = self._decode(indices)
+        values = self._finished_values(batch)
+        self.values[indices] = values
+
+        unfinished = values == _UNKNOWN
+        self._open_moves[indices[unfinished]] = \
+            self._move_counts[batch.codes[:, unfinished]].sum(axis=0)
+        return indices[unfinished].astype(np.uint32)
+
+    def explore(self) -> None:
+        """
+        Reach every position a game can, breadth first from the empty
+        board, valuing the finished games
+        """
+        columns = self._encoding.columns
+        frontier = self._visit(np.array([self._encoding.index([0] * columns)],
+                                        dtype=np.int64))
+        while len(frontier):
+            found = []
+            for indices in _chunks(frontier):
+                batch = self._decode(indices)
+                player_2 = self._pieces(batch) % 2
+                children = []
+                for c, codes in enumerate(batch.codes):
+                    for new_codes in (self._added[player_2, codes],
+                                      self._removed[codes]):
+                        legal, indices, _, _ = self._changed(batch, c,
+                                                             new_codes)
+                        children.append(indices[legal])
+                found.append(self._visit(np.concatenate(children)))
+            frontier = np.concatenate(found)
+
+    def _parents(self, batch: _Batch) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find the unresolved positions with moves to a batch of canonical
+        positions
+
+        Parameter:
+            batch (_Batch): the positions moved to
+
+        Returns:
+            (tuple[np.ndarray, np.ndarray]): the canonical index of each
+            parent, with repeats, and its number of moves to the batch
+        """
+        # Undoing each move of a canonical position gives the raw positions
+        # moving to it. Those moving to its mirror image are their mirror
+        # images, and each parent's moves are counted from its own canonical
+        # position: from the raw parent, from its mirror, or from both when
+        # it is symmetric but the position moved to is not.
+        asymmetric = batch.keys != batch.mirror_keys
+        # After an even number of pieces, player 2 made the last move
+        mover = 1 - self._pieces(batch) % 2
+        parents = []
+        edges = []
+        for c, codes in enumerate(batch.codes):
+            for undo in (self._unadded[mover, codes],
+                         self._unremoved[0, codes],
+                         self._unremoved[1, codes]):
+                legal, indices, keys, mirror_keys = self._changed(batch, c,
+                                                                  undo)
+                count = (keys <= mirror_keys).astype(np.uint8)
+                count += asymmetric & (mirror_keys <= keys)
+                counted = legal & (count > 0)
+                indices = indices[counted]
+                count = count[counted]
+                open_parent = self.values[indices] == _UNKNOWN
+                parents.append(indices[open_parent])
+                edges.append(count[open_parent])
+        return np.concatenate(parents), np.concatenate(edges)
+
+    def _resolve(self, indices: np.ndarray, result: int,
+                 distance: int) -> np.ndarray:
+        """
+        Resolve the parents of positions whose values are all the given
+        result in distance - 1 moves: the parents of losses are wins, and
+        parents whose last open move was to a win are losses
+
+        Returns:
+            (np.ndarray): the newly resolved parents
+        """
+        parents, edges = self._parents(self._decode(indices))
+        value = min(distance, DISTANCE_MASK)
+        if result == LOSS:
+            parents, _ = _unique(parents)
+            self.values[parents] = (WIN << RESULT_SHIFT) | value
+            return parents.astype(np.uint32)
+
+        parents, counts = _unique(np.repeat(parents, edges))
+        self._open_moves[parents] -= counts.astype(np.uint8)
+        parents = parents[self._open_moves[parents] == 0]
+        self.values[parents] = (LOSS << RESULT_SHIFT) | value
+        return parents.astype(np.uint32)
+
+    def _finished(self, result: int) -> Iterator[np.ndarray]:
+        """
+        (Iterator[np.ndarray]) Yields the indices of the finished games with
+        the given result, SOLVE_CHUNK at a time
+        """
+        for start in range(0, len(self.values), SCAN_CHUNK):
+            chunk = self.values[start:start + SCAN_CHUNK]
+            yield from _chunks(np.flatnonzero(chunk == result << RESULT_SHIFT)
+                               + start)
+
+    def retrograde(self) -> None:
+        """
+        Value every unfinished position by retrograde analysis: a position
+        is a win once any move reaches a loss for the opponent, and a loss
+        once every move reaches a win for the opponent. Positions are
+        resolved in order of distance from the end of the game, and those
+        never resolved are draws.
+        """
+        # The batches of positions resolved one move earlier, by result
+        frontier = {result: self._finished(result) for result in (LOSS, WIN)}
+        distance = 1
+        while True:
+            resolved = {WIN: [np.empty(0, dtype=np.uint32)],
+                        LOSS: [np.empty(0, dtype=np.uint32)]}
+            for result, opposite in ((LOSS, WIN), (WIN, LOSS)):
+                for indices in frontier[result]:
+                    resolved[opposite].append(
+                        self._resolve(indices, result, distance))
+            if not any(len(parents) for parts in resolved.values()
+                       for parents in parts):
+                break
+            frontier = {result: _chunks(np.concatenate(parts))
+                        for result, parts in resolved.items()}
+            distance += 1
+
+        for start in range(0, len(self.values), SCAN_CHUNK):
+            chunk = self.values[start:start + SCAN_CHUNK]
+            chunk[chunk == _UNKNOWN] = DRAW << RESULT_SHIFT
+
+    def count_reachable(self) -> int:
+        """
+        (int) Returns the number of positions a game can reach
+        """
+        return sum(int(np.count_nonzero(
+            self.values[start:start + SCAN_CHUNK] != UNREACHABLE))
+            for start in range(0, len(self.values), SCAN_CHUNK))
+
+
+def solve(rows: int, columns: int, win_length: int) -> tuple[np.ndarray, int]:
+    """
+    Find the perfect-play value of every reachable position: explore the
+    positions breadth first, valuing finished games, then resolve the rest
+    by retrograde analysis. Removes make the move graph cyclic, so
+    positions never forced to a win or loss are draws.
+
+    Parameters:
+        rows (int): the number of rows on the board
+        columns (int): the number of columns on the board
+        win_length (int): the number of pieces in a line needed to win
+
+    Returns:
+        (tuple[np.ndarray, int]): the value of each canonical index, with
+        UNREACHABLE for indices no game reaches, and the number of
+        reachable positions
+
+    Raises:
+        ValueError: if the board has more than MAX_INDEX_SIZE indices
+    """
+    size = _Encoding(rows, columns).size
+    if size > MAX_INDEX_SIZE:
+        raise ValueError(f"a {rows}x{columns} board has {size} indices, "
+                         f"more than the solver's limit of {MAX_INDEX_SIZE}")
+    solver = _Solver(rows, columns, win_length)
+    solver.explore()
+    solver.retrograde()
+    return solver.values, solver.count_reachable()
+
+
+def build_database(path: str, rows: int, columns: int,
+                   win_length: int) -> int:
+    """
+    Solve a board configuration and write its database
+
+    Parameters:
+        path (str): the file to write
+        rows (int): the number of rows on the board
+        columns (int): the number of columns on the board
+        win_length (int): the number of pieces in a line needed to win
+
+    Returns:
+        (int): the number of reachable positions written
+    """
+    values, reachable = solve(rows, columns, win_length)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, rows, columns, win_length, len(values),
+                               reachable))
+        values.astype("<u2", copy=False).tofile(file)
+    return reachable
+
+
+class EndgameDatabase:
+    """
+    Perfect-play values for one board configuration, read through a
+    memory map so only the pages a lookup touches are loaded
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open a database written by build_database
+
+        Parameter:
+            path (str): the database file
+        """
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._rows, self._columns, self._win_length, size, \
+            self._reachable = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not an endgame database of this "
+                             f"version; delete it to rebuild it")
+
+        view = memoryview(self._map)
+        self._values = view[HEADER.size:HEADER.size + 2 * size].cast("H")
+        self._encoding = _Encoding(self._rows, self._columns)
+
+    def close(self) -> None:
+        """
+        Release the memory map
+        """
+        self._values.release()
+        self._map.close()
+
+    def __enter__(self) -> "EndgameDatabase":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._reachable
+
+    def get_configuration(self) -> tuple[int, int, int]:
+        """
+        (tuple[int, int, int]) Returns the (rows, columns, win_length)
+        """
+        return self._rows, self._columns, self._win_length
+
+    def _lookup_codes(self, codes: list[int]) -> Optional[tuple[int, int]]:
+        """
+        (Optional[tuple[int, int]]) Returns the (result, distance) of a
+        position given by column codes, or None if it is not reachable
+        """
+        value = self._values[self._encoding.index(codes)]
+        if value == UNREACHABLE:
+            return None
+        return value >> RESULT_SHIFT, value & DISTANCE_MASK
+
+    def lookup(self, bitboard: Bitboard) -> Optional[tuple[int, int]]:
+        """
+        Look up the perfect-play value of a position
+
+        Parameter:
+            bitboard (Bitboard): the position, of this configuration
+
+        Returns:
+            Optional[tuple[int, int]]: the result (WIN, LOSS or DRAW) for
+            the player to move and the number of moves until it, or None
+            if the position can't be reached in a game
+        """
+        return self._lookup_codes(self._encoding.from_bitboard(bitboard))
+
+    def best_move(self, bitboard: Bitboard) -> Optional[Move]:
+        """
+        Pick a perfect-play move: the quickest win, otherwise a draw,
+        otherwise the slowest loss
+
+        Parameter:
+            bitboard (Bitboard): the position, of this configuration
+
+        Returns:
+            Optional[Move]: the move, or None if the position has none
+        """
+        codes = self._encoding.from_bitboard(bitboard)
+        best = None
+        best_rank = None
+        for move, child_codes in self._encoding.successors(codes):
+            value = self._lookup_codes(child_codes)
+            if value is None:
+                continue
+            result, distance = value
+            # Rank by the child's result for the opponent
+            if result == LOSS:
+                rank = (0, distance)
+            elif result == DRAW:
+                rank = (1, 0)
+            else:
+                rank = (2, -distance)
+            if best_rank is None or rank < best_rank:
+                best, best_rank = move, rank
+        return best
+
+
+def open_database(rows: int, columns: int, win_length: int,
+                  directory: str = ".") -> EndgameDatabase:
+    """
+    Open the database for a configuration, solving it first only if it has
+    not been written before
+
+    Parameters:
+        rows (int): the number of rows on the board
+        columns (int): the number of columns on the board
+        win_length (int): the number of pieces in a line needed to win
+        directory (str): where database files are kept
+
+    Returns:
+        (EndgameDatabase): the opened database
+    """
+    path = os.path.join(directory,
+                        f"endgame_{rows}x{columns}_{win_length}.db")
+    if not os.path.exists(path):
+        build_database(path + ".tmp", rows, columns, win_length)
+        os.replace(path + ".tmp", path)
+    return EndgameDatabase(path)
+
+
+def main() -> None:
+    """
+    Build a database from the command line, e.g.
+    python endgame_db.py 5 5 4
+    """
+    rows, columns, win_length = (int(arg) for arg in sys.argv[1:4])
+    with open_database(rows, columns, win_length) as database:
+        start = database.lookup(Bitboard(rows, columns, win_length))
+        names = {WIN: "win", LOSS: "loss", DRAW: "draw"}
+        print(f"{len(database)} positions; the first player's result is "
+              f"a {names[start[0]]} in {start[1]} moves")
+
+if __name__ == "__main__":
+    main()
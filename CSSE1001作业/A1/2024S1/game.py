@@ -0,0 +1,242 @@
+from functools import lru_cache
+from typing import Optional
+from a1_support import *
+
+# (column, row) steps for the four line directions a win can run along
+WINDOW_DELTAS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+
+@lru_cache(maxsize=None)
+def get_win_windows(rows: int, columns: int,
+                    win_length: int) -> tuple[tuple[tuple[int, ...], ...], ...]:
+    """
+    Build the table of win windows for a board configuration. The table is
+    cached, so it is only built once per configuration.
+
+    Cells are numbered column * rows + row, with row 0 at the top.
+
+    Parameters:
+        rows (int): the number of rows on the board
+        columns (int): the number of columns on the board
+        win_length (int): the number of pieces in a line needed to win
+
+    Returns:
+        (tuple[tuple[tuple[int, ...], ...], ...]): for each cell, every
+        window of win_length cells in a line that contains it
+    """
+    cell_windows = [[] for _ in range(rows * columns)]
+    span = win_length - 1
+
+    for delta_col, delta_row in WINDOW_DELTAS:
+        # Only start windows whose last cell is still on the board
+        for column in range(columns):
+            end_col = column + span * delta_col
+            if not 0 <= end_col < columns:
+                continue
+            for row in range(rows):
+                end_row = row + span * delta_row
+                if not 0 <= end_row < rows:
+                    continue
+                window = tuple((column + k * delta_col) * rows
+                               + row + k * delta_row
+                               for k in range(win_length))
+                for cell in window:
+                    cell_windows[cell].append(window)
+
+    return tuple(tuple(windows) for windows in cell_windows)
+
+
+class Game:
+    """
+    A connect-N board of any size, which tracks the winner incrementally
+    using the precomputed win windows through each changed cell
+    """
+
+    def __init__(self, rows: int = BOARD_SIZE, columns: int = BOARD_SIZE,
+                 win_length: int = REQUIRED_WIN_LENGTH) -> None:
+        """
+        Construct an empty game
+
+        Parameters:
+            rows (int): the number of rows on the board
+            columns (int): the number of columns on the board
+            win_length (int): the number of pieces in a line needed to win
+        """
+        self._rows = rows
+        self._columns = columns
+        self._win_length = win_length
+        self._windows = get_win_windows(rows, columns, win_length)
+
+        self._cells = [BLANK_PIECE] * (rows * columns)
+        self._heights = [0] * columns
+        self._winner = None
+
+    @classmethod
+    def from_board(cls, board: list[str],
+                   win_length: int = REQUIRED_WIN_LENGTH) -> "Game":
+        """
+        Build a game from the list[str] column representation
+
+        Parameters:
+            board (list[str]): the game state, one string per column
+            win_length (int): the number of pieces in a line needed to win
+
+        Returns:
+            (Game): the equivalent game
+        """
+        rows = len(board[0]) if board else 0
+        game = cls(rows, len(board), win_length)
+        for column_index, column in enumerate(board):
+            start = column_index * rows
+            game._cells[start:start + rows] = column
+            game._heights[column_index] = rows - column.count(BLANK_PIECE)
+
+        occupied = [cell for cell, piece in enumerate(game._cells)
+                    if piece != BLANK_PIECE]
+        game._winner = game._check_cells(occupied)
+        return game
+
+    def to_board(self) -> list[str]:
+        """
+        Convert the game back to the list[str] column representation
+
+        Returns:
+            (list[str]): the game state, one string per column
+        """
+        rows = self._rows
+        return ["".join(self._cells[start:start + rows])
+                for start in range(0, rows * self._columns, rows)]
+
+    def get_dimensions(self) -> tuple[int, int]:
+        """
+        (tuple[int, int]) Returns the (rows, columns) of the board
+        """
+        return self._rows, self._columns
+
+    def get_win_length(self) -> int:
+        """
+        (int) Returns the number of pieces in a line needed to win
+        """
+        return self._win_length
+
+    def get_piece(self, column_index: int, row: int) -> str:
+        """
+        (str) Returns the piece at the given column and row (0 at the top)
+        """
+        return self._cells[column_index * self._rows + row]
+
+    def get_height(self, column_index: int) -> int:
+        """
+        (int) Returns the number of pieces in the given column
+        """
+        return self._heights[column_index]
+
+    def is_column_full(self, column_index: int) -> bool:
+        """
+        (bool) Returns True if the given column has no room left
+        """
+        return self._heights[column_index] == self._rows
+
+    def is_column_empty(self, column_index: int) -> bool:
+        """
+        (bool) Returns True if the given column has no pieces
+        """
+        return self._heights[column_index] == 0
+
+    def get_winner(self) -> Optional[str]:
+        """
+        Get the result after the last change, with the same rules as
+        check_win
+
+        Returns:
+            Optional[str]: PLAYER_1_PIECE if player1 wins, PLAYER_2_PIECE
+            if player2 wins, BLANK_PIECE if both win, otherwise None
+        """
+        return self._winner
+
+    def add_piece(self, piece: str, column_index: int) -> bool:
+        """
+        Add a piece to the top of a column, if the column is not full
+
+        Parameters:
+            piece (str): the type of piece to be added
+            column_index (int): the index of the column to add to
+
+        Returns:
+            (bool): True if the piece was added, otherwise False
+        """
+        height = self._heights[column_index]
+        if height == self._rows:
+            return False
+
+        cell = column_index * self._rows + self._rows - 1 - height
+        self._cells[cell] = piece
+        self._heights[column_index] = height + 1
+        self._winner = self._check_cells([cell])
+        return True
+
+    def remove_piece(self, column_index: int) -> bool:
+        """
+        Remove the bottom piece of a column, if the column is not empty,
+        dropping the rest of the column down by one
+
+        Parameters:
+            column_index (int): the index of the column to remove from
+
+        Returns:
+            (bool): True if a piece was removed, otherwise False
+        """
+        height = self._heights[column_index]
+        if height == 0:
+            return False
+
+        start = column_index * self._rows
+        end = start + self._rows
+        top = end - height
+        self._cells[top + 1:end] = self._cells[top:end - 1]
+        self._cells[top] = BLANK_PIECE
+        self._heights[column_index] = height - 1
+        self._winner = self._check_cells(range(top + 1, end))
+        return True
+
+    def _check_cells(self, cells) -> Optional[str]:
+        """
+        Check the win windows through the given cells, assuming no one
+        had won before they changed
+
+        Parameter:
+            cells (Iterable[int]): the cell numbers to check around
+
+        Returns:
+            Optional[str]: the result as described in get_winner
+        """
+        board = self._cells
+        player1_win = False
+        player2_win = False
+
+        for cell in cells:
+            piece = board[cell]
+            if piece == BLANK_PIECE:
+                continue
+            if piece == PLAYER_1_PIECE and player1_win:
+                continue
+            if piece == PLAYER_2_PIECE and player2_win:
+                continue
+
+            for window in self._windows[cell]:
+                for other in window:
+                    if board[other] != piece:
+                        break
+                else:
+                    if piece == PLAYER_1_PIECE:
+                        player1_win = True
+                    else:
+                        player2_win = True
+                    break
+
+        if player1_win and player2_win:
+            return BLANK_PIECE
+        elif player1_win:
+            return PLAYER_1_PIECE
+        elif player2_win:
+            return PLAYER_2_PIECE
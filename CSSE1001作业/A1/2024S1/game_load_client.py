@@ -0,0 +1,235 @@
+import argparse
+import asyncio
+import random
+import time
+from typing import Optional
+from a1_support import *
+from game_server import DEFAULT_HOST, DEFAULT_PORT, GameServer, percentiles
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, where the descriptor limit is left alone
+    resource = None
+
+DEFAULT_IDLE = 1000
+DEFAULT_CLIENTS = 50
+DEFAULT_GAMES = 20
+# Chance of trying a remove instead of an add, kept low so games finish
+REMOVE_CHANCE = 0.05
+# Moves after which a client quits a game that has not finished
+MAX_MOVES = 200
+# Idle connections opened at once, so the listen backlog is not overrun
+CONNECT_BATCH = 200
+
+
+def raise_file_limit(needed: int) -> None:
+    """
+    Raise this process's open file limit towards its hard limit, so
+    thousands of sockets can be open at once
+
+    Parameter:
+        needed (int): the number of descriptors wanted
+    """
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        if hard != resource.RLIM_INFINITY:
+            needed = min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (needed, hard))
+
+
+async def _idle_connections(host: str, port: int, count: int
+                            ) -> list[asyncio.StreamWriter]:
+    """
+    Open connections which never send anything
+
+    Returns:
+        (list[asyncio.StreamWriter]): the open connections
+    """
+    writers = []
+    for start in range(0, count, CONNECT_BATCH):
+        batch = min(CONNECT_BATCH, count - start)
+        connections = await asyncio.gather(
+            *(asyncio.open_connection(host, port) for _ in range(batch)))
+        writers.extend(writer for _, writer in connections)
+    return writers
+
+
+async def _send(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                command: str) -> tuple[str, Optional[str]]:
+    """
+    Send a command and read up to its reply, which follows any MOVE and
+    RESULT lines it caused
+
+    Returns:
+        (tuple[str, Optional[str]]): the reply line, and the game result if
+        the command ended the game
+    """
+    writer.write(command.encode() + b"\n")
+    result = None
+    while True:
+        line = (await reader.readline()).decode().strip()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        if line.startswith("RESULT "):
+            result = line[7:]
+        elif not line.startswith("MOVE "):
+            return line, result
+
+
+async def _play_games(host: str, port: int, games: int, seed: int,
+                      latencies: list[float], results: dict[str, int]
+                      ) -> int:
+    """
+    Play solo games of random moves over one connection, timing each move
+    from sending the command to reading its reply
+
+    Parameters:
+        host (str): the server address
+        port (int): the server port
+        games (int): the number of games to play
+        seed (int): the seed for choosing moves
+        latencies (list[float]): where to append each move's round trip
+        results (dict[str, int]): the count of each game result, updated
+
+    Returns:
+        (int): the number of successful moves made
+    """
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    moves = 0
+    try:
+        for _ in range(games):
+            await _send(reader, writer, "solo")
+            result = None
+            game_moves = 0
+            while result is None:
+                if game_moves >= MAX_MOVES:
+                    _, result = await _send(reader, writer, "q")
+                    break
+                column = rng.randint(1, BOARD_SIZE)
+                if rng.random() < REMOVE_CHANCE:
+                    command = f"r{column}"
+                else:
+                    command = f"a{column}"
+                start = time.perf_counter()
+                reply, result = await _send(reader, writer, command)
+                if reply == "OK":
+                    latencies.append(time.perf_counter() - start)
+                    game_moves += 1
+            moves += game_moves
+            results[result] = results.get(result, 0) + 1
+    finally:
+        writer.close()
+    return moves
+
+
+async def run_load(host: str, port: int, idle: int, clients: int,
+                   games: int, seed: int) -> dict:
+    """
+    Hold idle connections open while clients play games as fast as the
+    server allows
+
+    Parameters:
+        host (str): the server address
+        port (int): the server port
+        idle (int): the number of idle connections to hold open
+        clients (int): the number of connections playing games at once
+        games (int): the number of games each client plays
+        seed (int): the seed for choosing moves
+
+    Returns:
+        (dict): the move count, elapsed seconds, moves per second, game
+        results, round trip percentiles and the server's statistics
+    """
+    # Enough for both ends of every connection, if the server is local
+    raise_file_limit(2 * (idle + clients) + 64)
+    idle_writers = await _idle_connections(host, port, idle)
+
+    latencies = []
+    results = {}
+    start = time.perf_counter()
+    moves = await asyncio.gather(
+        *(_play_games(host, port, games, seed + client, latencies, results)
+          for client in range(clients)))
+    seconds = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    server_stats, _ = await _send(reader, writer, "stats")
+    writer.close()
+    for idle_writer in idle_writers:
+        idle_writer.close()
+    await asyncio.gather(*(idle_writer.wait_closed()
+                           for idle_writer in idle_writers))
+
+    return {
+        "moves": sum(moves),
+        "seconds": seconds,
+        "moves_per_second": sum(moves) / seconds,
+        "results": results,
+        "round_trip_us": {point: round(value * 1e6, 1) for point, value
+                          in percentiles(latencies).items()},
+        "server": server_stats,
+    }
+
+
+def format_report(report: dict) -> str:
+    """
+    (str) Returns a human readable summary of a run_load report
+    """
+    lines = [f"{report['moves']} moves in {report['seconds']:.2f}s "
+             f"({report['moves_per_second']:.0f} moves/s)",
+             "Results: " + ", ".join(f"{result} {count}" for result, count
+                                     in sorted(report["results"].items())),
+             "Round trip: " + ", ".join(
+                 f"p{point:g} {value}us"
+                 for point, value in report["round_trip_us"].items()),
+             "Server: " + report["server"]]
+    return "\n".join(lines)
+
+
+async def _run_local(idle: int, clients: int, games: int, seed: int) -> dict:
+    """
+    Run the load against a server in this process, on a free local port
+    """
+    game_server = GameServer()
+    server = await game_server.serve(DEFAULT_HOST, 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        report = await run_load(DEFAULT_HOST, port, idle, clients, games,
+                                seed)
+        # Let the server see every connection close before the loop stops
+        while game_server.get_connection_count():
+            await asyncio.sleep(0.01)
+    return report
+
+
+def main() -> None:
+    """
+    Run the load generator from the command line, against a running server
+    or, with --local, one started in this process
+    """
+    parser = argparse.ArgumentParser(
+        description="Measure the game server's throughput and latency")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--local", action="store_true",
+                        help="start a server in this process")
+    parser.add_argument("--idle", type=int, default=DEFAULT_IDLE)
+    parser.add_argument("--clients", type=int, default=DEFAULT_CLIENTS)
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.local:
+        report = asyncio.run(_run_local(args.idle, args.clients, args.games,
+                                        args.seed))
+    else:
+        report = asyncio.run(run_load(args.host, args.port, args.idle,
+                                      args.clients, args.games, args.seed))
+    print(format_report(report))
+
+if __name__ == "__main__":
+    main()
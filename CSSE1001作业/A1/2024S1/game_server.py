@@ -0,0 +1,279 @@
+import argparse
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import Optional
+from a1_support import *
+from a1_solution import HELP_COMMAND, QUIT_COMMAND, get_input_error
+from headless import HeadlessGame
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8801
+# Move latencies kept for the percentile report
+LATENCY_WINDOW = 100_000
+REPORTED_PERCENTILES = (50, 90, 99, 99.9)
+
+# Protocol, one command per line in each direction. Clients send:
+#   new          start a game as player 1 and wait for an opponent; moves
+#                are refused until one joins
+#   join <id>    join a waiting game as player 2
+#   solo         start a game playing both sides, like play_game
+#   aX / rX      add or remove a piece, exactly as check_input accepts them
+#   h            get the help text
+#   q            quit the current game
+#   stats        get the server's move latency percentiles
+# The server answers each command with one line:
+#   GAME <id> <piece>, OK, ERR <message>, HELP <text> or STATS <fields>
+# and sends every player in a game:
+#   MOVE <piece> <command> after each successful move
+#   RESULT <piece, draw or quit> when the game ends
+NOT_IN_GAME_MESSAGE = "You are not in a game"
+NOT_YOUR_TURN_MESSAGE = "It is not your turn"
+NO_SUCH_GAME_MESSAGE = "No game is waiting with that id"
+NO_OPPONENT_MESSAGE = "Wait for an opponent to join"
+DRAW_RESULT = "draw"
+QUIT_RESULT = "quit"
+
+
+def percentiles(samples: list[float],
+                points: tuple[float, ...] = REPORTED_PERCENTILES
+                ) -> dict[float, float]:
+    """
+    Find percentiles of a list of samples by the nearest-rank method
+
+    Parameters:
+        samples (list[float]): the samples, in any order
+        points (tuple[float, ...]): the percentiles to find, from 0 to 100
+
+    Returns:
+        (dict[float, float]): each percentile's value, or 0.0 for no samples
+    """
+    ordered = sorted(samples)
+    result = {}
+    for point in points:
+        if not ordered:
+            result[point] = 0.0
+            continue
+        rank = max(1, -(-point * len(ordered) // 100))
+        result[point] = ordered[int(rank) - 1]
+    return result
+
+
+class _Match:
+    """
+    One game on the server and the connections playing it
+    """
+
+    def __init__(self, match_id: int) -> None:
+        self.match_id = match_id
+        self.game = HeadlessGame()
+        self.players = {}
+
+    def broadcast(self, line: str) -> None:
+        """
+        Send a line to every player, once per connection
+        """
+        for writer in set(self.players.values()):
+            writer.write(line.encode() + b"\n")
+
+
+class GameServer:
+    """
+    Hosts many simultaneous games over a line-based TCP protocol. Each
+    connection costs one coroutine waiting on its socket, so idle clients
+    need no other resources.
+    """
+
+    def __init__(self) -> None:
+        self._match_ids = itertools.count(1)
+        self._waiting = {}
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._moves = 0
+        self._connections = 0
+
+    def get_connection_count(self) -> int:
+        """
+        (int) Returns the number of open connections
+        """
+        return self._connections
+
+    def get_statistics(self) -> dict[str, float]:
+        """
+        Get the connection and move counts, and the latency percentiles in
+        microseconds of handling the most recent moves
+
+        Returns:
+            (dict[str, float]): the statistics by name
+        """
+        stats = {"connections": self._connections, "moves": self._moves}
+        for point, seconds in percentiles(list(self._latencies)).items():
+            stats[f"p{point:g}_us"] = round(seconds * 1e6, 1)
+        return stats
+
+    async def serve(self, host: str = DEFAULT_HOST,
+                    port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """
+        Start listening
+
+        Parameters:
+            host (str): the address to listen on
+            port (int): the port to listen on, or 0 for any free port
+
+        Returns:
+            (asyncio.AbstractServer): the running server
+        """
+        return await asyncio.start_server(self._handle, host, port,
+                                          backlog=4096)
+
+    async def _handle(self, reader: asyncio.StreamReader,
+                      writer: asyncio.StreamWriter) -> None:
+        """
+        Serve one connection until it closes
+        """
+        self._connections += 1
+        match = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                start = time.perf_counter()
+                moves = self._moves
+                reply, match = self._command(line.decode().strip(), match,
+                                             writer)
+                writer.write(reply.encode() + b"\n")
+                if self._moves != moves:
+                    self._latencies.append(time.perf_counter() - start)
+                await writer.drain()
+        except (ConnectionError, UnicodeDecodeError):
+            pass
+        finally:
+            self._connections -= 1
+            if match is not None:
+                self._end(match, QUIT_RESULT)
+            writer.close()
+
+    def _command(self, command: str, match: Optional[_Match],
+                 writer: asyncio.StreamWriter
+                 ) -> tuple[str, Optional[_Match]]:
+        """
+        Handle one command line
+
+        Parameters:
+            command (str): the command, without its line ending
+            match (Optional[_Match]): the connection's current game
+            writer (asyncio.StreamWriter): the connection
+
+        Returns:
+            (tuple[str, Optional[_Match]]): the reply line and the
+            connection's game after the command
+        """
+        if command == "stats":
+            fields = " ".join(f"{name}={value}" for name, value
+                              in self.get_statistics().items())
+            return f"STATS {fields}", match
+
+        if command in ("new", "solo") or command.startswith("join "):
+            if match is not None:
+                self._end(match, QUIT_RESULT)
+            return self._start(command, writer)
+
+        if match is None or not match.players:
+            # The game may have been ended by the other player
+            return f"ERR {NOT_IN_GAME_MESSAGE}", None
+
+        game = match.game
+        piece = game.get_piece()
+        if (get_input_error(command) is None
+                and command not in HELP_COMMAND + QUIT_COMMAND):
+            if PLAYER_2_PIECE not in match.players:
+                return f"ERR {NO_OPPONENT_MESSAGE}", match
+            if match.players.get(piece) is not writer:
+                return f"ERR {NOT_YOUR_TURN_MESSAGE}", match
+
+        message = game.step(command)
+        if message == HELP_MESSAGE:
+            lines = [line.strip() for line in message.strip().splitlines()]
+            return "HELP " + " / ".join(lines), match
+        if message is not None:
+            return f"ERR {message}", match
+        if game.is_over() and game.result() is None:
+            # Either player may quit at any time
+            self._end(match, QUIT_RESULT)
+            return "OK", None
+
+        self._moves += 1
+        match.broadcast(f"MOVE {piece} {command}")
+        if game.is_over():
+            result = game.result()
+            self._end(match, DRAW_RESULT if result == BLANK_PIECE else result)
+            return "OK", None
+        return "OK", match
+
+    def _start(self, command: str, writer: asyncio.StreamWriter
+               ) -> tuple[str, Optional[_Match]]:
+        """
+        Create or join a game
+
+        Returns:
+            (tuple[str, Optional[_Match]]): the reply line and the game
+        """
+        if command.startswith("join "):
+            match_id = command[5:].strip()
+            # isdecimal alone accepts digits from other scripts
+            is_number = match_id.isascii() and match_id.isdecimal()
+            match = self._waiting.pop(int(match_id), None) \
+                if is_number else None
+            if match is None:
+                return f"ERR {NO_SUCH_GAME_MESSAGE}", None
+            match.players[PLAYER_2_PIECE] = writer
+            return f"GAME {match.match_id} {PLAYER_2_PIECE}", match
+
+        match = _Match(next(self._match_ids))
+        match.players[PLAYER_1_PIECE] = writer
+        if command == "solo":
+            match.players[PLAYER_2_PIECE] = writer
+        else:
+            self._waiting[match.match_id] = match
+        return f"GAME {match.match_id} {PLAYER_1_PIECE}", match
+
+    def _end(self, match: _Match, result: Optional[str]) -> None:
+        """
+        Finish a game, telling its players the result
+        """
+        self._waiting.pop(match.match_id, None)
+        if match.players:
+            match.broadcast(f"RESULT {result}")
+            match.players.clear()
+
+
+async def run_server(host: str, port: int) -> None:
+    """
+    Serve until cancelled, printing the statistics every ten seconds
+    """
+    game_server = GameServer()
+    server = await game_server.serve(host, port)
+    print(f"Serving on {host}:{port}")
+    async with server:
+        while True:
+            await asyncio.sleep(10)
+            print(game_server.get_statistics())
+
+
+def main() -> None:
+    """
+    Run the game server from the command line
+    """
+    parser = argparse.ArgumentParser(
+        description="Host connect-four games over TCP")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    try:
+        asyncio.run(run_server(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+from typing import Optional
+from a1_support import *
+from a1_solution import (ADD_COMMAND, HELP_COMMAND, QUIT_COMMAND,
+                         get_input_error)
+from bitboard import Bitboard
+
+ADD_ACTIONS = [f"a{c + 1}" for c in range(BOARD_SIZE)]
+REMOVE_ACTIONS = [f"r{c + 1}" for c in range(BOARD_SIZE)]
+
+
+class HeadlessGame:
+    """
+    A game of Connect 4 (ish) driven by commands instead of stdin and
+    stdout, following the same rules as play_game
+    """
+
+    def __init__(self) -> None:
+        """
+        Construct a game ready for player 1's first move
+        """
+        self.reset()
+
+    def reset(self) -> list[str]:
+        """
+        Start a new game
+
+        Returns:
+            (list[str]): the initial board
+        """
+        self._bitboard = Bitboard()
+        self._turn_count = 0
+        self._winner = None
+        self._quit = False
+        return self.get_board()
+
+    def get_board(self) -> list[str]:
+        """
+        (list[str]) Returns the current game state, one string per column
+        """
+        return self._bitboard.to_board()
+
+    def get_bitboard(self) -> Bitboard:
+        """
+        (Bitboard) Returns the engine holding the current game state
+        """
+        return self._bitboard
+
+    def get_piece(self) -> str:
+        """
+        (str) Returns the piece of the player to move
+        """
+        if self._turn_count % 2 == 0:
+            return PLAYER_1_PIECE
+        return PLAYER_2_PIECE
+
+    def get_turn_count(self) -> int:
+        """
+        (int) Returns the number of successful moves made so far
+        """
+        return self._turn_count
+
+    def is_over(self) -> bool:
+        """
+        (bool) Returns True if someone has won, it is a draw, or a player quit
+        """
+        return self._quit or self._winner is not None
+
+    def legal_actions(self) -> list[str]:
+        """
+        Get every add and remove command which would succeed now. The help
+        and quit commands are always accepted and are not listed.
+
+        Returns:
+            (list[str]): the "aX" commands followed by the "rX" commands
+        """
+        if self.is_over():
+            return []
+        moves = self._bitboard.legal_moves()
+        return ([ADD_ACTIONS[c] for is_add, c in moves if is_add]
+                + [REMOVE_ACTIONS[c] for is_add, c in moves if not is_add])
+
+    def step(self, action: str) -> Optional[str]:
+        """
+        Apply one command, as play_game would after reading it
+
+        Parameter:
+            action (str): the command, in any format get_action accepts
+
+        Returns:
+            Optional[str]: the message play_game would print if the command
+            is rejected, HELP_MESSAGE for a help command, otherwise None
+        """
+        if self.is_over():
+            return None
+
+        error = get_input_error(action)
+        if error is not None:
+            return error
+
+        if action in HELP_COMMAND:
+            return HELP_MESSAGE
+
+        if action in QUIT_COMMAND:
+            self._quit = True
+            return None
+
+        column_index = int(action[1:]) - 1
+        if action[0] in ADD_COMMAND:
+            if not self._bitboard.add_piece(self.get_piece(), column_index):
+                return FULL_COLUMN_MESSAGE
+        elif not self._bitboard.remove_piece(column_index):
+            return EMPTY_COLUMN_MESSAGE
+
+        self._turn_count += 1
+        self._winner = self._bitboard.winner()
+        return None
+
+    def result(self) -> Optional[str]:
+        """
+        Get the outcome of the game, with the same values as check_win
+
+        Returns:
+            Optional[str]: PLAYER_1_PIECE if player1 wins, PLAYER_2_PIECE
+            if player2 wins, BLANK_PIECE if it is a draw, otherwise None
+        """
+        return self._winner
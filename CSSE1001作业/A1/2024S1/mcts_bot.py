@@ -0,0 +1,331 @@
+import math
+import random
+import time
+from collections import Counter
+from multiprocessing import Pool
+from typing import Optional
+from a1_support import *
+from a1_solution import play_game
+from bitboard import Bitboard, Move
+from negamax_bot import move_to_command, other_piece
+
+DEFAULT_TIME_BUDGET = 1.0
+DEFAULT_EXPLORATION = math.sqrt(2)
+# Playouts are cut off as a draw after this many moves, since removes mean
+# a random game need not end
+MAX_PLAYOUT_MOVES = 200
+# The winner recorded for a position with no legal move, e.g. a full board
+# when removes are not allowed; like both players winning, it is a draw
+NO_MOVE_DRAW = BLANK_PIECE
+
+# Playout rewards for the player who made the move into a node
+WIN_REWARD = 1.0
+DRAW_REWARD = 0.5
+LOSS_REWARD = 0.0
+
+
+def legal_moves(bitboard: Bitboard, allow_removes: bool = True) -> list[Move]:
+    """
+    Get every legal move in a position
+
+    Parameters:
+        bitboard (Bitboard): the current game state
+        allow_removes (bool): False to only list add moves
+
+    Returns:
+        (list[Move]): a new list of the legal moves, by column
+    """
+    if allow_removes:
+        return list(bitboard.legal_moves())
+    return [move for move in bitboard.legal_moves() if move[0]]
+
+
+def apply_move(bitboard: Bitboard, piece: str, move: Move) -> None:
+    """
+    Play a legal move for piece on the bitboard
+    """
+    is_add, column_index = move
+    if is_add:
+        bitboard.add_piece(piece, column_index)
+    else:
+        bitboard.remove_piece(column_index)
+
+
+class _Node:
+    """
+    A position in the search tree, reached by one move from its parent
+    """
+    __slots__ = ("move", "parent", "mover", "winner", "untried", "children",
+                 "visits", "reward")
+
+    def __init__(self, move: Optional[Move], parent: Optional["_Node"],
+                 mover: str, winner: Optional[str]) -> None:
+        """
+        Construct an unexpanded node
+
+        Parameters:
+            move (Optional[Move]): the move into this node, None at the root
+            parent (Optional[_Node]): the parent node, None at the root
+            mover (str): the piece of the player who made the move
+            winner (Optional[str]): the check_win result after the move
+        """
+        self.move = move
+        self.parent = parent
+        self.mover = mover
+        self.winner = winner
+        self.untried = None
+        self.children = []
+        self.visits = 0
+        self.reward = 0.0
+
+
+def _reward(winner: Optional[str], mover: str) -> float:
+    """
+    (float) Returns the playout reward of a result for mover
+    """
+    if winner is None or winner == BLANK_PIECE:
+        return DRAW_REWARD
+    return WIN_REWARD if winner == mover else LOSS_REWARD
+
+
+def _playout(bitboard: Bitboard, piece: str, rng: random.Random,
+             allow_removes: bool) -> Optional[str]:
+    """
+    Play random moves until the game ends or MAX_PLAYOUT_MOVES is reached.
+    A player with no legal move ends the game in a draw.
+
+    Parameters:
+        bitboard (Bitboard): the game state to play from, which is changed
+        piece (str): the piece of the player to move
+        rng (random.Random): the source of random moves
+        allow_removes (bool): False to only play add moves
+
+    Returns:
+        Optional[str]: the check_win result at the end of the playout
+    """
+    columns = bitboard.get_dimensions()[1]
+    choices = 2 * columns if allow_removes else columns
+    for _ in range(MAX_PLAYOUT_MOVES):
+        # Removes are always possible once adds are not, so only a board
+        # without removes can run out of moves
+        if not allow_removes and all(bitboard.is_column_full(column)
+                                     for column in range(columns)):
+            return NO_MOVE_DRAW
+        # Rejection sampling picks uniformly among the legal moves without
+        # building the move list
+        while True:
+            choice = rng.randrange(choices)
+            if choice < columns:
+                if bitboard.add_piece(piece, choice):
+                    # Only the player adding a piece can complete a line
+                    if bitboard.has_won(piece):
+                        return piece
+                    break
+            elif bitboard.remove_piece(choice - columns):
+                winner = bitboard.winner()
+                if winner is not None:
+                    return winner
+                break
+        piece = other_piece(piece)
+    return None
+
+
+def search(task: tuple[tuple, tuple[int, int, int], str, float, float, int,
+                       bool]) -> tuple[dict[Move, int], int]:
+    """
+    Run one independent Monte Carlo tree search from the root position
+
+    Parameter:
+        task (tuple): the Bitboard state, the (rows, columns, win_length)
+            dimensions, the piece to move, the time budget in seconds, the
+            exploration constant, the random seed and whether removes are
+            allowed
+
+    Returns:
+        (tuple[dict[Move, int], int]): the visit count of each root move,
+        and the number of playouts run
+    """
+    state, (rows, columns, win_length), piece, time_budget, exploration, \
+        seed, allow_removes = task
+    rng = random.Random(seed)
+    bitboard = Bitboard(rows, columns, win_length)
+    bitboard.set_state(state)
+
+    if not legal_moves(bitboard, allow_removes):
+        return {}, 0
+    root = _Node(None, None, other_piece(piece), None)
+    deadline = time.perf_counter() + time_budget
+    playouts = 0
+
+    while playouts == 0 or time.perf_counter() < deadline:
+        bitboard.set_state(state)
+        node = root
+
+        # Selection: follow the best UCT child through expanded nodes
+        while node.winner is None and node.untried == [] and node.children:
+            log_visits = math.log(node.visits)
+            node = max(node.children,
+                       key=lambda child: child.reward / child.visits
+                       + exploration * math.sqrt(log_visits / child.visits))
+            apply_move(bitboard, other_piece(node.mover), node.move)
+
+        # Expansion: add one untried move, unless there are none at all,
+        # which makes the node a drawn end of the game
+        if node.winner is None and node.untried is None:
+            node.untried = legal_moves(bitboard, allow_removes)
+            rng.shuffle(node.untried)
+            if not node.untried:
+                node.winner = NO_MOVE_DRAW
+        if node.winner is None:
+            to_move = other_piece(node.mover)
+            move = node.untried.pop()
+            apply_move(bitboard, to_move, move)
+            child = _Node(move, node, to_move, bitboard.winner())
+            node.children.append(child)
+            node = child
+
+        # Simulation
+        winner = node.winner
+        if winner is None:
+            winner = _playout(bitboard, other_piece(node.mover), rng,
+                              allow_removes)
+        playouts += 1
+
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            node.reward += _reward(winner, node.mover)
+            node = node.parent
+
+    visits = {child.move: child.visits for child in root.children}
+    return visits, playouts
+
+
+class MCTSBot:
+    """
+    A computer player which picks moves by Monte Carlo tree search, running
+    an independent search per worker process and merging the root visits
+    """
+
+    def __init__(self, time_budget: float = DEFAULT_TIME_BUDGET,
+                 workers: int = 1, exploration: float = DEFAULT_EXPLORATION,
+                 seed: int = 0, allow_removes: bool = True) -> None:
+        """
+        Construct a bot
+
+        Parameters:
+            time_budget (float): the number of seconds to search each move
+            workers (int): the number of searches to run in parallel
+            exploration (float): the UCT exploration constant
+            seed (int): the seed for the random playouts
+            allow_removes (bool): False to only consider add moves
+        """
+        self._time_budget = time_budget
+        self._workers = workers
+        self._exploration = exploration
+        self._rng = random.Random(seed)
+        self._allow_removes = allow_removes
+        self._pool = None
+        self._statistics = {}
+
+    def __call__(self, board: list[str], piece: str) -> str:
+        """
+        Choose a command for play_game
+
+        Parameters:
+            board (list[str]): the current game state
+            piece (str): the piece of the player to move
+
+        Returns:
+            (str): the chosen "aX" or "rX" command
+        """
+        return move_to_command(self.choose_move(Bitboard.from_board(board),
+                                                piece))
+
+    def close(self) -> None:
+        """
+        Shut down the worker processes, if any were started
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def get_statistics(self) -> dict[str, float]:
+        """
+        Get the statistics of the last search: playouts, seconds, playouts
+        per second and the number of workers
+
+        Returns:
+            (dict[str, float]): the statistics by name
+        """
+        return dict(self._statistics)
+
+    def choose_move(self, bitboard: Bitboard, piece: str) -> Move:
+        """
+        Search the position within the time budget and pick the root move
+        with the most visits across all workers
+
+        Parameters:
+            bitboard (Bitboard): the current game state
+            piece (str): the piece of the player to move
+
+        Returns:
+            (Move): the chosen move
+
+        Raises:
+            ValueError: if piece has no legal move
+        """
+        rows, columns = bitboard.get_dimensions()
+        dimensions = (rows, columns, bitboard.get_win_length())
+        tasks = [(bitboard.get_state(), dimensions, piece, self._time_budget,
+                  self._exploration, self._rng.getrandbits(32),
+                  self._allow_removes)
+                 for _ in range(self._workers)]
+
+        start = time.perf_counter()
+        if self._workers == 1:
+            results = [search(tasks[0])]
+        else:
+            if self._pool is None:
+                self._pool = Pool(self._workers)
+            results = self._pool.map(search, tasks)
+        elapsed = time.perf_counter() - start
+
+        visits = Counter()
+        playouts = 0
+        for worker_visits, worker_playouts in results:
+            visits.update(worker_visits)
+            playouts += worker_playouts
+        if not visits:
+            raise ValueError("no legal move to choose")
+
+        self._statistics = {
+            "playouts": playouts,
+            "seconds": elapsed,
+            "playouts_per_second": playouts / elapsed if elapsed else 0.0,
+            "workers": self._workers,
+        }
+        return max(visits, key=visits.get)
+
+
+def main() -> None:
+    """
+    Play Connect 4 (ish) against the computer, which plays as player 2
+    """
+    bot = MCTSBot(workers=4)
+    play_on = True
+    while play_on:
+        play_game({PLAYER_2_PIECE: bot})
+        stats = bot.get_statistics()
+        if stats:
+            print(f"Last search: {stats['playouts_per_second']:.0f} "
+                  f"playouts/s over {stats['workers']} workers")
+
+        user_response = input(CONTINUE_MESSAGE)
+        if user_response not in "Yy":
+            play_on = False
+    bot.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+import os
+import struct
+import sys
+from typing import Iterator
+from a1_support import *
+from a1_solution import ADD_COMMAND, display_board
+from bitboard import Bitboard
+
+# File layout:
+#   header: MAGIC, then rows, columns, win length and snapshot interval K
+#   blocks: K action bytes followed by a snapshot of the board after them,
+#           repeated, with the last block possibly holding fewer than K
+#           actions and no snapshot
+# Every block has the same size, so the snapshot before any move can be
+# found without reading the rest of the file.
+#
+# An action byte is REMOVE_FLAG for a remove, plus the column index. Only
+# successful moves are logged, so the player to move alternates and does
+# not need recording. A snapshot is the two player masks of a Bitboard.
+MAGIC = b"C4LOG1"
+HEADER = struct.Struct("<6sHHHH")
+REMOVE_FLAG = 0x80
+# Column indices must stay below REMOVE_FLAG to fit beside it in one byte
+MAX_COLUMNS = REMOVE_FLAG
+DEFAULT_SNAPSHOT_INTERVAL = 64
+
+
+def encode_action(command: str) -> int:
+    """
+    Encode a valid add or remove command as an action byte
+
+    Parameter:
+        command (str): an "aX" or "rX" command accepted by check_input
+
+    Returns:
+        (int): the action byte
+    """
+    column_index = int(command[1:]) - 1
+    if command[0] in ADD_COMMAND:
+        return column_index
+    return REMOVE_FLAG | column_index
+
+
+def decode_action(action: int) -> str:
+    """
+    (str) Returns the "aX" or "rX" command for an action byte
+    """
+    column_index = action & ~REMOVE_FLAG
+    if action & REMOVE_FLAG:
+        return f"r{column_index + 1}"
+    return f"a{column_index + 1}"
+
+
+def apply_action(bitboard: Bitboard, action: int, move_number: int) -> None:
+    """
+    Replay one logged action
+
+    Parameters:
+        bitboard (Bitboard): the game state to change
+        action (int): the action byte
+        move_number (int): the number of moves made before this one
+    """
+    column_index = action & ~REMOVE_FLAG
+    if action & REMOVE_FLAG:
+        bitboard.remove_piece(column_index)
+    elif move_number % 2 == 0:
+        bitboard.add_piece(PLAYER_1_PIECE, column_index)
+    else:
+        bitboard.add_piece(PLAYER_2_PIECE, column_index)
+
+
+def _check_columns(columns: int) -> None:
+    """
+    Raise ValueError if a board is too wide for its actions to be encoded
+    """
+    if columns > MAX_COLUMNS:
+        raise ValueError(f"move logs support at most {MAX_COLUMNS} "
+                         f"columns, not {columns}")
+
+
+def _mask_size(rows: int, columns: int) -> int:
+    """
+    (int) Returns the number of bytes in one player's snapshot mask
+    """
+    return (columns * (rows + 1) + 7) // 8
+
+
+class MoveLogWriter:
+    """
+    Writes a game to a move log, one action byte per successful move
+    """
+
+    def __init__(self, path: str, rows: int = BOARD_SIZE,
+                 columns: int = BOARD_SIZE,
+                 win_length: int = REQUIRED_WIN_LENGTH,
+                 snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL) -> None:
+        """
+        Create a new, empty move log
+
+        Parameters:
+            path (str): the file to write
+            rows (int): the number of rows on the board
+            columns (int): the number of columns on the board
+            win_length (int): the number of pieces in a line needed to win
+            snapshot_interval (int): the number of moves between snapshots
+
+        Raises:
+            ValueError: if the board has more than MAX_COLUMNS columns
+        """
+        _check_columns(columns)
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, rows, columns, win_length,
+                                     snapshot_interval))
+        self._bitboard = Bitboard(rows, columns, win_length)
+        self._mask_size = _mask_size(rows, columns)
+        self._interval = snapshot_interval
+        self._move_count = 0
+
+    def __enter__(self) -> "MoveLogWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __call__(self, command: str) -> None:
+        self.record(command)
+
+    def record(self, command: str) -> None:
+        """
+        Log a successful add or remove command
+
+        Parameter:
+            command (str): the "aX" or "rX" command which was played
+        """
+        action = encode_action(command)
+        apply_action(self._bitboard, action, self._move_count)
+        self._file.write(bytes((action,)))
+        self._move_count += 1
+
+        if self._move_count % self._interval == 0:
+            player_1 = self._bitboard.get_mask(PLAYER_1_PIECE)
+            player_2 = self._bitboard.get_mask(PLAYER_2_PIECE)
+            self._file.write(player_1.to_bytes(self._mask_size, "little"))
+            self._file.write(player_2.to_bytes(self._mask_size, "little"))
+
+    def close(self) -> None:
+        """
+        Finish writing the log
+        """
+        self._file.close()
+
+
+class MoveLogReader:
+    """
+    Reads a move log, seeking to any move through the nearest snapshot
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open a move log
+
+        Parameter:
+            path (str): the file to read
+
+        Raises:
+            ValueError: if the file is not a move log, or its board has more
+            than MAX_COLUMNS columns
+        """
+        self._file = open(path, "rb")
+        magic, self._rows, self._columns, self._win_length, \
+            self._interval = HEADER.unpack(self._file.read(HEADER.size))
+        try:
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a move log")
+            _check_columns(self._columns)
+        except ValueError:
+            self._file.close()
+            raise
+
+        self._mask_size = _mask_size(self._rows, self._columns)
+        self._block_size = self._interval + 2 * self._mask_size
+
+        body = os.fstat(self._file.fileno()).st_size - HEADER.size
+        blocks, rest = divmod(body, self._block_size)
+        self._move_count = blocks * self._interval + min(rest, self._interval)
+
+    def __enter__(self) -> "MoveLogReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the log
+        """
+        self._file.close()
+
+    def get_move_count(self) -> int:
+        """
+        (int) Returns the number of moves in the log
+        """
+        return self._move_count
+
+    def _read_actions(self, start: int, count: int) -> bytes:
+        """
+        Read count action bytes from within one block
+
+        Parameters:
+            start (int): the move number of the first action
+            count (int): the number of actions, which must not cross the
+                end of start's block
+
+        Returns:
+            (bytes): the action bytes
+        """
+        block, offset = divmod(start, self._interval)
+        self._file.seek(HEADER.size + block * self._block_size + offset)
+        return self._file.read(count)
+
+    def get_bitboard_at(self, move_number: int) -> Bitboard:
+        """
+        Rebuild the game state after a number of moves, starting from the
+        nearest snapshot at or before it
+
+        Parameter:
+            move_number (int): the number of moves to replay, from 0 to
+                get_move_count()
+
+        Returns:
+            (Bitboard): the game state after those moves
+        """
+        if not 0 <= move_number <= self._move_count:
+            raise IndexError(f"move {move_number} is not in the log")
+
+        bitboard = Bitboard(self._rows, self._columns, self._win_length)
+        block = move_number // self._interval
+        if block > 0:
+            self._file.seek(HEADER.size + block * self._block_size
+                            - 2 * self._mask_size)
+            player_1 = int.from_bytes(self._file.read(self._mask_size),
+                                      "little")
+            player_2 = int.from_bytes(self._file.read(self._mask_size),
+                                      "little")
+            bitboard.set_masks(player_1, player_2)
+
+        start = block * self._interval
+        actions = self._read_actions(start, move_number - start)
+        for offset, action in enumerate(actions):
+            apply_action(bitboard, action, start + offset)
+        return bitboard
+
+    def get_board_at(self, move_number: int) -> list[str]:
+        """
+        (list[str]) Returns the game state after a number of moves, in the
+        list[str] column format
+        """
+        return self.get_bitboard_at(move_number).to_board()
+
+    def get_action(self, move_number: int) -> str:
+        """
+        (str) Returns the command played as the given move, counted from 0
+        """
+        if not 0 <= move_number < self._move_count:
+            raise IndexError(f"move {move_number} is not in the log")
+        return decode_action(self._read_actions(move_number, 1)[0])
+
+    def actions(self) -> Iterator[str]:
+        """
+        (Iterator[str]) Yields every command in the log in order
+        """
+        for start in range(0, self._move_count, self._interval):
+            count = min(self._interval, self._move_count - start)
+            for action in self._read_actions(start, count):
+                yield decode_action(action)
+
+
+def main() -> None:
+    """
+    Display the board of a move log after a given number of moves, e.g.
+    python move_log.py game.c4log 1200
+    """
+    path, move_number = sys.argv[1], int(sys.argv[2])
+    with MoveLogReader(path) as reader:
+        print(f"Move {move_number} of {reader.get_move_count()}")
+        display_board(reader.get_board_at(move_number))
+
+if __name__ == "__main__":
+    main()
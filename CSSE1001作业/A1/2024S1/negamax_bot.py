@@ -0,0 +1,554 @@
+import random
+import time
+from typing import Optional
+from a1_support import *
+from a1_solution import play_game
+from bitboard import Bitboard, Move
+from threat_eval import ThreatEvaluator
+
+WIN_SCORE = 1_000_000
+# Scores beyond this are wins or losses a number of plies away, far above
+# any evaluation of a quiet position
+WIN_THRESHOLD = WIN_SCORE // 2
+MAX_SEARCH_DEPTH = 64
+DEFAULT_TIME_BUDGET = 1.0
+DEFAULT_TABLE_SIZE = 1 << 20
+
+# Number of nodes searched between checks of the clock
+TIME_CHECK_INTERVAL = 1024
+
+# Transposition table entry bounds
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+def move_to_command(move: Move) -> str:
+    """
+    Convert a search move into the command format accepted by check_input
+
+    Parameter:
+        move (Move): the (is_add, column_index) move
+
+    Returns:
+        (str): the "aX" or "rX" command, with X counted from 1
+    """
+    is_add, column_index = move
+    return f"{'a' if is_add else 'r'}{column_index + 1}"
+
+
+def score_to_table(score: int, ply: int) -> int:
+    """
+    Convert a score for storing in the transposition table. A win or loss
+    is scored by its distance from the root, which differs wherever else
+    the position is reached, so it is stored by its distance from the
+    position instead.
+
+    Parameters:
+        score (int): the score of a position searched at ply
+        ply (int): the number of moves from the root to the position
+
+    Returns:
+        (int): the score to store
+    """
+    if score > WIN_THRESHOLD:
+        return score + ply
+    if score < -WIN_THRESHOLD:
+        return score - ply
+    return score
+
+
+def score_from_table(score: int, ply: int) -> int:
+    """
+    (int) Returns a stored score converted back for a position at ply, the
+    reverse of score_to_table
+    """
+    if score > WIN_THRESHOLD:
+        return score - ply
+    if score < -WIN_THRESHOLD:
+        return score + ply
+    return score
+
+
+def other_piece(piece: str) -> str:
+    """
+    (str) Returns the piece belonging to the other player
+    """
+    return PLAYER_2_PIECE if piece == PLAYER_1_PIECE else PLAYER_1_PIECE
+
+
+class _SearchTimeout(Exception):
+    """
+    Raised inside the search when the time or node budget for a move runs
+    out
+    """
+
+
+class TranspositionTable:
+    """
+    A fixed size, Zobrist-indexed table of search results.
+
+    Each slot holds one entry. A new result replaces the stored one if the
+    stored one is from an older search, or was searched no deeper.
+    """
+
+    def __init__(self, size: int = DEFAULT_TABLE_SIZE) -> None:
+        """
+        Construct an empty table
+
+        Parameter:
+            size (int): the number of slots in the table
+        """
+        self._size = size
+        self._slots = [None] * size
+        self._generation = 0
+        self._stores = 0
+        self._hits = 0
+
+    def new_search(self) -> None:
+        """
+        Mark the start of a new search, so older entries are replaced first,
+        and restart the statistics
+        """
+        self._generation += 1
+        self._stores = 0
+        self._hits = 0
+
+    def get_statistics(self) -> dict[str, int]:
+        """
+        (dict[str, int]) Returns the number of stores and successful probes
+        since the last new_search
+        """
+        return {"stores": self._stores, "hits": self._hits}
+
+    def probe(self, key: int) -> Optional[tuple[int, int, int, Move]]:
+        """
+        Look up a position
+
+        Parameter:
+            key (int): the Zobrist hash of the position
+
+        Returns:
+            Optional[tuple[int, int, int, Move]]: the stored (depth, bound,
+            score, best move), or None if the position is not stored
+        """
+        entry = self._slots[key % self._size]
+        if entry is None or entry[0] != key:
+            return None
+        self._hits += 1
+        return entry[1:5]
+
+    def store(self, key: int, depth: int, bound: int, score: int,
+              move: Optional[Move]) -> None:
+        """
+        Store a search result, subject to the replacement policy
+
+        Parameters:
+            key (int): the Zobrist hash of the position
+            depth (int): the remaining depth the position was searched to
+            bound (int): EXACT, LOWER_BOUND or UPPER_BOUND
+            score (int): the score from the side to move's point of view
+            move (Optional[Move]): the best move found, if any
+        """
+        index = key % self._size
+        entry = self._slots[index]
+        if entry is not None and entry[5] == self._generation \
+                and entry[0] != key and entry[1] > depth:
+            return
+        self._slots[index] = (key, depth, bound, score, move,
+                              self._generation)
+        self._stores += 1
+
+
+class NegamaxBot:
+    """
+    A computer player which picks moves by iterative deepening negamax
+    search with alpha-beta pruning and a transposition table
+    """
+
+    def __init__(self, time_budget: float = DEFAULT_TIME_BUDGET,
+                 table_size: int = DEFAULT_TABLE_SIZE,
+                 max_depth: int = MAX_SEARCH_DEPTH,
+                 seed: int = 0, allow_removes: bool = True,
+                 use_threats: bool = False,
+                 node_budget: Optional[int] = None) -> None:
+        """
+        Construct a bot
+
+        Parameters:
+            time_budget (float): the number of seconds to search each move
+            table_size (int): the number of transposition table slots
+            max_depth (int): the deepest iteration to search
+            seed (int): the seed for the Zobrist keys
+            allow_removes (bool): False to only consider add moves
+            use_threats (bool): True to score quiet positions by open runs
+                with a ThreatEvaluator kept in step with the search
+            node_budget (Optional[int]): the most nodes to search each move,
+                or None for no limit. Unlike the time budget, it gives the
+                same move for the same position on any machine.
+        """
+        self._time_budget = time_budget
+        self._node_budget = node_budget
+        self._allow_removes = allow_removes
+        self._use_threats = use_threats
+        self._evaluator = None
+        self._max_depth = max_depth
+        self._table = TranspositionTable(table_size)
+        self._rng = random.Random(seed)
+        self._zobrist = {}
+        self._priorities = {}
+        self._side_key = self._rng.getrandbits(64)
+
+        self._nodes = 0
+        self._deadline = 0.0
+        self._statistics = {}
+
+    def __call__(self, board: list[str], piece: str) -> str:
+        """
+        Choose a command for play_game
+
+        Parameters:
+            board (list[str]): the current game state
+            piece (str): the piece of the player to move
+
+        Returns:
+            (str): the chosen "aX" or "rX" command
+        """
+        return move_to_command(self.choose_move(Bitboard.from_board(board),
+                                                piece))
+
+    def get_statistics(self) -> dict[str, float]:
+        """
+        Get the statistics of the last search: nodes, seconds, nodes per
+        second, completed depth and score, plus transposition table counts
+
+        Returns:
+            (dict[str, float]): the statistics by name
+        """
+        return dict(self._statistics)
+
+    def choose_move(self, bitboard: Bitboard, piece: str) -> Move:
+        """
+        Search the position within the time and node budgets and pick a
+        move
+
+        Parameters:
+            bitboard (Bitboard): the current game state, which is left
+                unchanged
+            piece (str): the piece of the player to move
+
+        Returns:
+            (Move): the best move found
+
+        Raises:
+            ValueError: if piece has no legal move
+        """
+        moves = self._ordered_moves(bitboard, None)
+        if not moves:
+            raise ValueError("no legal move to choose")
+        bitboard = bitboard.copy()
+        if self._use_threats:
+            self._evaluator = ThreatEvaluator.from_bitboard(bitboard)
+        self._table.new_search()
+        self._nodes = 0
+        start = time.perf_counter()
+        self._deadline = start + self._time_budget
+
+        key = self._hash(bitboard, piece)
+        best_move = moves[0]
+        best_score = 0
+        completed_depth = 0
+
+        for depth in range(1, self._max_depth + 1):
+            try:
+                score, move = self._search_root(bitboard, piece, key, depth)
+            except _SearchTimeout:
+                break
+            best_score, best_move = score, move
+            completed_depth = depth
+            # A forced result will not change with deeper searches
+            if abs(score) >= WIN_SCORE - self._max_depth:
+                break
+
+        elapsed = time.perf_counter() - start
+        self._statistics = {
+            "nodes": self._nodes,
+            "seconds": elapsed,
+            "nodes_per_second": self._nodes / elapsed if elapsed else 0.0,
+            "depth": completed_depth,
+            "score": best_score,
+            **self._table.get_statistics(),
+        }
+        return best_move
+
+    def _zobrist_key(self, piece: str, bit: int) -> int:
+        """
+        (int) Returns the Zobrist key for the piece on the given bit
+        """
+        key = self._zobrist.get((piece, bit))
+        if key is None:
+            key = self._zobrist[(piece, bit)] = self._rng.getrandbits(64)
+        return key
+
+    def _column_hash(self, bitboard: Bitboard, column_index: int) -> int:
+        """
+        (int) Returns the XOR of the Zobrist keys of a column's pieces
+        """
+        player_1 = bitboard.get_mask(PLAYER_1_PIECE)
+        key = 0
+        for height in range(bitboard.get_height(column_index)):
+            bit = bitboard.get_bit(column_index, height)
+            if player_1 >> bit & 1:
+                key ^= self._zobrist_key(PLAYER_1_PIECE, bit)
+            else:
+                key ^= self._zobrist_key(PLAYER_2_PIECE, bit)
+        return key
+
+    def _hash(self, bitboard: Bitboard, piece: str) -> int:
+        """
+        (int) Returns the Zobrist hash of the position with piece to move
+        """
+        key = self._side_key if piece == PLAYER_2_PIECE else 0
+        for column_index in range(bitboard.get_dimensions()[1]):
+            key ^= self._column_hash(bitboard, column_index)
+        return key
+
+    def _ordered_moves(self, bitboard: Bitboard,
+                       first: Optional[Move]) -> list[Move]:
+        """
+        Generate the legal moves, best guesses first: the stored best move,
+        then adds from the centre outwards, then removes
+
+        Parameters:
+            bitboard (Bitboard): the current game state
+            first (Optional[Move]): a move to try before all others
+
+        Returns:
+            (list[Move]): the legal moves in search order
+        """
+        columns = bitboard.get_dimensions()[1]
+        priority = self._priorities.get(columns)
+        if priority is None:
+            # Adds before removes, each from the centre column outwards
+            priority = self._priorities[columns] = {
+                (is_add, c): (not is_add, abs(2 * c - columns + 1))
+                for is_add in (True, False) for c in range(columns)}
+
+        moves = sorted(bitboard.legal_moves(), key=priority.__getitem__)
+        if not self._allow_removes:
+            moves = [move for move in moves if move[0]]
+        if first is not None and first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+        return moves
+
+    def _make_move(self, bitboard: Bitboard, piece: str, move: Move,
+                   key: int) -> int:
+        """
+        Apply a move and return the updated Zobrist hash
+
+        Parameters:
+            bitboard (Bitboard): the game state to change
+            piece (str): the piece of the player making the move
+            move (Move): a legal move
+            key (int): the hash before the move
+
+        Returns:
+            (int): the hash after the move, with the other side to move
+        """
+        if self._evaluator is not None:
+            self._evaluator.apply(move, piece)
+
+        is_add, column_index = move
+        key ^= self._side_key
+        if is_add:
+            bit = bitboard.get_bit(column_index,
+                                   bitboard.get_height(column_index))
+            bitboard.add_piece(piece, column_index)
+            return key ^ self._zobrist_key(piece, bit)
+
+        key ^= self._column_hash(bitboard, column_index)
+        bitboard.remove_piece(column_index)
+        return key ^ self._column_hash(bitboard, column_index)
+
+    def _unmake_move(self, bitboard: Bitboard, state: tuple) -> None:
+        """
+        Take back the last move made by _make_move
+
+        Parameters:
+            bitboard (Bitboard): the game state to restore
+            state (tuple): the bitboard's state from before the move
+        """
+        bitboard.set_state(state)
+        if self._evaluator is not None:
+            self._evaluator.undo()
+
+    def _evaluate(self, bitboard: Bitboard, piece: str) -> int:
+        """
+        (int) Returns a heuristic score of a quiet position for piece,
+        from the open runs if use_threats is set, otherwise counting the
+        pairs and triples each player has in a line
+        """
+        if self._evaluator is not None:
+            return self._evaluator.evaluate(piece)
+
+        score = 0
+        rows = bitboard.get_dimensions()[0]
+        for player, sign in ((piece, 1), (other_piece(piece), -1)):
+            mask = bitboard.get_mask(player)
+            for shift in (1, rows + 1, rows, rows + 2):
+                pairs = mask & (mask >> shift)
+                triples = pairs & (mask >> (2 * shift))
+                score += sign * (pairs.bit_count() + 4 * triples.bit_count())
+        return score
+
+    def _terminal_score(self, bitboard: Bitboard, mover: str,
+                        ply: int) -> Optional[int]:
+        """
+        Score the position just after mover's move if the game is over
+
+        Parameters:
+            bitboard (Bitboard): the game state after the move
+            mover (str): the piece of the player who just moved
+            ply (int): the number of moves from the root
+
+        Returns:
+            Optional[int]: the score from mover's point of view, preferring
+            quicker wins and slower losses, or None if the game continues
+        """
+        winner = bitboard.winner()
+        if winner is None:
+            # Without removes a full board has no moves left, so it is drawn,
+            # as in mcts_bot
+            if not self._allow_removes and all(
+                    bitboard.is_column_full(column_index) for column_index
+                    in range(bitboard.get_dimensions()[1])):
+                return 0
+            return None
+        if winner == BLANK_PIECE:
+            return 0
+        if winner == mover:
+            return WIN_SCORE - ply
+        return -(WIN_SCORE - ply)
+
+    def _search_root(self, bitboard: Bitboard, piece: str, key: int,
+                     depth: int) -> tuple[int, Move]:
+        """
+        Search every root move to the given depth
+
+        Returns:
+            (tuple[int, Move]): the best score and move
+        """
+        entry = self._table.probe(key)
+        moves = self._ordered_moves(bitboard, entry[3] if entry else None)
+        alpha = -WIN_SCORE - 1
+        beta = WIN_SCORE + 1
+        best_move = moves[0]
+        state = bitboard.get_state()
+
+        for move in moves:
+            child_key = self._make_move(bitboard, piece, move, key)
+            score = self._terminal_score(bitboard, piece, 1)
+            if score is None:
+                score = -self._negamax(bitboard, other_piece(piece),
+                                       child_key, depth - 1, 1,
+                                       -beta, -alpha)
+            self._unmake_move(bitboard, state)
+            if score > alpha:
+                alpha = score
+                best_move = move
+
+        self._table.store(key, depth, EXACT, alpha, best_move)
+        return alpha, best_move
+
+    def _negamax(self, bitboard: Bitboard, piece: str, key: int, depth: int,
+                 ply: int, alpha: int, beta: int) -> int:
+        """
+        Score a position for the side to move with alpha-beta pruning
+
+        Parameters:
+            bitboard (Bitboard): the game state, restored before returning
+            piece (str): the piece of the player to move
+            key (int): the Zobrist hash of the position
+            depth (int): the remaining depth to search
+            ply (int): the number of moves from the root
+            alpha (int): the score the side to move is already assured of
+            beta (int): the score the opponent is already assured of
+
+        Returns:
+            (int): the score from the side to move's point of view
+        """
+        self._nodes += 1
+        if self._node_budget is not None and self._nodes > self._node_budget:
+            raise _SearchTimeout()
+        if self._nodes % TIME_CHECK_INTERVAL == 0 \
+                and time.perf_counter() > self._deadline:
+            raise _SearchTimeout()
+
+        if depth == 0:
+            return self._evaluate(bitboard, piece)
+
+        original_alpha = alpha
+        entry = self._table.probe(key)
+        best_move = None
+        if entry is not None:
+            stored_depth, bound, stored_score, best_move = entry
+            stored_score = score_from_table(stored_score, ply)
+            if stored_depth >= depth:
+                if bound == EXACT:
+                    return stored_score
+                if bound == LOWER_BOUND:
+                    alpha = max(alpha, stored_score)
+                else:
+                    beta = min(beta, stored_score)
+                if alpha >= beta:
+                    return stored_score
+
+        state = bitboard.get_state()
+        opponent = other_piece(piece)
+        best_score = -WIN_SCORE - 1
+        for move in self._ordered_moves(bitboard, best_move):
+            child_key = self._make_move(bitboard, piece, move, key)
+            score = self._terminal_score(bitboard, piece, ply + 1)
+            if score is None:
+                score = -self._negamax(bitboard, opponent, child_key,
+                                       depth - 1, ply + 1, -beta, -alpha)
+            self._unmake_move(bitboard, state)
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self._table.store(key, depth, bound, score_to_table(best_score, ply),
+                          best_move)
+        return best_score
+
+
+def main() -> None:
+    """
+    Play Connect 4 (ish) against the computer, which plays as player 2
+    """
+    bot = NegamaxBot()
+    play_on = True
+    while play_on:
+        play_game({PLAYER_2_PIECE: bot})
+        stats = bot.get_statistics()
+        if stats:
+            print(f"Last search: depth {stats['depth']}, "
+                  f"{stats['nodes_per_second']:.0f} nodes/s")
+
+        user_response = input(CONTINUE_MESSAGE)
+        if user_response not in "Yy":
+            play_on = False
+
+if __name__ == "__main__":
+    main()
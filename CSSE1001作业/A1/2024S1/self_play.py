@@ -0,0 +1,246 @@
+import argparse
+import json
+import math
+import os
+import random
+import time
+from collections import Counter
+from multiprocessing import Pool
+from typing import Callable, Optional
+from a1_support import *
+from a1_solution import is_column_empty, is_column_full
+from headless import HeadlessGame
+from negamax_bot import NegamaxBot
+
+DEFAULT_MAX_MOVES = 500
+HISTOGRAM_BUCKET = 10
+HISTOGRAM_WIDTH = 50
+# Self-play bots stop on nodes searched rather than time, so a seeded run
+# plays the same games however loaded the machine is
+BOT_NODE_BUDGET = 5000
+BOT_TABLE_SIZE = 1 << 16
+
+UNFINISHED = "unfinished"
+RESULT_NAMES = {
+    PLAYER_1_PIECE: "player_1",
+    PLAYER_2_PIECE: "player_2",
+    BLANK_PIECE: "draw",
+    None: UNFINISHED,
+}
+
+
+class RandomAgent:
+    """
+    An agent which picks uniformly among the legal add and remove commands
+    """
+
+    def __init__(self, seed: int, allow_removes: bool = True) -> None:
+        """
+        Construct a random agent
+
+        Parameters:
+            seed (int): the seed for the agent's choices
+            allow_removes (bool): False to only pick add commands
+        """
+        self._rng = random.Random(seed)
+        self._allow_removes = allow_removes
+
+    def __call__(self, board: list[str], piece: str) -> str:
+        """
+        Choose a random legal command
+
+        Parameters:
+            board (list[str]): the current game state
+            piece (str): the piece of the player to move
+
+        Returns:
+            (str): the chosen "aX" or "rX" command
+        """
+        actions = [f"a{c + 1}" for c, column in enumerate(board)
+                   if not is_column_full(column)]
+        if self._allow_removes:
+            actions += [f"r{c + 1}" for c, column in enumerate(board)
+                        if not is_column_empty(column)]
+        return self._rng.choice(actions)
+
+
+def make_bot_agent(seed: int, allow_removes: bool = True) -> NegamaxBot:
+    """
+    (NegamaxBot) Returns a bot with a small node budget and no time limit,
+    suited to reproducible self-play
+    """
+    return NegamaxBot(time_budget=math.inf, table_size=BOT_TABLE_SIZE,
+                      seed=seed, allow_removes=allow_removes,
+                      node_budget=BOT_NODE_BUDGET)
+
+
+AGENTS: dict[str, Callable[[int, bool], Callable[[list[str], str], str]]] = {
+    "random": RandomAgent,
+    "negamax": make_bot_agent,
+}
+
+
+def game_seed(seed: int, game_index: int) -> int:
+    """
+    (int) Returns the seed for one game, so each game of a run can be
+    reproduced on its own whatever worker plays it
+    """
+    return random.Random(f"{seed}:{game_index}").getrandbits(32)
+
+
+def play_one_game(task: tuple[int, int, str, str, int, bool]) -> dict:
+    """
+    Play a single self-play game
+
+    Parameter:
+        task (tuple[int, int, str, str, int, bool]): the game index, run
+            seed, player 1 agent name, player 2 agent name, the move limit
+            and whether remove commands are allowed
+
+    Returns:
+        (dict): the game record, ready to be written as JSON
+    """
+    game_index, seed, player_1, player_2, max_moves, allow_removes = task
+    seed = game_seed(seed, game_index)
+    agents = {PLAYER_1_PIECE: AGENTS[player_1](seed, allow_removes),
+              PLAYER_2_PIECE: AGENTS[player_2](seed + 1, allow_removes)}
+
+    start = time.perf_counter()
+    game = HeadlessGame()
+    removes = 0
+    result = None
+    while not game.is_over() and game.get_turn_count() < max_moves:
+        actions = game.legal_actions()
+        if not allow_removes and not actions[0].startswith("a"):
+            # A full board can't progress without removes, so with no winner
+            # the game is drawn, as tournament records it
+            result = BLANK_PIECE
+            break
+        piece = game.get_piece()
+        action = agents[piece](game.get_board(), piece)
+        removes += action[0] in "rR"
+        game.step(action)
+    if result is None:
+        result = game.result()
+
+    return {
+        "game": game_index,
+        "seed": seed,
+        "result": RESULT_NAMES[result],
+        "moves": game.get_turn_count(),
+        "removes": removes,
+        "seconds": round(time.perf_counter() - start, 6),
+    }
+
+
+def format_histogram(lengths: Counter) -> str:
+    """
+    Draw a text histogram of game lengths
+
+    Parameter:
+        lengths (Counter): the number of games for each game length
+
+    Returns:
+        (str): one line per bucket of HISTOGRAM_BUCKET moves
+    """
+    buckets = Counter()
+    for length, count in lengths.items():
+        buckets[length // HISTOGRAM_BUCKET] += count
+    if not buckets:
+        return ""
+
+    largest = max(buckets.values())
+    lines = []
+    for bucket in range(min(buckets), max(buckets) + 1):
+        count = buckets[bucket]
+        low = bucket * HISTOGRAM_BUCKET
+        bar = "#" * round(HISTOGRAM_WIDTH * count / largest)
+        lines.append(f"{low:>5}-{low + HISTOGRAM_BUCKET - 1:<5} "
+                     f"{count:>8} {bar}")
+    return "\n".join(lines)
+
+
+def run_self_play(games: int, output_path: str, workers: Optional[int] = None,
+                  seed: int = 0, player_1: str = "random",
+                  player_2: str = "random",
+                  max_moves: int = DEFAULT_MAX_MOVES,
+                  allow_removes: bool = True) -> dict:
+    """
+    Play many self-play games across a process pool, writing one JSON line
+    per game as results arrive
+
+    Parameters:
+        games (int): the number of games to play
+        output_path (str): the JSONL file to write game records to
+        workers (Optional[int]): the number of processes, or None for one
+            per CPU
+        seed (int): the run seed; the same seed gives the same games
+        player_1 (str): the AGENTS name of player 1's agent
+        player_2 (str): the AGENTS name of player 2's agent
+        max_moves (int): the number of moves after which a game is
+            recorded as unfinished
+        allow_removes (bool): False to play without the remove rule
+
+    Returns:
+        (dict): the result rates, game length counts, games and seconds
+    """
+    tasks = [(index, seed, player_1, player_2, max_moves, allow_removes)
+             for index in range(games)]
+    results = Counter()
+    lengths = Counter()
+
+    start = time.perf_counter()
+    with Pool(workers) as pool, open(output_path, "w") as output:
+        chunksize = max(1, games // (4 * (workers or os.cpu_count() or 1)))
+        for record in pool.imap(play_one_game, tasks, chunksize):
+            output.write(json.dumps(record) + "\n")
+            results[record["result"]] += 1
+            lengths[record["moves"]] += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        "games": games,
+        "seconds": elapsed,
+        "games_per_second": games / elapsed if elapsed else 0.0,
+        "rates": {name: results[name] / games if games else 0.0
+                  for name in RESULT_NAMES.values()},
+        "lengths": dict(sorted(lengths.items())),
+    }
+
+
+def format_summary(summary: dict) -> str:
+    """
+    (str) Returns a human readable report of a run_self_play summary
+    """
+    lines = [f"{summary['games']} games in {summary['seconds']:.2f}s "
+             f"({summary['games_per_second']:.0f} games/s)"]
+    for name, rate in summary["rates"].items():
+        lines.append(f"{name:>10}: {rate:7.2%}")
+    lines.append("Game lengths:")
+    lines.append(format_histogram(Counter(summary["lengths"])))
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """
+    Run self-play from the command line and print the summary
+    """
+    parser = argparse.ArgumentParser(
+        description="Play connect-four self-play games in parallel")
+    parser.add_argument("games", type=int)
+    parser.add_argument("--output", default="self_play.jsonl")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--player-1", choices=AGENTS, default="random")
+    parser.add_argument("--player-2", choices=AGENTS, default="random")
+    parser.add_argument("--max-moves", type=int, default=DEFAULT_MAX_MOVES)
+    parser.add_argument("--no-removes", action="store_true")
+    args = parser.parse_args()
+
+    summary = run_self_play(args.games, args.output, args.workers, args.seed,
+                            args.player_1, args.player_2, args.max_moves,
+                            not args.no_removes)
+    print(format_summary(summary))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import random
+import unittest
+from typing import Optional
+from a1_support import *
+from a1_solution import (_check_win_by_lines, add_piece, check_win_around,
+                         generate_initial_board, get_changed_cells,
+                         is_column_empty, is_column_full, remove_piece)
+
+STREAMS = 500
+MAX_STREAM_MOVES = 200
+
+
+class CheckWinAroundTest(unittest.TestCase):
+    """
+    check_win_around agrees with the full-board scan after every move
+    """
+
+    def replay(self, seed: int, remove_chance: float) -> Optional[str]:
+        """
+        Play random adds and removes from an empty board until someone wins,
+        comparing the two win checks after each move
+
+        Parameters:
+            seed (int): the seed for the stream
+            remove_chance (float): the chance each move is a remove
+
+        Returns:
+            Optional[str]: the winner, or None if nobody won in
+            MAX_STREAM_MOVES moves
+        """
+        rng = random.Random(seed)
+        board = generate_initial_board()
+        piece = PLAYER_1_PIECE
+        for move in range(MAX_STREAM_MOVES):
+            adds = [c for c in range(BOARD_SIZE)
+                    if not is_column_full(board[c])]
+            removes = [c for c in range(BOARD_SIZE)
+                       if not is_column_empty(board[c])]
+            added = not removes or (adds and rng.random() >= remove_chance)
+            if added:
+                column_index = rng.choice(adds)
+                self.assertTrue(add_piece(board, piece, column_index))
+            else:
+                column_index = rng.choice(removes)
+                self.assertTrue(remove_piece(board, column_index))
+
+            changed = get_changed_cells(board, column_index, added)
+            winner = check_win_around(board, changed)
+            self.assertEqual(winner, _check_win_by_lines(board),
+                             f"seed {seed}, move {move}, board {board}")
+            if winner is not None:
+                # check_win_around assumes nobody had won before the move
+                return winner
+            piece = PLAYER_2_PIECE if piece == PLAYER_1_PIECE \
+                else PLAYER_1_PIECE
+        return None
+
+    def test_adds_only(self) -> None:
+        for seed in range(STREAMS):
+            self.replay(seed, 0.0)
+
+    def test_adds_and_removes(self) -> None:
+        # Shifting a column down can complete lines for both players, so
+        # the streams reach draws as well as wins
+        winners = {self.replay(seed, 0.3) for seed in range(STREAMS)}
+        self.assertLessEqual({PLAYER_1_PIECE, PLAYER_2_PIECE, BLANK_PIECE},
+                             winners)
+
+    def test_mostly_removes(self) -> None:
+        for seed in range(STREAMS):
+            self.replay(seed, 0.6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+from typing import Optional
+from a1_support import *
+from bitboard import Bitboard
+from endgame_db import DISTANCE_MASK, DRAW, LOSS, MAX_INDEX_SIZE, \
+    RESULT_SHIFT, UNREACHABLE, WIN, EndgameDatabase, _Encoding, \
+    build_database, solve
+
+
+def to_bitboard(encoding: _Encoding, codes: list[int],
+                win_length: int) -> Bitboard:
+    """
+    (Bitboard) Returns the position given by column codes
+    """
+    bitboard = Bitboard(encoding.rows, encoding.columns, win_length)
+    player_1 = player_2 = 0
+    for c, code in enumerate(codes):
+        player_1 |= encoding.player_1_bits[code] << bitboard.get_bit(c, 0)
+        player_2 |= encoding.player_2_bits[code] << bitboard.get_bit(c, 0)
+    bitboard.set_masks(player_1, player_2)
+    return bitboard
+
+
+class SolveTest(unittest.TestCase):
+    """
+    Every reachable position's value agrees with the values of its moves,
+    found by playing the game out rather than through the index
+    """
+
+    CONFIGURATIONS = [(3, 3, 3), (2, 4, 3), (2, 2, 2), (3, 1, 2)]
+
+    def _reachable(self, encoding: _Encoding,
+                   win_length: int) -> dict[tuple[int, ...], Optional[str]]:
+        """
+        (dict[tuple[int, ...], Optional[str]]) Returns every position a
+        game can reach, by its column codes, with its winner
+        """
+        start = (0,) * encoding.columns
+        winners = {start: None}
+        frontier = [start]
+        while frontier:
+            codes = frontier.pop()
+            if winners[codes] is not None:
+                continue
+            for _, child in encoding.successors(list(codes)):
+                child = tuple(child)
+                if child not in winners:
+                    bitboard = to_bitboard(encoding, list(child), win_length)
+                    winners[child] = bitboard.winner()
+                    frontier.append(child)
+        return winners
+
+    def test_values_follow_moves(self) -> None:
+        for rows, columns, win_length in self.CONFIGURATIONS:
+            encoding = _Encoding(rows, columns)
+            values, reachable = solve(rows, columns, win_length)
+            winners = self._reachable(encoding, win_length)
+            indices = {encoding.index(list(codes)) for codes in winners}
+            self.assertEqual(reachable, len(indices))
+            self.assertEqual(reachable,
+                             int((values != UNREACHABLE).sum()))
+
+            def value(codes: list[int]) -> tuple[int, int]:
+                value = int(values[encoding.index(codes)])
+                return value >> RESULT_SHIFT, value & DISTANCE_MASK
+
+            for codes, winner in winners.items():
+                codes = list(codes)
+                result = value(codes)
+                if winner is not None:
+                    if winner == BLANK_PIECE:
+                        expected = DRAW
+                    elif winner == encoding.piece_to_move(codes):
+                        expected = WIN
+                    else:
+                        expected = LOSS
+                    self.assertEqual(result, (expected, 0))
+                    continue
+
+                children = [value(child)
+                            for _, child in encoding.successors(codes)]
+                losses = [distance for result, distance in children
+                          if result == LOSS]
+                wins = [distance for result, distance in children
+                        if result == WIN]
+                if losses:
+                    self.assertEqual(result, (WIN, min(losses) + 1))
+                elif len(wins) == len(children):
+                    self.assertEqual(result, (LOSS, max(wins) + 1))
+                else:
+                    self.assertEqual(result, (DRAW, 0))
+
+    def test_request_example_fits(self) -> None:
+        # 5x5 with a win length of 4 is the largest board solved in memory
+        self.assertLessEqual(_Encoding(5, 5).size, MAX_INDEX_SIZE)
+        self.assertGreater(_Encoding(6, 5).size, MAX_INDEX_SIZE)
+
+
+class DatabaseTest(unittest.TestCase):
+    """
+    Databases are read back with the values they were built with
+    """
+
+    def test_round_trip(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "endgame.db")
+        reachable = build_database(path, 3, 3, 3)
+        values, _ = solve(3, 3, 3)
+
+        with EndgameDatabase(path) as database:
+            self.assertEqual(len(database), reachable)
+            self.assertEqual(database.get_configuration(), (3, 3, 3))
+            bitboard = Bitboard(3, 3, 3)
+            value = int(values[_Encoding(3, 3).index([0, 0, 0])])
+            self.assertEqual(database.lookup(bitboard),
+                             (value >> RESULT_SHIFT, value & DISTANCE_MASK))
+            self.assertIn(database.best_move(bitboard),
+                          bitboard.legal_moves())
+
+
+if __name__ == "__main__":
+    unittest.main()
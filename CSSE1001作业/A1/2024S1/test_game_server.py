@@ -0,0 +1,63 @@
+import asyncio
+import unittest
+from a1_support import *
+from a1_solution import get_input_error
+from game_server import GameServer
+
+
+class NonAsciiMoveTest(unittest.IsolatedAsyncioTestCase):
+    """
+    Columns written with non-ASCII digits are refused, not crashed on
+    """
+
+    async def asyncSetUp(self) -> None:
+        self.server = await GameServer().serve(port=0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _connect(self) -> tuple[asyncio.StreamReader,
+                                      asyncio.StreamWriter]:
+        return await asyncio.open_connection("127.0.0.1", self.port)
+
+    async def _send(self, reader: asyncio.StreamReader,
+                    writer: asyncio.StreamWriter, line: str) -> str:
+        writer.write(line.encode() + b"\n")
+        await writer.drain()
+        return await self._receive(reader)
+
+    async def _receive(self, reader: asyncio.StreamReader) -> str:
+        reply = await asyncio.wait_for(reader.readline(), timeout=5)
+        return reply.decode().strip()
+
+    def test_input_error(self) -> None:
+        for command in ("a²", "r¹", "a٣", "a１"):
+            self.assertEqual(get_input_error(command), INVALID_FORMAT_MESSAGE)
+
+    async def test_move_is_refused(self) -> None:
+        reader, writer = await self._connect()
+        other_reader, other_writer = await self._connect()
+        reply = await self._send(reader, writer, "new")
+        match_id = reply.split()[1]
+        self.assertEqual(await self._send(other_reader, other_writer,
+                                          f"join {match_id}"),
+                         f"GAME {match_id} {PLAYER_2_PIECE}")
+
+        self.assertEqual(await self._send(reader, writer, "a²"),
+                         f"ERR {INVALID_FORMAT_MESSAGE}")
+        # The connection and the game survive the bad move. Both players
+        # are sent the move before the mover's reply
+        move = f"MOVE {PLAYER_1_PIECE} a1"
+        self.assertEqual(await self._send(reader, writer, "a1"), move)
+        self.assertEqual(await self._receive(reader), "OK")
+        self.assertEqual(await self._receive(other_reader), move)
+
+        for stream in (writer, other_writer):
+            stream.close()
+            await stream.wait_closed()
+
+
+if __name__ == "__main__":
+    unittest.main()
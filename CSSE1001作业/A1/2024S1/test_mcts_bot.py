@@ -0,0 +1,59 @@
+import random
+import unittest
+from a1_support import *
+from bitboard import Bitboard
+from mcts_bot import NO_MOVE_DRAW, MCTSBot, _playout, search
+
+# A full board where neither player has a line
+FULL_DRAWN_BOARD = ['XOXOXXXO', 'OOXOOOXX', 'XOXXOXOX', 'OXOXOXOO',
+                    'OOOXXOXO', 'OXXOXOOX', 'XOOXXXOX', 'XOXOOXOX']
+
+
+class NoLegalMoveTest(unittest.TestCase):
+    """
+    Positions with no legal move are drawn rather than searched forever
+    """
+
+    def setUp(self) -> None:
+        self.bitboard = Bitboard.from_board(FULL_DRAWN_BOARD)
+        self.assertIsNone(self.bitboard.winner())
+
+    def test_playout_on_full_board_is_draw(self) -> None:
+        winner = _playout(self.bitboard, PLAYER_1_PIECE, random.Random(0),
+                          False)
+        self.assertEqual(winner, NO_MOVE_DRAW)
+
+    def test_playout_filling_board_is_draw(self) -> None:
+        # Emptying the top square of a column leaves one move, after which
+        # the board is full again
+        board = list(FULL_DRAWN_BOARD)
+        board[0] = BLANK_PIECE + board[0][1:]
+        bitboard = Bitboard.from_board(board)
+        winner = _playout(bitboard, PLAYER_1_PIECE, random.Random(0), False)
+        self.assertIn(winner, (NO_MOVE_DRAW, PLAYER_1_PIECE))
+
+    def test_search_with_no_moves(self) -> None:
+        task = (self.bitboard.get_state(), (BOARD_SIZE, BOARD_SIZE,
+                                            REQUIRED_WIN_LENGTH),
+                PLAYER_1_PIECE, 0.01, 1.4, 0, False)
+        self.assertEqual(search(task), ({}, 0))
+
+    def test_search_expands_into_full_board(self) -> None:
+        board = list(FULL_DRAWN_BOARD)
+        board[0] = BLANK_PIECE + board[0][1:]
+        bitboard = Bitboard.from_board(board)
+        task = (bitboard.get_state(), (BOARD_SIZE, BOARD_SIZE,
+                                       REQUIRED_WIN_LENGTH),
+                PLAYER_1_PIECE, 0.05, 1.4, 0, False)
+        visits, playouts = search(task)
+        self.assertEqual(list(visits), [(True, 0)])
+        self.assertGreater(playouts, 1)
+
+    def test_bot_refuses_when_no_moves(self) -> None:
+        bot = MCTSBot(time_budget=0.01, allow_removes=False)
+        with self.assertRaises(ValueError):
+            bot.choose_move(self.bitboard, PLAYER_1_PIECE)
+
+
+if __name__ == "__main__":
+    unittest.main()
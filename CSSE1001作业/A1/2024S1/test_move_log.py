@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+from a1_support import *
+from move_log import HEADER, MAGIC, MAX_COLUMNS, MoveLogReader, \
+    MoveLogWriter
+
+
+class ColumnLimitTest(unittest.TestCase):
+    """
+    Column indices share the action byte with REMOVE_FLAG, so boards wider
+    than MAX_COLUMNS are refused rather than logged wrongly
+    """
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "game.c4log")
+
+    def test_widest_board_round_trips(self) -> None:
+        # Adds and removes in the last columns, whose indices are next to
+        # the flag bit, with snapshots between them
+        commands = [f"a{MAX_COLUMNS}", f"a{MAX_COLUMNS - 1}",
+                    f"r{MAX_COLUMNS}", f"a{MAX_COLUMNS}", "a1",
+                    f"r{MAX_COLUMNS - 1}"]
+        with MoveLogWriter(self.path, rows=2, columns=MAX_COLUMNS,
+                           win_length=3, snapshot_interval=4) as writer:
+            for command in commands:
+                writer.record(command)
+
+        with MoveLogReader(self.path) as reader:
+            self.assertEqual(list(reader.actions()), commands)
+            board = reader.get_board_at(len(commands))
+        self.assertEqual(board[0], BLANK_PIECE + PLAYER_1_PIECE)
+        self.assertEqual(board[MAX_COLUMNS - 2], BLANK_PIECE * 2)
+        self.assertEqual(board[MAX_COLUMNS - 1],
+                         BLANK_PIECE + PLAYER_2_PIECE)
+
+    def test_wider_board_is_refused(self) -> None:
+        with self.assertRaises(ValueError):
+            MoveLogWriter(self.path, rows=2, columns=MAX_COLUMNS + 1)
+        self.assertFalse(os.path.exists(self.path))
+
+        with open(self.path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, 2, MAX_COLUMNS + 1, 3, 4))
+        with self.assertRaises(ValueError):
+            MoveLogReader(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+from a1_support import *
+from bitboard import Bitboard
+from negamax_bot import NegamaxBot
+from test_mcts_bot import FULL_DRAWN_BOARD
+
+
+class NoLegalMoveTest(unittest.TestCase):
+    """
+    Without removes a full board is drawn, and has no move to choose
+    """
+
+    def _bot(self) -> NegamaxBot:
+        return NegamaxBot(table_size=1 << 10, max_depth=4,
+                          allow_removes=False, node_budget=10_000)
+
+    def test_bot_refuses_when_no_moves(self) -> None:
+        bitboard = Bitboard.from_board(FULL_DRAWN_BOARD)
+        with self.assertRaises(ValueError):
+            self._bot().choose_move(bitboard, PLAYER_1_PIECE)
+
+    def test_filling_the_board_is_a_draw(self) -> None:
+        # Emptying the top squares of two columns leaves two moves, after
+        # which the board is full with no line, so either way is a draw
+        board = list(FULL_DRAWN_BOARD)
+        for column_index in (0, 1):
+            board[column_index] = BLANK_PIECE + board[column_index][1:]
+        bitboard = Bitboard.from_board(board)
+        for piece in (PLAYER_1_PIECE, PLAYER_2_PIECE):
+            bot = self._bot()
+            move = bot.choose_move(bitboard, piece)
+            self.assertIn(move, [(True, 0), (True, 1)])
+            self.assertEqual(bot.get_statistics()["score"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
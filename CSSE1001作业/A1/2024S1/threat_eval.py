@@ -0,0 +1,253 @@
+from functools import lru_cache
+from a1_support import *
+from bitboard import Bitboard, Move
+from game import get_win_windows
+
+# Score of each open run, by its length, for the heuristic evaluation
+RUN_WEIGHTS = {2: 1, 3: 8}
+
+_OTHER = {PLAYER_1_PIECE: PLAYER_2_PIECE, PLAYER_2_PIECE: PLAYER_1_PIECE}
+
+
+@lru_cache(maxsize=None)
+def get_window_ids(rows: int, columns: int,
+                   win_length: int) -> tuple[tuple[tuple[int, ...], ...], int]:
+    """
+    Number the win windows of a board configuration. The table is cached,
+    so it is only built once per configuration.
+
+    Parameters:
+        rows (int): the number of rows on the board
+        columns (int): the number of columns on the board
+        win_length (int): the number of pieces in a line needed to win
+
+    Returns:
+        (tuple[tuple[tuple[int, ...], ...], int]): for each cell, the ids
+        of the windows containing it, and the number of windows
+    """
+    ids = {}
+    cell_ids = []
+    for windows in get_win_windows(rows, columns, win_length):
+        cell_ids.append(tuple(ids.setdefault(window, len(ids))
+                              for window in windows))
+    return tuple(cell_ids), len(ids)
+
+
+class ThreatEvaluator:
+    """
+    Counts each player's open runs: win windows holding some of their
+    pieces and none of their opponent's. The counts are updated for the
+    windows through each changed cell only, so adding a piece costs
+    O(win_length) whatever the board size, and reading them costs O(1).
+    """
+
+    def __init__(self, rows: int = BOARD_SIZE, columns: int = BOARD_SIZE,
+                 win_length: int = REQUIRED_WIN_LENGTH) -> None:
+        """
+        Construct an evaluator for an empty board
+
+        Parameters:
+            rows (int): the number of rows on the board
+            columns (int): the number of columns on the board
+            win_length (int): the number of pieces in a line needed to win
+        """
+        self._rows = rows
+        self._columns = columns
+        self._win_length = win_length
+        self._cell_windows, window_count = get_window_ids(rows, columns,
+                                                          win_length)
+
+        self._cells = [BLANK_PIECE] * (rows * columns)
+        self._heights = [0] * columns
+        # Pieces of each player in each window
+        self._window_pieces = {PLAYER_1_PIECE: [0] * window_count,
+                               PLAYER_2_PIECE: [0] * window_count}
+        # Open windows of each player by the number of pieces in them
+        self._runs = {PLAYER_1_PIECE: [window_count] + [0] * win_length,
+                      PLAYER_2_PIECE: [window_count] + [0] * win_length}
+        self._history = []
+
+    @classmethod
+    def from_bitboard(cls, bitboard: Bitboard) -> "ThreatEvaluator":
+        """
+        Build an evaluator for the position on a bitboard
+
+        Parameter:
+            bitboard (Bitboard): the game state
+
+        Returns:
+            (ThreatEvaluator): an evaluator matching the position
+        """
+        rows, columns = bitboard.get_dimensions()
+        evaluator = cls(rows, columns, bitboard.get_win_length())
+        player_1 = bitboard.get_mask(PLAYER_1_PIECE)
+        for c in range(columns):
+            for height in range(bitboard.get_height(c)):
+                if player_1 >> bitboard.get_bit(c, height) & 1:
+                    piece = PLAYER_1_PIECE
+                else:
+                    piece = PLAYER_2_PIECE
+                evaluator._set_cell(c * rows + rows - 1 - height, piece)
+            evaluator._heights[c] = bitboard.get_height(c)
+        return evaluator
+
+    def get_run_counts(self, piece: str) -> dict[int, int]:
+        """
+        (dict[int, int]) Returns the number of open runs of the player for
+        each length from 1 to win_length
+        """
+        runs = self._runs[piece]
+        return {length: runs[length]
+                for length in range(1, self._win_length + 1)}
+
+    def evaluate(self, piece: str) -> int:
+        """
+        Score the position heuristically from one player's point of view,
+        in O(1)
+
+        Parameter:
+            piece (str): the player to score for
+
+        Returns:
+            (int): the weighted open runs of the player minus those of
+            their opponent
+        """
+        own = self._runs[piece]
+        other = self._runs[_OTHER[piece]]
+        score = 0
+        for length, weight in RUN_WEIGHTS.items():
+            if length <= self._win_length:
+                score += weight * (own[length] - other[length])
+        return score
+
+    def add_piece(self, piece: str, column_index: int) -> bool:
+        """
+        Add a piece to the top of a column, if the column is not full
+
+        Parameters:
+            piece (str): the type of piece to be added
+            column_index (int): the index of the column to add to
+
+        Returns:
+            (bool): True if the piece was added, otherwise False
+        """
+        height = self._heights[column_index]
+        if height == self._rows:
+            return False
+
+        cell = column_index * self._rows + self._rows - 1 - height
+        self._set_cell(cell, piece)
+        self._heights[column_index] = height + 1
+        self._history.append((True, column_index, piece))
+        return True
+
+    def remove_piece(self, column_index: int) -> bool:
+        """
+        Remove the bottom piece of a column, if the column is not empty,
+        dropping the rest of the column down by one. Every piece in the
+        column moves, so this costs O(height * win_length).
+
+        Parameters:
+            column_index (int): the index of the column to remove from
+
+        Returns:
+            (bool): True if a piece was removed, otherwise False
+        """
+        height = self._heights[column_index]
+        if height == 0:
+            return False
+
+        bottom = column_index * self._rows + self._rows - 1
+        removed = self._cells[bottom]
+        self._shift_column(bottom, height, -1)
+        self._heights[column_index] = height - 1
+        self._history.append((False, column_index, removed))
+        return True
+
+    def apply(self, move: Move, piece: str) -> None:
+        """
+        Apply a legal search move
+
+        Parameters:
+            move (Move): the (is_add, column_index) move
+            piece (str): the piece of the player making the move
+        """
+        is_add, column_index = move
+        if is_add:
+            self.add_piece(piece, column_index)
+        else:
+            self.remove_piece(column_index)
+
+    def undo(self) -> None:
+        """
+        Reverse the most recent add or remove
+        """
+        is_add, column_index, piece = self._history.pop()
+        height = self._heights[column_index]
+        bottom = column_index * self._rows + self._rows - 1
+        if is_add:
+            self._set_cell(bottom - (height - 1), BLANK_PIECE)
+            self._heights[column_index] = height - 1
+        else:
+            self._shift_column(bottom, height, 1)
+            self._set_cell(bottom, piece)
+            self._heights[column_index] = height + 1
+
+    def _shift_column(self, bottom: int, height: int, direction: int) -> None:
+        """
+        Move a column's pieces down (direction -1) or up (direction 1) by
+        one cell. Dropping blanks the old top cell; raising leaves the
+        bottom cell for the caller to fill.
+
+        Parameters:
+            bottom (int): the cell number of the column's bottom cell
+            height (int): the number of pieces in the column
+            direction (int): -1 to drop the pieces, 1 to raise them
+        """
+        cells = self._cells
+        pieces = [cells[bottom - offset] for offset in range(height)]
+        if direction < 0:
+            # The bottom piece leaves; each other piece takes the cell below
+            for offset in range(height - 1):
+                if cells[bottom - offset] != pieces[offset + 1]:
+                    self._set_cell(bottom - offset, pieces[offset + 1])
+            self._set_cell(bottom - (height - 1), BLANK_PIECE)
+        else:
+            for offset in range(height, 0, -1):
+                if cells[bottom - offset] != pieces[offset - 1]:
+                    self._set_cell(bottom - offset, pieces[offset - 1])
+
+    def _set_cell(self, cell: int, piece: str) -> None:
+        """
+        Change one cell, updating the run counts of the windows through it
+        """
+        old = self._cells[cell]
+        if old == piece:
+            return
+        self._cells[cell] = piece
+
+        window_pieces = self._window_pieces
+        player_1 = window_pieces[PLAYER_1_PIECE]
+        player_2 = window_pieces[PLAYER_2_PIECE]
+        runs_1 = self._runs[PLAYER_1_PIECE]
+        runs_2 = self._runs[PLAYER_2_PIECE]
+        for window in self._cell_windows[cell]:
+            count_1 = player_1[window]
+            count_2 = player_2[window]
+            # Take the window's old contribution out
+            if count_2 == 0:
+                runs_1[count_1] -= 1
+            if count_1 == 0:
+                runs_2[count_2] -= 1
+
+            if old != BLANK_PIECE:
+                window_pieces[old][window] -= 1
+            if piece != BLANK_PIECE:
+                window_pieces[piece][window] += 1
+
+            count_1 = player_1[window]
+            count_2 = player_2[window]
+            if count_2 == 0:
+                runs_1[count_1] += 1
+            if count_1 == 0:
+                runs_2[count_2] += 1
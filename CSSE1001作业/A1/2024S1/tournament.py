@@ -0,0 +1,372 @@
+import argparse
+import importlib
+import json
+import math
+import os
+import random
+import time
+from itertools import permutations
+from multiprocessing import Pool
+from typing import Callable, Optional
+from a1_support import *
+from a1_solution import (ADD_COMMAND, REMOVE_COMMAND, add_piece,
+                         check_win_around, generate_initial_board,
+                         get_changed_cells, get_input_error, is_column_empty,
+                         is_column_full, remove_piece)
+from self_play import AGENTS, DEFAULT_MAX_MOVES
+
+DEFAULT_GAMES_PER_PAIRING = 10
+DEFAULT_BOOTSTRAP = 200
+# Ratings are centred on this value
+BASE_RATING = 1500
+ELO_SCALE = 400
+# Virtual draws between every pair of agents, so an agent that wins or
+# loses every game still gets a finite rating
+PRIOR_DRAWS = 1
+FIT_ITERATIONS = 200
+CONFIDENCE = 0.95
+
+# Scores for the first named agent of a match
+SCORES = {"player_1": 1.0, "player_2": 0.0, "draw": 0.5, "unfinished": 0.5}
+
+
+def load_agent(spec: str) -> Callable[[int, bool],
+                                      Callable[[list[str], str], str]]:
+    """
+    Find an agent factory by name
+
+    Parameter:
+        spec (str): a self_play AGENTS name, or "module:name" for a factory
+            defined elsewhere. A factory is called with a seed and whether
+            removes are allowed, and returns an agent which is called with
+            the board and its piece and returns a command.
+
+    Returns:
+        (Callable[[int, bool], Callable[[list[str], str], str]]): the factory
+    """
+    if spec in AGENTS:
+        return AGENTS[spec]
+    module_name, _, name = spec.partition(":")
+    if not name:
+        raise ValueError(f"unknown agent {spec!r}, expected one of "
+                         f"{', '.join(AGENTS)} or module:name")
+    return getattr(importlib.import_module(module_name), name)
+
+
+def match_key(player_1: str, player_2: str, game_index: int) -> str:
+    """
+    (str) Returns the name identifying one match of a tournament, used to
+    find the matches already played when resuming
+    """
+    return f"{player_1}|{player_2}|{game_index}"
+
+
+def play_match(task: tuple[str, str, int, int, int, bool]) -> dict:
+    """
+    Play one match, applying each agent's commands with the a1_solution
+    rule functions as play_game does. An agent which gives an invalid
+    command, a move which fails, or a help or quit command forfeits the
+    match. Without removes, a full board leaves no legal move, so the match
+    is a draw.
+
+    Parameter:
+        task (tuple[str, str, int, int, int, bool]): player 1's agent spec,
+            player 2's agent spec, the game index within the pairing, the
+            tournament seed, the move limit and whether removes are allowed
+
+    Returns:
+        (dict): the match record, ready to be written as JSON
+    """
+    player_1, player_2, game_index, seed, max_moves, allow_removes = task
+    key = match_key(player_1, player_2, game_index)
+    seed = random.Random(f"{seed}:{key}").getrandbits(32)
+    agents = {PLAYER_1_PIECE: load_agent(player_1)(seed, allow_removes),
+              PLAYER_2_PIECE: load_agent(player_2)(seed + 1, allow_removes)}
+    names = {PLAYER_1_PIECE: "player_1", PLAYER_2_PIECE: "player_2"}
+
+    start = time.perf_counter()
+    board = generate_initial_board()
+    piece = PLAYER_1_PIECE
+    result = "unfinished"
+    forfeit = None
+    moves = 0
+    while moves < max_moves:
+        # As in self_play, a full board can't progress without removes, and
+        # the agents can't be asked for a move that doesn't exist
+        if not allow_removes and all(is_column_full(column)
+                                     for column in board):
+            result = "draw"
+            break
+        command = agents[piece](list(board), piece)
+        moved = False
+        if isinstance(command, str) and get_input_error(command) is None \
+                and command[0] in ADD_COMMAND + REMOVE_COMMAND:
+            target_col = int(command[1:]) - 1
+            added = command[0] in ADD_COMMAND
+            # Check first, as add_piece and remove_piece print on failure
+            if added and not is_column_full(board[target_col]):
+                moved = add_piece(board, piece, target_col)
+            elif not added and not is_column_empty(board[target_col]):
+                moved = remove_piece(board, target_col)
+
+        if not moved:
+            forfeit = command
+            result = names[PLAYER_2_PIECE if piece == PLAYER_1_PIECE
+                           else PLAYER_1_PIECE]
+            break
+
+        moves += 1
+        winner = check_win_around(board,
+                                  get_changed_cells(board, target_col, added))
+        if winner == BLANK_PIECE:
+            result = "draw"
+            break
+        if winner is not None:
+            result = names[winner]
+            break
+        piece = PLAYER_2_PIECE if piece == PLAYER_1_PIECE else PLAYER_1_PIECE
+
+    return {
+        "key": key,
+        "player_1": player_1,
+        "player_2": player_2,
+        "game": game_index,
+        "seed": seed,
+        "result": result,
+        "moves": moves,
+        "forfeit": forfeit,
+        "seconds": round(time.perf_counter() - start, 6),
+    }
+
+
+def schedule(agents: list[str], games_per_pairing: int, seed: int,
+             max_moves: int, allow_removes: bool
+             ) -> list[tuple[str, str, int, int, int, bool]]:
+    """
+    List every match of a round robin, in which each ordered pair of agents
+    plays games_per_pairing matches, so each agent plays every other the
+    same number of times as player 1 and as player 2
+
+    Returns:
+        (list[tuple[str, str, int, int, int, bool]]): the play_match tasks,
+        interleaved so early results cover every pairing
+    """
+    pairings = list(permutations(agents, 2))
+    return [(player_1, player_2, game_index, seed, max_moves, allow_removes)
+            for game_index in range(games_per_pairing)
+            for player_1, player_2 in pairings]
+
+
+def load_checkpoint(path: str) -> list[dict]:
+    """
+    Read the match records already written to a checkpoint file. A line
+    cut short by a crash is ignored, so its match is played again.
+
+    Parameter:
+        path (str): the JSONL checkpoint file, which need not exist
+
+    Returns:
+        (list[dict]): the complete match records
+    """
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path) as file:
+        for line in file:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def fit_ratings(records: list[dict], agents: list[str]) -> dict[str, float]:
+    """
+    Find the Elo ratings which best explain the match results, by fitting
+    a Bradley-Terry model with minorization-maximization. Unlike updating
+    ratings match by match, the fit does not depend on the order in which
+    results arrived from the workers. Draws and unfinished matches count as
+    half a win to each agent.
+
+    Parameters:
+        records (list[dict]): the match records
+        agents (list[str]): every agent in the tournament
+
+    Returns:
+        (dict[str, float]): each agent's rating, averaging BASE_RATING
+    """
+    index = {agent: i for i, agent in enumerate(agents)}
+    count = len(agents)
+    wins = [PRIOR_DRAWS * 0.5 * (count - 1)] * count
+    games = [[PRIOR_DRAWS if i != j else 0 for j in range(count)]
+             for i in range(count)]
+    for record in records:
+        i, j = index[record["player_1"]], index[record["player_2"]]
+        score = SCORES[record["result"]]
+        wins[i] += score
+        wins[j] += 1 - score
+        games[i][j] += 1
+        games[j][i] += 1
+
+    strengths = [1.0] * count
+    for _ in range(FIT_ITERATIONS):
+        for i in range(count):
+            denominator = sum(games[i][j] / (strengths[i] + strengths[j])
+                              for j in range(count) if games[i][j])
+            strengths[i] = wins[i] / denominator
+        # Keep the geometric mean at 1, so ratings average BASE_RATING
+        mean = math.exp(sum(map(math.log, strengths)) / count)
+        strengths = [strength / mean for strength in strengths]
+
+    return {agent: BASE_RATING + ELO_SCALE * math.log10(strengths[i])
+            for agent, i in index.items()}
+
+
+def rate(records: list[dict], agents: list[str],
+         bootstrap: int = DEFAULT_BOOTSTRAP, seed: int = 0) -> list[dict]:
+    """
+    Rate the agents, with confidence intervals from refitting the ratings
+    on bootstrap resamples of the matches
+
+    Parameters:
+        records (list[dict]): the match records
+        agents (list[str]): every agent in the tournament
+        bootstrap (int): the number of resamples, or 0 for no intervals
+        seed (int): the seed for resampling
+
+    Returns:
+        (list[dict]): per agent, its rating, interval, games and score,
+        best rated first
+    """
+    ratings = fit_ratings(records, agents)
+    samples = {agent: [] for agent in agents}
+    rng = random.Random(seed)
+    for _ in range(bootstrap if records else 0):
+        resample = rng.choices(records, k=len(records))
+        for agent, rating in fit_ratings(resample, agents).items():
+            samples[agent].append(rating)
+
+    table = []
+    tail = (1 - CONFIDENCE) / 2
+    for agent in agents:
+        played = [record for record in records
+                  if agent in (record["player_1"], record["player_2"])]
+        score = sum(SCORES[record["result"]]
+                    if record["player_1"] == agent
+                    else 1 - SCORES[record["result"]] for record in played)
+        ordered = sorted(samples[agent])
+        if ordered:
+            low = ordered[int(tail * (len(ordered) - 1))]
+            high = ordered[math.ceil((1 - tail) * (len(ordered) - 1))]
+        else:
+            low = high = math.nan
+        table.append({
+            "agent": agent,
+            "rating": ratings[agent],
+            "low": low,
+            "high": high,
+            "games": len(played),
+            "score": score / len(played) if played else 0.0,
+        })
+    table.sort(key=lambda row: row["rating"], reverse=True)
+    return table
+
+
+def run_tournament(agents: list[str], checkpoint_path: str,
+                   games_per_pairing: int = DEFAULT_GAMES_PER_PAIRING,
+                   workers: Optional[int] = None, seed: int = 0,
+                   max_moves: int = DEFAULT_MAX_MOVES,
+                   allow_removes: bool = True) -> list[dict]:
+    """
+    Play a round robin across a process pool, appending each match record
+    to the checkpoint file as it finishes. Matches already in the file are
+    not played again, so an interrupted tournament resumes where it
+    stopped when run again with the same arguments.
+
+    Parameters:
+        agents (list[str]): the agent specs, see load_agent
+        checkpoint_path (str): the JSONL file of match records
+        games_per_pairing (int): the matches for each ordered pair
+        workers (Optional[int]): the number of processes, or None for one
+            per CPU
+        seed (int): the tournament seed; the same seed gives the same games
+        max_moves (int): the number of moves after which a match is
+            recorded as unfinished
+        allow_removes (bool): False to play without the remove rule
+
+    Returns:
+        (list[dict]): the records of every match in the tournament
+    """
+    if len(set(agents)) != len(agents):
+        raise ValueError("each agent may only be entered once")
+    for agent in agents:
+        load_agent(agent)
+
+    tasks = schedule(agents, games_per_pairing, seed, max_moves,
+                     allow_removes)
+    wanted = {match_key(*task[:3]) for task in tasks}
+    records = [record for record in load_checkpoint(checkpoint_path)
+               if record["key"] in wanted]
+    # Rewrite the checkpoint without any line cut short by a crash, so
+    # new records are not appended onto it
+    temporary_path = checkpoint_path + ".tmp"
+    with open(temporary_path, "w") as checkpoint:
+        checkpoint.writelines(json.dumps(record) + "\n"
+                              for record in records)
+    os.replace(temporary_path, checkpoint_path)
+    done = {record["key"] for record in records}
+    remaining = [task for task in tasks if match_key(*task[:3]) not in done]
+
+    if remaining:
+        with Pool(workers) as pool, open(checkpoint_path, "a") as checkpoint:
+            for record in pool.imap_unordered(play_match, remaining):
+                checkpoint.write(json.dumps(record) + "\n")
+                checkpoint.flush()
+                records.append(record)
+    return records
+
+
+def format_ratings(table: list[dict]) -> str:
+    """
+    (str) Returns the rating table from rate as aligned text
+    """
+    width = max([len("agent")] + [len(row["agent"]) for row in table]) + 2
+    interval = f"{CONFIDENCE:.0%} interval"
+    lines = [f"{'agent':<{width}}{'rating':>8}{interval:>20}{'games':>8}"
+             f"{'score':>8}"]
+    for row in table:
+        bounds = f"{row['low']:.0f} to {row['high']:.0f}"
+        lines.append(f"{row['agent']:<{width}}{row['rating']:>8.0f}"
+                     f"{bounds:>20}{row['games']:>8}{row['score']:>8.1%}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """
+    Run a tournament from the command line and print the ratings
+    """
+    parser = argparse.ArgumentParser(
+        description="Rate connect-four agents with a round robin tournament")
+    parser.add_argument("agents", nargs="+",
+                        help="AGENTS names or module:factory specs")
+    parser.add_argument("--games", type=int,
+                        default=DEFAULT_GAMES_PER_PAIRING,
+                        help="matches per ordered pair of agents")
+    parser.add_argument("--checkpoint", default="tournament.jsonl")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-moves", type=int, default=DEFAULT_MAX_MOVES)
+    parser.add_argument("--no-removes", action="store_true")
+    parser.add_argument("--bootstrap", type=int, default=DEFAULT_BOOTSTRAP)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    records = run_tournament(args.agents, args.checkpoint, args.games,
+                             args.workers, args.seed, args.max_moves,
+                             not args.no_removes)
+    print(f"{len(records)} matches, {time.perf_counter() - start:.2f}s")
+    print(format_ratings(rate(records, args.agents, args.bootstrap,
+                              args.seed)))
+
+if __name__ == "__main__":
+    main()
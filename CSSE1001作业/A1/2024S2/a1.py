@@ -1,6 +1,10 @@
-from typing import Optional
+from typing import Callable, Optional
 from support import *
 
+# Invalid coordinates a computer attacker may give in a row before
+# make_attack gives up on it
+MAX_ATTACKER_RETRIES = 100
+
 
 def create_empty_board(board_size: int) -> list[str]:
     """Generates an initial empty board
@@ -300,14 +304,40 @@ def get_winner(p1_board: list[str], p2_board: list[str]) -> Optional[str]:
         return PLAYER_TWO
 
 
-def make_attack(target_board: list[str]) -> None:
+def make_attack(
+    target_board: list[str],
+    attacker: Optional[Callable[[list[str]], str]] = None,
+) -> None:
     """Performs a single turn against the target board.
 
     Parameters:
         target_board (list[str]): The target player's board
+        attacker (Optional[Callable[[list[str]], str]]): a computer player,
+            called with a copy of the target board, with active ship squares
+            shown as empty, to choose a coordinate instead of prompting with
+            input.
+
+    Raises:
+        ValueError: if the attacker gives MAX_ATTACKER_RETRIES invalid
+                    coordinates in a row
     """
+    retries = 0
     while True:
-        raw_coordinate = input(TURN_INPUT_MESSAGE)
+        if attacker is None:
+            raw_coordinate = input(TURN_INPUT_MESSAGE)
+        else:
+            if retries == MAX_ATTACKER_RETRIES:
+                raise ValueError(
+                    f'attacker gave {retries} invalid coordinates in a row'
+                )
+            retries += 1
+            # Hide the ships, as display_board does for the opponent
+            visible_board = [
+                row.replace(ACTIVE_SHIP_SQUARE, EMPTY_SQUARE)
+                for row in target_board
+            ]
+            raw_coordinate = attacker(visible_board)
+            print(TURN_INPUT_MESSAGE + raw_coordinate)
         is_valid, reason = is_valid_coordinate(
             raw_coordinate, len(target_board)
         )
@@ -320,8 +350,19 @@ def make_attack(target_board: list[str]) -> None:
         return
 
 
-def play_game():
-    """Plays through an entire game of battleships."""
+def play_game(
+    attackers: Optional[dict[str, Callable[[list[str]], str]]] = None
+):
+    """Plays through an entire game of battleships.
+
+    Parameters:
+        attackers (Optional[dict[str, Callable[[list[str]], str]]]): computer
+            players by player name, which choose that player's attacks (see
+            make_attack). Ships are still placed through input.
+    """
+    if attackers is None:
+        attackers = {}
+
     board_size = int(input('Enter board size: '))
     ship_sizes = []
     for item in input('Enter ships sizes: ').split(','):
@@ -355,7 +396,7 @@ def play_game():
 
         print(f"\n{player}'s turn!")
         # Perform turn and switch
-        make_attack(target_board)
+        make_attack(target_board, attackers.get(player))
         is_player_ones_turn = not is_player_ones_turn
 
     print(GAME_OVER_GRAPHIC)
@@ -0,0 +1,335 @@
+import argparse
+import json
+import os
+import random
+import time
+from collections import Counter
+from functools import lru_cache
+from multiprocessing import Pool
+from typing import Optional
+from support import *
+from fleet_board import HIT, SUNK, FleetBoard
+from fleet_gen import FleetGenerator
+
+DEFAULT_BOARD_SIZE = 10
+DEFAULT_SHIP_SIZES = [5, 4, 3, 3, 2]
+HISTOGRAM_BUCKET = 5
+HISTOGRAM_WIDTH = 50
+REPORTED_PERCENTILES = (10, 50, 90, 99)
+
+
+@lru_cache(maxsize=None)
+def _get_generator(
+    board_size: int, ship_sizes: tuple[int, ...]
+) -> FleetGenerator:
+    """Returns this process's fleet generator for a board size and fleet."""
+    return FleetGenerator(board_size, list(ship_sizes))
+
+
+def random_fleet(
+    board_size: int, ship_sizes: list[int], rng: random.Random
+) -> FleetBoard:
+    """Places a random fleet, uniformly over the legal placements, with
+        fleet_gen.
+
+    Parameters:
+        board_size (int): the dimension of the game board
+        ship_sizes (list[int]): the size of each ship to place
+        rng (random.Random): the source of randomness
+
+    Returns:
+        (FleetBoard): The board with every ship placed
+
+    Raises:
+        ValueError: if the fleet cannot fit on the board
+    """
+    generator = _get_generator(board_size, tuple(ship_sizes))
+    generator.seed(rng.getrandbits(32))
+    return generator.sample_board()
+
+
+class RandomStrategy:
+    """Attacks every square once, in a random order."""
+
+    def __init__(self, board_size: int, ship_sizes: list[int], seed: int):
+        self._targets = [
+            (row, col) for row in range(board_size) for col in range(board_size)
+        ]
+        random.Random(seed).shuffle(self._targets)
+
+    def choose_target(self, board: FleetBoard) -> Position:
+        """Returns the next square to attack."""
+        return self._targets.pop()
+
+    def report(self, board: FleetBoard, position: Position, outcome: str):
+        """Learns from the outcome of an attack; random play ignores it."""
+
+
+class ParityStrategy:
+    """Hunts on one colour of a checkerboard, which every ship of length 2
+        or more must cross, and targets the neighbours of each hit until the
+        ship sinks.
+    """
+
+    def __init__(self, board_size: int, ship_sizes: list[int], seed: int):
+        rng = random.Random(seed)
+        parity = rng.randrange(2)
+        self._size = board_size
+        self._hunt = [
+            (row, col)
+            for row in range(board_size)
+            for col in range(board_size)
+            if (row + col) % 2 == parity or min(ship_sizes) == 1
+        ]
+        rng.shuffle(self._hunt)
+        self._targets = []
+        self._attacked = set()
+
+    def choose_target(self, board: FleetBoard) -> Position:
+        """Returns the next square to attack."""
+        while self._targets:
+            position = self._targets.pop()
+            if position not in self._attacked:
+                return position
+        while self._hunt[-1] in self._attacked:
+            self._hunt.pop()
+        return self._hunt.pop()
+
+    def report(self, board: FleetBoard, position: Position, outcome: str):
+        """Queues the neighbours of a hit as targets."""
+        self._attacked.add(position)
+        if outcome != HIT:
+            return
+        row, col = position
+        for neighbour in (
+            (row - 1, col),
+            (row + 1, col),
+            (row, col - 1),
+            (row, col + 1),
+        ):
+            if (
+                0 <= neighbour[0] < self._size
+                and 0 <= neighbour[1] < self._size
+                and neighbour not in self._attacked
+            ):
+                self._targets.append(neighbour)
+
+
+class DensityStrategy:
+    """Fires at the square covered by the most fleet placements consistent
+        with what has been seen (see density_ai).
+    """
+
+    def __init__(self, board_size: int, ship_sizes: list[int], seed: int):
+        # Imported here so the other strategies do not need NumPy
+        from density_ai import DensityAttacker
+
+        self._attacker = DensityAttacker(ship_sizes, seed, infer_sunk=False)
+
+    def choose_target(self, board: FleetBoard) -> Position:
+        """Returns the next square to attack."""
+        return self._attacker.choose_target(board)
+
+    def report(self, board: FleetBoard, position: Position, outcome: str):
+        """Tells the attacker which ship sank, if any."""
+        if outcome == SUNK:
+            ship_id = board.get_ship_id(position)
+            self._attacker.sink(board, position, board.get_ship_size(ship_id))
+
+
+STRATEGIES = {
+    'random': RandomStrategy,
+    'parity': ParityStrategy,
+    'density': DensityStrategy,
+}
+
+
+def game_seed(seed: int, game_index: int) -> int:
+    """Returns the seed for one game, so any game of a run can be reproduced
+    on its own, whichever worker plays it."""
+    return random.Random(f'{seed}:{game_index}').getrandbits(32)
+
+
+def play_one_game(task: tuple[int, int, str, int, list[int]]) -> dict:
+    """Places a random fleet and attacks it with one strategy until it sinks.
+        Every strategy gets the same fleet for the same game index.
+
+    Parameters:
+        task (tuple[int, int, str, int, list[int]]): the game index, the run
+            seed, the STRATEGIES name, the board size and the ship sizes
+
+    Returns:
+        (dict): The game record, ready to be written as JSON
+    """
+    game_index, seed, strategy_name, board_size, ship_sizes = task
+    seed = game_seed(seed, game_index)
+    board = random_fleet(board_size, ship_sizes, random.Random(seed))
+    strategy = STRATEGIES[strategy_name](board_size, ship_sizes, seed + 1)
+
+    start = time.perf_counter()
+    shots = 0
+    while board.get_player_hp() > 0:
+        position = strategy.choose_target(board)
+        strategy.report(board, position, board.attack(position))
+        shots += 1
+
+    return {
+        'game': game_index,
+        'seed': seed,
+        'strategy': strategy_name,
+        'shots': shots,
+        'seconds': round(time.perf_counter() - start, 6),
+    }
+
+
+def _percentile(counts: Counter, point: float) -> int:
+    """Returns the nearest-rank percentile of values given by their counts."""
+    rank = max(1, -(-point * sum(counts.values()) // 100))
+    seen = 0
+    for value in sorted(counts):
+        seen += counts[value]
+        if seen >= rank:
+            return value
+    return 0
+
+
+def format_histogram(shots: Counter) -> str:
+    """Draws a text histogram of the number of shots needed to win.
+
+    Parameters:
+        shots (Counter): the number of games won in each number of shots
+
+    Returns:
+        (str): One line per bucket of HISTOGRAM_BUCKET shots
+    """
+    buckets = Counter()
+    for count, games in shots.items():
+        buckets[count // HISTOGRAM_BUCKET] += games
+    if not buckets:
+        return ''
+
+    largest = max(buckets.values())
+    lines = []
+    for bucket in range(min(buckets), max(buckets) + 1):
+        low = bucket * HISTOGRAM_BUCKET
+        bar = '#' * round(HISTOGRAM_WIDTH * buckets[bucket] / largest)
+        high = low + HISTOGRAM_BUCKET - 1
+        lines.append(f'{low:>5}-{high:<5} {buckets[bucket]:>8} {bar}')
+    return '\n'.join(lines)
+
+
+def run_simulation(
+    games: int,
+    output_path: str,
+    strategies: Optional[list[str]] = None,
+    workers: Optional[int] = None,
+    seed: int = 0,
+    board_size: int = DEFAULT_BOARD_SIZE,
+    ship_sizes: Optional[list[int]] = None,
+) -> dict:
+    """Plays games for each strategy across a process pool, writing one JSON
+        line per game as results arrive.
+
+    Parameters:
+        games (int): the number of games per strategy
+        output_path (str): the JSONL file to write game records to
+        strategies (Optional[list[str]]): the STRATEGIES names, or None for
+            all of them
+        workers (Optional[int]): the number of processes, or None for one per
+            CPU
+        seed (int): the run seed; the same seed gives the same games
+        board_size (int): the dimension of the game board
+        ship_sizes (Optional[list[int]]): the fleet, or None for the default
+
+    Returns:
+        (dict): The shots-to-win counts per strategy, games and seconds
+
+    Raises:
+        ValueError: if the fleet cannot fit on the board
+    """
+    if strategies is None:
+        strategies = list(STRATEGIES)
+    if ship_sizes is None:
+        ship_sizes = DEFAULT_SHIP_SIZES
+    # Check the fleet fits here, rather than in every worker
+    FleetGenerator(board_size, ship_sizes).sample_indices()
+    tasks = [
+        (index, seed, name, board_size, ship_sizes)
+        for index in range(games)
+        for name in strategies
+    ]
+    shots = {name: Counter() for name in strategies}
+
+    start = time.perf_counter()
+    with Pool(workers) as pool, open(output_path, 'w') as output:
+        # Large chunks keep the inter-process traffic per game small
+        processes = workers or os.cpu_count() or 1
+        chunksize = max(1, len(tasks) // (16 * processes))
+        for record in pool.imap_unordered(play_one_game, tasks, chunksize):
+            output.write(json.dumps(record) + '\n')
+            shots[record['strategy']][record['shots']] += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        'games': len(tasks),
+        'seconds': elapsed,
+        'games_per_second': len(tasks) / elapsed if elapsed else 0.0,
+        'shots': {
+            name: dict(sorted(counts.items())) for name, counts in shots.items()
+        },
+    }
+
+
+def format_summary(summary: dict) -> str:
+    """Returns a human readable report of a run_simulation summary."""
+    lines = [
+        f"{summary['games']} games in {summary['seconds']:.2f}s "
+        f"({summary['games_per_second']:.0f} games/s)"
+    ]
+    for name, counts in summary['shots'].items():
+        counts = Counter(counts)
+        games = sum(counts.values())
+        if not games:
+            continue
+        mean = sum(shots * count for shots, count in counts.items()) / games
+        points = ', '.join(
+            f'p{point} {_percentile(counts, point)}'
+            for point in REPORTED_PERCENTILES
+        )
+        lines.append(f'\n{name}: mean {mean:.2f} shots, {points}')
+        lines.append(format_histogram(counts))
+    return '\n'.join(lines)
+
+
+def main() -> None:
+    """Runs the simulation from the command line and prints the summary."""
+    parser = argparse.ArgumentParser(
+        description='Compare battleship attack strategies by simulation'
+    )
+    parser.add_argument('games', type=int, help='games per strategy')
+    parser.add_argument('--output', default='battleship_sim.jsonl')
+    parser.add_argument(
+        '--strategies', nargs='+', choices=STRATEGIES, default=None
+    )
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--board-size', type=int, default=DEFAULT_BOARD_SIZE)
+    parser.add_argument(
+        '--ship-sizes', type=int, nargs='+', default=DEFAULT_SHIP_SIZES
+    )
+    args = parser.parse_args()
+
+    summary = run_simulation(
+        args.games,
+        args.output,
+        args.strategies,
+        args.workers,
+        args.seed,
+        args.board_size,
+        args.ship_sizes,
+    )
+    print(format_summary(summary))
+
+
+if __name__ == '__main__':
+    main()
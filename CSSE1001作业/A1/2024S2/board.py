@@ -0,0 +1,145 @@
+from typing import Iterator
+from support import *
+
+# Byte values of the squares, as stored in a Board
+_EMPTY_CODE = ord(EMPTY_SQUARE)
+_MISS_CODE = ord(MISS_SQUARE)
+_ACTIVE_SHIP_CODE = ord(ACTIVE_SHIP_SQUARE)
+_DEAD_SHIP_CODE = ord(DEAD_SHIP_SQUARE)
+
+
+class Board:
+    """A square game board stored as one bytearray of square characters, row
+    by row, so squares are read and changed in place in O(1).
+
+    The board can be used where a1.py only reads a list[str] board, such as
+    display_board and get_player_hp, since it has a length and iterates
+    over its rows as strings.
+    """
+
+    def __init__(self, board_size: int) -> None:
+        """Creates an empty board.
+
+        Parameters:
+            board_size (int): the size of the game board
+        """
+        self._size = board_size
+        self._squares = bytearray(EMPTY_SQUARE.encode() * board_size**2)
+
+    @classmethod
+    def from_rows(cls, rows: list[str]) -> 'Board':
+        """Creates a board from the list[str] form used by a1.py.
+
+        Parameters:
+            rows (list[str]): one string of squares per row
+
+        Returns:
+            (Board): A board with the same squares
+        """
+        board = cls(len(rows))
+        board._squares[:] = ''.join(rows).encode()
+        return board
+
+    def to_rows(self) -> list[str]:
+        """Renders the board to the list[str] form used by a1.py.
+
+        Returns:
+            (list[str]): one string of squares per row
+        """
+        return list(self)
+
+    def copy(self) -> 'Board':
+        """Returns an independent copy of the board."""
+        board = Board(self._size)
+        board._squares[:] = self._squares
+        return board
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[str]:
+        squares = self._squares
+        size = self._size
+        for start in range(0, size * size, size):
+            yield squares[start : start + size].decode()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Board):
+            return self._squares == other._squares
+        return NotImplemented
+
+    def get_square(self, position: Position) -> str:
+        """Gets the character at the given position on the board.
+
+        Parameters:
+            position (Position): The position to inspect
+
+        Returns:
+            (str): The square at the supplied position
+        """
+        row, col = position
+        return chr(self._squares[row * self._size + col])
+
+    def change_square(self, position: Position, character: str) -> None:
+        """Replaces the character at the given position, in place.
+
+        Parameters:
+            position (Position): The position to update
+            character (str): The square to set at the supplied position
+        """
+        row, col = position
+        self._squares[row * self._size + col] = ord(character)
+
+    def can_place_ship(self, ship: list[Position]) -> bool:
+        """Checks if every square of a proposed ship is empty.
+
+        Parameters:
+            ship (list[Position]): The positions which make up the ship
+
+        Returns:
+            (bool): True iff the ship can be placed without overlapping
+                    existing non-blank squares
+        """
+        for position in ship:
+            if self.get_square(position) != EMPTY_SQUARE:
+                return False
+        return True
+
+    def place_ship(self, ship: list[Position]) -> None:
+        """Places the ship consisting of the given squares on the board.
+
+        Parameters:
+            ship (list[Position]): The squares to place on
+        """
+        for position in ship:
+            self.change_square(position, ACTIVE_SHIP_SQUARE)
+
+    def attack(self, position: Position) -> None:
+        """Fires upon the supplied square, as attack in a1.py does.
+
+        Parameters:
+            position (Position): The position to target in this attack
+        """
+        row, col = position
+        index = row * self._size + col
+        square = self._squares[index]
+        if square == _ACTIVE_SHIP_CODE:
+            self._squares[index] = _DEAD_SHIP_CODE
+        elif square == _EMPTY_CODE:
+            self._squares[index] = _MISS_CODE
+
+    def count(self, character: str) -> int:
+        """Counts the squares holding a character, without building rows.
+
+        Parameters:
+            character (str): The square to count
+
+        Returns:
+            (int): The number of matching squares
+        """
+        return self._squares.count(ord(character))
+
+    def get_player_hp(self) -> int:
+        """Returns the number of unhit ship squares left on the board."""
+        return self.count(ACTIVE_SHIP_SQUARE)
+
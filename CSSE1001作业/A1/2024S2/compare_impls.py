@@ -0,0 +1,423 @@
+import argparse
+import contextlib
+import importlib.util
+import io
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+from types import ModuleType
+from typing import Callable, Optional
+from support import *
+
+# The two implementations, by the name used in the report
+IMPLEMENTATION_FILES = {'a1': 'a1.py', 'my_a1': 'My a1.py'}
+DEFAULT_SIZES = [3, 6, 9]
+DEFAULT_COUNT = 2000
+DEFAULT_REPEAT = 3
+SQUARES = EMPTY_SQUARE + MISS_SQUARE + ACTIVE_SHIP_SQUARE + DEAD_SHIP_SQUARE
+# Characters for random coordinate strings, including near misses such as
+# lowercase letters, zero and spaces
+COORDINATE_CHARACTERS = 'ABCDEFGHIJa0123456789 '
+
+
+class MismatchError(AssertionError):
+    """Raised when the implementations give different results."""
+
+
+def load_implementations(directory: str = '') -> dict[str, ModuleType]:
+    """Imports both implementations as separate modules. 'My a1.py' has a
+        space in its name, so it cannot be imported with import.
+
+    Parameters:
+        directory (str): the folder holding the files, by default this one
+
+    Returns:
+        (dict[str, ModuleType]): The modules by implementation name
+    """
+    directory = directory or os.path.dirname(os.path.abspath(__file__))
+    modules = {}
+    for name, filename in IMPLEMENTATION_FILES.items():
+        spec = importlib.util.spec_from_file_location(
+            f'_compare_{name}', os.path.join(directory, filename)
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        modules[name] = module
+    return modules
+
+
+def _random_board(rng: random.Random, size: int) -> list[str]:
+    """Returns a board of random squares."""
+    return [''.join(rng.choices(SQUARES, k=size)) for _ in range(size)]
+
+
+def _random_position(rng: random.Random, size: int) -> Position:
+    """Returns a random position on a board."""
+    return rng.randrange(size), rng.randrange(size)
+
+
+def _random_coordinate(rng: random.Random, size: int) -> str:
+    """Returns a coordinate which is usually valid, and otherwise nearly so."""
+    if rng.random() < 0.6:
+        row, col = _random_position(rng, size)
+        return f'{chr(ord("A") + col)}{row + 1}'
+    length = rng.choice([0, 1, 2, 2, 2, 3])
+    return ''.join(rng.choices(COORDINATE_CHARACTERS, k=length))
+
+
+def _random_ship(rng: random.Random, size: int) -> list[Position]:
+    """Returns a straight ship of random length which fits on the board."""
+    length = rng.randint(1, size)
+    line = rng.randrange(size)
+    start = rng.randrange(size - length + 1)
+    if rng.random() < 0.5:
+        return [(line, start + offset) for offset in range(length)]
+    return [(start + offset, line) for offset in range(length)]
+
+
+def _random_sequence(rng: random.Random, size: int) -> str:
+    """Returns a comma separated coordinate sequence, sometimes with spaces
+    around the coordinates."""
+    coordinates = [
+        _random_coordinate(rng, size) for _ in range(rng.randint(1, 4))
+    ]
+    separator = ', ' if rng.random() < 0.1 else ','
+    return separator.join(coordinates)
+
+
+def _display(module: ModuleType, board: list[str], show_ships: bool) -> str:
+    """Returns what display_board prints."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        module.display_board(board, show_ships)
+    return output.getvalue()
+
+
+def _place(
+    module: ModuleType, board: list[str], ship: list[Position]
+) -> bool:
+    """Places a ship if it fits, returning whether it did."""
+    if module.can_place_ship(board, ship):
+        module.place_ship(board, ship)
+        return True
+    return False
+
+
+def _change(module: ModuleType, board: list[str], args: tuple) -> None:
+    """Changes a square."""
+    position, character = args
+    module.change_square(board, position, character)
+
+
+# For each operation, a function making one random argument and a function
+# applying it with an implementation to a board, returning the result.
+# Operations which change the board share one board through the stream, so
+# the board after each one is compared too.
+OPERATIONS: dict[str, tuple[Callable, Callable]] = {
+    'create_empty_board': (
+        lambda rng, size: size,
+        lambda module, board, size: module.create_empty_board(size),
+    ),
+    'get_square': (
+        _random_position,
+        lambda module, board, position: module.get_square(board, position),
+    ),
+    'change_square': (
+        lambda rng, size: (_random_position(rng, size), rng.choice(SQUARES)),
+        lambda module, board, args: _change(module, board, args),
+    ),
+    'coordinate_to_position': (
+        lambda rng, size: f'{chr(ord("A") + rng.randrange(size))}'
+        f'{rng.randrange(size) + 1}',
+        lambda module, board, coordinate: module.coordinate_to_position(
+            coordinate
+        ),
+    ),
+    'is_valid_coordinate': (
+        _random_coordinate,
+        lambda module, board, coordinate: module.is_valid_coordinate(
+            coordinate, len(board)
+        ),
+    ),
+    'is_valid_coordinate_sequence': (
+        lambda rng, size: (_random_sequence(rng, size), rng.randint(1, 4)),
+        lambda module, board, args: module.is_valid_coordinate_sequence(
+            args[0], args[1], len(board)
+        ),
+    ),
+    'build_ship': (
+        lambda rng, size: ','.join(
+            f'{chr(ord("A") + col)}{row + 1}'
+            for row, col in _random_ship(rng, size)
+        ),
+        lambda module, board, sequence: module.build_ship(sequence),
+    ),
+    'place_ship': (_random_ship, _place),
+    'attack': (
+        _random_position,
+        lambda module, board, position: module.attack(board, position),
+    ),
+    'get_player_hp': (
+        _random_board,
+        lambda module, board, other: module.get_player_hp(other),
+    ),
+    'get_winner': (
+        _random_board,
+        lambda module, board, other: module.get_winner(board, other),
+    ),
+    'display_board': (
+        lambda rng, size: rng.random() < 0.5,
+        lambda module, board, show_ships: _display(module, board, show_ships),
+    ),
+}
+
+
+def make_stream(
+    operation: str, size: int, count: int, seed: int
+) -> tuple[list[str], list]:
+    """Generates a random operation stream, the same for every implementation.
+
+    Parameters:
+        operation (str): the OPERATIONS name
+        size (int): the board size
+        count (int): the number of operations
+        seed (int): the seed for the stream
+
+    Returns:
+        (tuple[list[str], list]): The starting board and each operation's
+                                  argument
+    """
+    rng = random.Random(f'{seed}:{operation}:{size}')
+    make_argument = OPERATIONS[operation][0]
+    board = _random_board(rng, size)
+    if operation == 'place_ship':
+        board = [EMPTY_SQUARE * size] * size
+    return board, [make_argument(rng, size) for _ in range(count)]
+
+
+def run_stream(
+    module: ModuleType, operation: str, board: list[str], arguments: list
+) -> list:
+    """Applies an operation stream with one implementation.
+
+    Returns:
+        (list): For each operation, its result or the exception raised, and
+                the board after it
+    """
+    apply = OPERATIONS[operation][1]
+    board = list(board)
+    outcomes = []
+    for argument in arguments:
+        try:
+            result = apply(module, board, argument)
+        except Exception as error:
+            result = f'{type(error).__name__}: {error}'
+        outcomes.append((result, tuple(board)))
+    return outcomes
+
+
+def time_stream(
+    module: ModuleType,
+    operation: str,
+    board: list[str],
+    arguments: list,
+    repeat: int,
+) -> float:
+    """Returns the best time in seconds of several runs of a stream."""
+    apply = OPERATIONS[operation][1]
+    best = math.inf
+    for _ in range(repeat):
+        state = list(board)
+        start = time.perf_counter()
+        for argument in arguments:
+            try:
+                apply(module, state, argument)
+            except Exception:
+                pass
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _call_peaks(
+    apply: Callable, module: ModuleType, state: list[str], arguments: list
+) -> list[int]:
+    """Runs a stream while tracemalloc is tracing, returning for each call
+    the peak traced bytes above the bytes traced just before it."""
+    peaks = []
+    for argument in arguments:
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        try:
+            apply(module, state, argument)
+        except Exception:
+            pass
+        peaks.append(tracemalloc.get_traced_memory()[1] - start)
+    return peaks
+
+
+def measure_allocations(
+    module: ModuleType, operation: str, board: list[str], arguments: list
+) -> tuple[float, int]:
+    """Measures the memory each operation of a stream allocates, as the peak
+        bytes traced during the call, including temporaries freed before it
+        returns. The harness's own bytes per call, measured by running the
+        stream with a call that does nothing, are subtracted.
+
+    Returns:
+        (tuple[float, int]): The mean and the largest peak bytes per call
+    """
+    apply = OPERATIONS[operation][1]
+    tracemalloc.start()
+    try:
+        overheads = _call_peaks(
+            lambda module, state, argument: None, module, [], arguments
+        )
+        peaks = _call_peaks(apply, module, list(board), arguments)
+    finally:
+        tracemalloc.stop()
+    overhead = max(overheads, default=0)
+    peaks = [max(0, peak - overhead) for peak in peaks]
+    if not peaks:
+        return 0.0, 0
+    return sum(peaks) / len(peaks), max(peaks)
+
+
+def run_comparison(
+    sizes: list[int],
+    count: int,
+    repeat: int,
+    seed: int,
+    operations: Optional[list[str]] = None,
+    strict: bool = True,
+) -> tuple[list[dict], list[str]]:
+    """Checks the implementations agree on random streams of each operation
+        and size, and measures each one.
+
+    Parameters:
+        sizes (list[int]): the board sizes, at most 9
+        count (int): the number of operations per stream
+        repeat (int): the number of timed runs per stream
+        seed (int): the seed for the streams
+        operations (Optional[list[str]]): the OPERATIONS names, or None for
+            all
+        strict (bool): True to raise on the first disagreement
+
+    Returns:
+        (tuple[list[dict], list[str]]): One row per operation and size, and
+                                        a description of each disagreement
+
+    Raises:
+        MismatchError: if strict and the implementations disagree
+    """
+    modules = load_implementations()
+    (name_1, module_1), (name_2, module_2) = modules.items()
+    rows = []
+    mismatches = []
+    for operation in operations or OPERATIONS:
+        for size in sizes:
+            board, arguments = make_stream(operation, size, count, seed)
+            outcomes_1 = run_stream(module_1, operation, board, arguments)
+            outcomes_2 = run_stream(module_2, operation, board, arguments)
+            differences = [
+                index
+                for index, (outcome_1, outcome_2) in enumerate(
+                    zip(outcomes_1, outcomes_2)
+                )
+                if outcome_1 != outcome_2
+            ]
+            if differences:
+                index = differences[0]
+                message = (
+                    f'{operation} on size {size} with {arguments[index]!r}: '
+                    f'{name_1} gave {outcomes_1[index][0]!r}, '
+                    f'{name_2} gave {outcomes_2[index][0]!r}'
+                )
+                if strict:
+                    raise MismatchError(message)
+                mismatches.append(message)
+
+            row = {
+                'operation': operation,
+                'size': size,
+                'count': count,
+                'mismatches': len(differences),
+            }
+            for name, module in modules.items():
+                seconds = time_stream(
+                    module, operation, board, arguments, repeat
+                )
+                mean_bytes, max_bytes = measure_allocations(
+                    module, operation, board, arguments
+                )
+                row[f'{name}_us'] = 1e6 * seconds / count
+                row[f'{name}_bytes'] = mean_bytes
+                row[f'{name}_max_bytes'] = max_bytes
+            rows.append(row)
+    return rows, mismatches
+
+
+def format_table(rows: list[dict]) -> str:
+    """Formats the comparison as a table, with the faster implementation of
+        each operation and size and its speedup.
+
+    Parameters:
+        rows (list[dict]): the rows from run_comparison
+
+    Returns:
+        (str): The table
+    """
+    name_1, name_2 = IMPLEMENTATION_FILES
+    header = (
+        f'{"operation":<30}{"size":>5}{name_1 + " us":>10}{name_2 + " us":>10}'
+        f'{"faster":>8}{"x":>6}{name_1 + " B/op":>10}{name_2 + " B/op":>13}'
+        f'{name_1 + " max B":>11}{name_2 + " max B":>14}{"diff":>6}'
+    )
+    lines = [header, '-' * len(header)]
+    for row in rows:
+        time_1, time_2 = row[f'{name_1}_us'], row[f'{name_2}_us']
+        faster = name_1 if time_1 <= time_2 else name_2
+        speedup = max(time_1, time_2) / min(time_1, time_2)
+        lines.append(
+            f'{row["operation"]:<30}{row["size"]:>5}{time_1:>10.2f}'
+            f'{time_2:>10.2f}{faster:>8}{speedup:>6.2f}'
+            f'{row[name_1 + "_bytes"]:>10.0f}{row[name_2 + "_bytes"]:>13.0f}'
+            f'{row[name_1 + "_max_bytes"]:>11}{row[name_2 + "_max_bytes"]:>14}'
+            f'{row["mismatches"]:>6}'
+        )
+    return '\n'.join(lines)
+
+
+def main() -> None:
+    """Runs the comparison from the command line, printing the table and any
+    disagreements, and exiting with status 1 if there were any."""
+    parser = argparse.ArgumentParser(
+        description="Compare a1.py and 'My a1.py' on random operations"
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--count', type=int, default=DEFAULT_COUNT)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--operations', nargs='+', choices=OPERATIONS, default=None
+    )
+    parser.add_argument(
+        '--strict', action='store_true', help='stop at the first disagreement'
+    )
+    args = parser.parse_args()
+
+    rows, mismatches = run_comparison(
+        args.sizes, args.count, args.repeat, args.seed, args.operations,
+        args.strict,
+    )
+    print(format_table(rows))
+    for message in mismatches:
+        print(f'MISMATCH {message}')
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
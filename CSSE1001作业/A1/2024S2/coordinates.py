@@ -0,0 +1,179 @@
+from string import ascii_uppercase
+from typing import Iterable
+from support import *
+
+# Columns are lettered A to Z, then AA to ZZ, as in a spreadsheet
+MAX_COLUMNS = len(ascii_uppercase) + len(ascii_uppercase) ** 2
+MAX_ROWS = 9999
+# Coordinates can name 702 columns and 9999 rows, but boards are square, so
+# the largest playable board is 702x702; the extra row numbers parse and
+# format but no board reaches them
+MAX_BOARD_SIZE = min(MAX_COLUMNS, MAX_ROWS)
+# The longest coordinate, e.g. ZZ9999
+MAX_COORDINATE_LENGTH = 2 + len(str(MAX_ROWS))
+
+# Lookup tables, so parsing a coordinate is a few dictionary lookups
+COLUMN_LABELS = list(ascii_uppercase) + [
+    first + second for first in ascii_uppercase for second in ascii_uppercase
+]
+_COLUMN_INDEX = {label: col for col, label in enumerate(COLUMN_LABELS)}
+_ROW_INDEX = {str(number): number - 1 for number in range(1, MAX_ROWS + 1)}
+
+
+def _split(coordinate: str, two_letters: bool = True) -> tuple[str, str]:
+    """Splits a coordinate into its column letters and row digits.
+
+    Parameters:
+        coordinate (str): The coordinate, at most MAX_COORDINATE_LENGTH long
+        two_letters (bool): False if the board has no two-letter columns
+
+    Returns:
+        (tuple[str, str]): The one or two leading letters and the rest
+    """
+    if two_letters and coordinate[1:2].isalpha():
+        return coordinate[:2], coordinate[2:]
+    return coordinate[:1], coordinate[1:]
+
+
+def coordinate_to_position(coordinate: str) -> Position:
+    """Converts the given game coordinate (e.g. AB12) into the corresponding
+        position (e.g. (11, 27)).
+
+    Parameters:
+        coordinate (str): A valid coordinate (see is_valid_coordinate)
+
+    Returns:
+        (Position): The corresponding position
+    """
+    letters, number = _split(coordinate)
+    return _ROW_INDEX[number], _COLUMN_INDEX[letters]
+
+
+def position_to_coordinate(position: Position) -> str:
+    """Converts the given position (e.g. (11, 27)) into the corresponding
+        game coordinate (e.g. AB12).
+
+    Parameters:
+        position (Position): A position on a board of at most MAX_BOARD_SIZE
+
+    Returns:
+        (str): The corresponding coordinate
+    """
+    row, col = position
+    return f'{COLUMN_LABELS[col]}{row + 1}'
+
+
+def is_valid_coordinate(coordinate: str, board_size: int) -> Result:
+    """Determines whether a coordinate string is valid, in O(1). On boards of
+        up to 9 squares the results are the same as is_valid_coordinate in
+        a1.py.
+
+    Parameters:
+        coordinate (str): The raw coordinate string to check
+        board_size (int): The dimension of the game board, at most
+                          MAX_BOARD_SIZE
+
+    Returns:
+        (Result): A result tuple detailing validity and error message (if any)
+    """
+    two_letters = board_size > len(ascii_uppercase)
+    if not 2 <= len(coordinate) <= 1 + two_letters + len(str(board_size)):
+        return False, INVALID_COORDINATE_LENGTH
+
+    letters, number = _split(coordinate, two_letters)
+    col = _COLUMN_INDEX.get(letters)
+    if col is None or col >= board_size:
+        return False, INVALID_COORDINATE_LETTER
+
+    row = _ROW_INDEX.get(number)
+    if row is None or row >= board_size:
+        return False, INVALID_COORDINATE_NUMBER
+
+    return SUCCESS
+
+
+def is_valid_coordinate_sequence(
+    coordinate_sequence: str, ship_length: int, board_size: int
+) -> Result:
+    """Checks if the supplied raw coordinate sequence is valid, in time
+        linear in its length.
+
+    Parameters:
+        coordinate_sequence (str): A comma separated sequence of raw coordinates
+        ship_length (int): The required ship length for this sequence
+        board_size (int): the dimension of the game board
+
+    Returns:
+        (Result): A result tuple detailing validity and error message (if any)
+    """
+    # Count first, so an overlong sequence is rejected without splitting it
+    if coordinate_sequence.count(',') != ship_length - 1:
+        return False, INVALID_COORDINATE_SEQUENCE_LENGTH
+
+    for coordinate in coordinate_sequence.split(','):
+        is_valid, reason = is_valid_coordinate(coordinate, board_size)
+        if not is_valid:
+            return False, reason
+
+    return SUCCESS
+
+
+def build_ship(coordinate_sequence: str) -> list[Position]:
+    """Converts a valid coordinate sequence into a ship.
+
+    Parameters:
+        coordinate_sequence (str): A valid coordinate sequence
+
+    Returns:
+        (list[Position]) The corresponding ship
+    """
+    return [
+        coordinate_to_position(coordinate)
+        for coordinate in coordinate_sequence.split(',')
+    ]
+
+
+def format_board(board: Iterable[str], show_ships: bool) -> str:
+    """Formats a board of any size up to MAX_BOARD_SIZE for display. Boards
+        of up to 9 squares look exactly as display_board in a1.py prints
+        them. Larger boards right-align the row numbers, and put the first
+        letter of two-letter columns on an extra header line above.
+
+    Parameters:
+        board (Iterable[str]): the current board state, as rows
+        show_ships (bool): True iff active ships should be displayed
+
+    Returns:
+        (str): The lines of the display, without a trailing newline
+    """
+    rows = list(board)
+    width = len(str(len(rows)))
+    labels = COLUMN_LABELS[: len(rows)]
+    padding = ' ' * (width - 1)
+
+    lines = []
+    if labels and len(labels[-1]) > 1:
+        lines.append(
+            padding
+            + ' ' * len(HEADER_SEPARATOR)
+            + ''.join(label[0] if len(label) > 1 else ' ' for label in labels)
+        )
+    lines.append(
+        padding + HEADER_SEPARATOR + ''.join(label[-1] for label in labels)
+    )
+
+    for row_index, row in enumerate(rows):
+        if not show_ships:
+            row = row.replace(ACTIVE_SHIP_SQUARE, EMPTY_SQUARE)
+        lines.append(f'{row_index + 1:>{width}}{ROW_SEPARATOR}{row}')
+    return '\n'.join(lines)
+
+
+def display_board(board: Iterable[str], show_ships: bool) -> None:
+    """Prints a representation of a board of any size to the screen.
+
+    Parameters:
+        board (Iterable[str]): the current board state, as rows
+        show_ships (bool): True iff active ships should be displayed
+    """
+    print(format_board(board, show_ships))
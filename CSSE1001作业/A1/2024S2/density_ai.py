@@ -0,0 +1,294 @@
+import random
+from collections import Counter
+from typing import Iterable, Optional
+import numpy as np
+from support import *
+from coordinates import position_to_coordinate
+
+HUNT = 'hunt'
+TARGET = 'target'
+# Each unresolved hit a placement covers multiplies its weight by this, so
+# in target mode placements through several hits are tried first
+HIT_WEIGHT = 20
+
+_EMPTY_CODE = ord(EMPTY_SQUARE)
+_MISS_CODE = ord(MISS_SQUARE)
+_ACTIVE_SHIP_CODE = ord(ACTIVE_SHIP_SQUARE)
+_DEAD_SHIP_CODE = ord(DEAD_SHIP_SQUARE)
+
+
+def board_to_array(board: Iterable[str]) -> np.ndarray:
+    """Converts a board, as list[str] rows or a Board, into a square array of
+        the byte values of its squares.
+
+    Parameters:
+        board (Iterable[str]): The board's rows
+
+    Returns:
+        (np.ndarray): A uint8 array indexed by [row, col]
+    """
+    rows = list(board)
+    squares = np.frombuffer(''.join(rows).encode(), dtype=np.uint8)
+    return squares.reshape(len(rows), len(rows))
+
+
+def _placement_density(
+    blocked: np.ndarray, hits: np.ndarray, length: int, target: bool
+) -> np.ndarray:
+    """Counts, for every square, the weighted horizontal placements of one
+        ship length which cover it. Call on the transposed arrays for the
+        vertical placements.
+
+    Parameters:
+        blocked (np.ndarray): int array of squares no ship can be on
+        hits (np.ndarray): int array of hits not yet known to be sunk
+        length (int): The ship length
+        target (bool): True to only count placements covering a hit
+
+    Returns:
+        (np.ndarray): The float density array, the same shape as blocked
+    """
+    rows, cols = blocked.shape
+    if length > cols:
+        return np.zeros(blocked.shape)
+
+    # Window sums from prefix sums along each row: one entry per start column
+    zeros = np.zeros((rows, 1), dtype=np.int64)
+    blocked_sums = np.concatenate((zeros, blocked.cumsum(axis=1)), axis=1)
+    hit_sums = np.concatenate((zeros, hits.cumsum(axis=1)), axis=1)
+    blocked_in = blocked_sums[:, length:] - blocked_sums[:, :-length]
+    hits_in = hit_sums[:, length:] - hit_sums[:, :-length]
+
+    weights = (blocked_in == 0) * np.power(float(HIT_WEIGHT), hits_in)
+    if target:
+        weights = weights * (hits_in > 0)
+
+    # Spread each placement's weight over its squares with a difference
+    # array: add at the start column and take away after the end
+    spread = np.zeros((rows, cols + 1))
+    spread[:, : cols - length + 1] += weights
+    spread[:, length:] -= weights
+    return spread[:, :cols].cumsum(axis=1)
+
+
+def get_density(
+    board: Iterable[str],
+    ship_sizes: list[int],
+    sunk: Optional[np.ndarray] = None,
+) -> tuple[np.ndarray, str]:
+    """Counts, for every square, how many placements of the remaining ships
+        agree with the hits and misses on the board, as seen by the attacker.
+
+    In hunt mode, when every hit belongs to a sunk ship, each placement
+    avoiding the misses and sunk squares counts once. In target mode only
+    placements covering an unresolved hit count, weighted by HIT_WEIGHT for
+    each hit they cover. Squares already attacked always get 0.
+
+    Parameters:
+        board (Iterable[str]): The target board; active ship squares are
+                               treated as unknown
+        ship_sizes (list[int]): The sizes of the ships not yet sunk
+        sunk (Optional[np.ndarray]): bool array of hits known to be on sunk
+                                     ships
+
+    Returns:
+        (tuple[np.ndarray, str]): The density array and the mode, HUNT or
+                                  TARGET
+    """
+    squares = board_to_array(board)
+    if sunk is None:
+        sunk = np.zeros(squares.shape, dtype=bool)
+    hits = (squares == _DEAD_SHIP_CODE) & ~sunk
+    blocked = (squares == _MISS_CODE) | sunk
+    target = bool(hits.any())
+
+    hits = hits.astype(np.int64)
+    blocked = blocked.astype(np.int64)
+    density = np.zeros(squares.shape)
+    for length, count in Counter(ship_sizes).items():
+        horizontal = _placement_density(blocked, hits, length, target)
+        vertical = _placement_density(blocked.T, hits.T, length, target).T
+        density += count * (horizontal + vertical)
+
+    attacked = (squares == _DEAD_SHIP_CODE) | (squares == _MISS_CODE)
+    density[attacked] = 0
+    return density, TARGET if target else HUNT
+
+
+class DensityAttacker:
+    """A computer attacker which fires at the square most likely to hold a
+        ship, given the hits and misses so far and the ships left afloat.
+
+    It can be passed as an attacker to make_attack and play_game in a1.py,
+    which only show it the board. Boards there do not say when a ship sinks,
+    so by default it infers a sunk ship from a straight line of hits of a
+    remaining ship size which has no open square at either end. When the
+    game does report sunk ships, such as FleetBoard.attack, turn inference
+    off and call sink instead, as hits closed in that way may then belong to
+    several ships.
+    """
+
+    def __init__(
+        self,
+        ship_sizes: list[int],
+        seed: Optional[int] = None,
+        infer_sunk: bool = True,
+    ) -> None:
+        """Creates an attacker for a fleet.
+
+        Parameters:
+            ship_sizes (list[int]): the size of each ship in the target fleet
+            seed (Optional[int]): the seed for breaking ties between squares
+            infer_sunk (bool): True to infer sunk ships from the board
+        """
+        self._ship_sizes = list(ship_sizes)
+        self._rng = random.Random(seed)
+        self._infer_sunk = infer_sunk
+        self._sunk = None
+        self._mode = HUNT
+
+    def __call__(self, board: list[str]) -> str:
+        """Chooses the coordinate to attack, for make_attack in a1.py.
+
+        Parameters:
+            board (list[str]): The target board, with active ship squares
+                               hidden
+
+        Returns:
+            (str): The coordinate of the chosen square
+        """
+        return position_to_coordinate(self.choose_target(board))
+
+    def get_mode(self) -> str:
+        """Returns the mode used for the last target, HUNT or TARGET."""
+        return self._mode
+
+    def get_ship_sizes(self) -> list[int]:
+        """Returns the sizes of the ships not yet reported sunk."""
+        return list(self._ship_sizes)
+
+    def choose_target(self, board: Iterable[str]) -> Position:
+        """Chooses the square to attack next.
+
+        Parameters:
+            board (Iterable[str]): The target board, as list[str] rows or a
+                                   Board; active ship squares are ignored
+
+        Returns:
+            (Position): The unattacked square with the highest density, ties
+                        broken at random
+        """
+        squares = board_to_array(board)
+        if self._sunk is None:
+            self._sunk = np.zeros(squares.shape, dtype=bool)
+        if self._infer_sunk:
+            self._infer(squares)
+
+        density, self._mode = get_density(board, self._ship_sizes, self._sunk)
+        if self._mode == TARGET and not density.any():
+            # No ship left fits through the hits, so they must all be on
+            # sunk ships which could not be inferred; hunt among the rest
+            resolved = squares == _DEAD_SHIP_CODE
+            density, self._mode = get_density(board, self._ship_sizes, resolved)
+        if not density.any():
+            # No placement fits, e.g. the fleet was described wrongly, so
+            # fall back to any square which has not been attacked
+            density = (squares == _EMPTY_CODE) | (squares == _ACTIVE_SHIP_CODE)
+        best = np.flatnonzero(density == density.max())
+        index = int(best[self._rng.randrange(len(best))])
+        return divmod(index, density.shape[1])
+
+    def _infer(self, squares: np.ndarray) -> None:
+        """Marks as sunk each group of adjacent unresolved hits which must be
+            a whole ship: a straight line of a remaining ship size with a
+            miss, a sunk square or the edge of the board at each end.
+
+        Parameters:
+            squares (np.ndarray): The target board, from board_to_array
+        """
+        size = len(squares)
+        hits = (squares == _DEAD_SHIP_CODE) & ~self._sunk
+        is_open = (squares == _EMPTY_CODE) | (squares == _ACTIVE_SHIP_CODE)
+        seen = set()
+        for row, col in zip(*np.nonzero(hits)):
+            if (row, col) in seen:
+                continue
+            group = [(row, col)]
+            seen.add((row, col))
+            for row, col in group:
+                for neighbour in (
+                    (row - 1, col),
+                    (row + 1, col),
+                    (row, col - 1),
+                    (row, col + 1),
+                ):
+                    if (
+                        0 <= neighbour[0] < size
+                        and 0 <= neighbour[1] < size
+                        and hits[neighbour]
+                        and neighbour not in seen
+                    ):
+                        seen.add(neighbour)
+                        group.append(neighbour)
+
+            (top, left), (bottom, right) = min(group), max(group)
+            if top != bottom and left != right:
+                continue
+            if len(group) not in self._ship_sizes:
+                continue
+            # A single hit needs all four sides closed
+            ends = []
+            if top == bottom:
+                ends += [(top, left - 1), (top, right + 1)]
+            if left == right:
+                ends += [(top - 1, left), (bottom + 1, left)]
+            if any(
+                0 <= end_row < size
+                and 0 <= end_col < size
+                and is_open[end_row, end_col]
+                for end_row, end_col in ends
+            ):
+                continue
+
+            self._ship_sizes.remove(len(group))
+            self._sunk[top : bottom + 1, left : right + 1] = True
+
+    def sink(self, board: Iterable[str], position: Position, size: int) -> None:
+        """Records that the attack on a position sank a ship of a size. The
+            ship's squares are found as the line of hits through the position,
+            if only one line of that length fits.
+
+        Parameters:
+            board (Iterable[str]): The target board after the attack
+            position (Position): The attacked square
+            size (int): The size of the sunk ship
+        """
+        if size in self._ship_sizes:
+            self._ship_sizes.remove(size)
+
+        squares = board_to_array(board)
+        if self._sunk is None:
+            self._sunk = np.zeros(squares.shape, dtype=bool)
+        hits = (squares == _DEAD_SHIP_CODE) & ~self._sunk
+
+        row, col = position
+        candidates = []
+        for delta_row, delta_col in ((0, 1), (1, 0)):
+            for offset in range(size):
+                start_row = row - offset * delta_row
+                start_col = col - offset * delta_col
+                end_row = start_row + (size - 1) * delta_row
+                end_col = start_col + (size - 1) * delta_col
+                if min(start_row, start_col) < 0 or max(
+                    end_row, end_col
+                ) >= len(squares):
+                    continue
+                line = hits[
+                    start_row : end_row + 1, start_col : end_col + 1
+                ]
+                if line.all():
+                    candidates.append((start_row, start_col, end_row, end_col))
+
+        if len(candidates) == 1:
+            start_row, start_col, end_row, end_col = candidates[0]
+            self._sunk[start_row : end_row + 1, start_col : end_col + 1] = True
@@ -0,0 +1,187 @@
+from array import array
+from typing import Optional
+from support import *
+from board import Board
+
+# Outcomes reported by FleetBoard.attack
+MISS = 'miss'
+HIT = 'hit'
+SUNK = 'sunk'
+# The square had already been attacked, so nothing changed
+REPEAT = 'repeat'
+
+# Ship id of squares which belong to no placed ship. Active ship squares
+# with this id came from from_rows or change_square, and are counted in the
+# total hp but not as any ship.
+NO_SHIP = 0
+
+
+class FleetBoard(Board):
+    """A Board which knows which ship each square belongs to.
+
+    Each ship gets an id when it is placed. The remaining hp of every ship
+    and of the whole board is kept up to date as squares change, so attack
+    can report a hit, miss or sunk ship, and get_player_hp, in O(1).
+    """
+
+    def __init__(self, board_size: int) -> None:
+        """Creates an empty board with no ships.
+
+        Parameters:
+            board_size (int): the size of the game board
+        """
+        super().__init__(board_size)
+        self._ship_ids = array('I', bytes(4 * board_size**2))
+        # Hit points by ship id, with NO_SHIP's unassigned squares first
+        self._ship_hp = [0]
+        self._ship_sizes = [0]
+        self._hp = 0
+        self._sunk = 0
+
+    @classmethod
+    def from_rows(cls, rows: list[str]) -> 'FleetBoard':
+        """Creates a board from the list[str] form used by a1.py. The rows
+        do not say which squares form each ship, so active ship squares are
+        counted in the hp but belong to no ship.
+
+        Parameters:
+            rows (list[str]): one string of squares per row
+
+        Returns:
+            (FleetBoard): A board with the same squares
+        """
+        board = cls(len(rows))
+        board._squares[:] = ''.join(rows).encode()
+        board._hp = board._ship_hp[NO_SHIP] = board.count(ACTIVE_SHIP_SQUARE)
+        return board
+
+    def copy(self) -> 'FleetBoard':
+        """Returns an independent copy of the board and its ships."""
+        board = FleetBoard(len(self))
+        board._squares[:] = self._squares
+        board._ship_ids = array('I', self._ship_ids)
+        board._ship_hp = list(self._ship_hp)
+        board._ship_sizes = list(self._ship_sizes)
+        board._hp = self._hp
+        board._sunk = self._sunk
+        return board
+
+    def change_square(self, position: Position, character: str) -> None:
+        """Replaces the character at the given position, in place, keeping
+        the hp counts right if an active ship square is added or removed.
+
+        Parameters:
+            position (Position): The position to update
+            character (str): The square to set at the supplied position
+        """
+        old = self.get_square(position)
+        super().change_square(position, character)
+        if (old == ACTIVE_SHIP_SQUARE) == (character == ACTIVE_SHIP_SQUARE):
+            return
+
+        row, col = position
+        index = row * len(self) + col
+        ship_id = self._ship_ids[index]
+        if character == ACTIVE_SHIP_SQUARE:
+            if ship_id != NO_SHIP and self._ship_hp[ship_id] == 0:
+                self._sunk -= 1
+            self._ship_hp[ship_id] += 1
+            self._hp += 1
+        else:
+            self._lose_hp(ship_id)
+
+    def place_ship(self, ship: list[Position]) -> int:
+        """Places the ship consisting of the given squares on the board,
+        giving it the next ship id.
+
+        Parameters:
+            ship (list[Position]): The squares to place on, which must all
+                                   be empty (see can_place_ship)
+
+        Returns:
+            (int): The new ship's id, counting from 1
+        """
+        ship_id = len(self._ship_hp)
+        self._ship_hp.append(len(ship))
+        self._ship_sizes.append(len(ship))
+        self._hp += len(ship)
+        size = len(self)
+        for row, col in ship:
+            self._ship_ids[row * size + col] = ship_id
+            super().change_square((row, col), ACTIVE_SHIP_SQUARE)
+        return ship_id
+
+    def attack(self, position: Position) -> str:
+        """Fires upon the supplied square, as attack in a1.py does.
+
+        Parameters:
+            position (Position): The position to target in this attack
+
+        Returns:
+            (str): SUNK if this hit sank a ship, otherwise HIT, MISS, or
+                   REPEAT if the square had already been attacked
+        """
+        square = self.get_square(position)
+        if square == EMPTY_SQUARE:
+            super().change_square(position, MISS_SQUARE)
+            return MISS
+        if square != ACTIVE_SHIP_SQUARE:
+            return REPEAT
+
+        row, col = position
+        ship_id = self._ship_ids[row * len(self) + col]
+        super().change_square(position, DEAD_SHIP_SQUARE)
+        self._lose_hp(ship_id)
+        if ship_id != NO_SHIP and self._ship_hp[ship_id] == 0:
+            return SUNK
+        return HIT
+
+    def _lose_hp(self, ship_id: int) -> None:
+        """Takes one hit point from a ship and the board's total."""
+        self._ship_hp[ship_id] -= 1
+        self._hp -= 1
+        if ship_id != NO_SHIP and self._ship_hp[ship_id] == 0:
+            self._sunk += 1
+
+    def get_player_hp(self) -> int:
+        """Returns the number of unhit ship squares left on the board."""
+        return self._hp
+
+    def get_ship_id(self, position: Position) -> int:
+        """Returns the id of the ship at a position, or NO_SHIP."""
+        row, col = position
+        return self._ship_ids[row * len(self) + col]
+
+    def get_ship_hp(self, ship_id: int) -> int:
+        """Returns the number of unhit squares left on a ship."""
+        return self._ship_hp[ship_id]
+
+    def get_ship_size(self, ship_id: int) -> int:
+        """Returns the number of squares a ship was placed on."""
+        return self._ship_sizes[ship_id]
+
+    def get_ship_count(self) -> int:
+        """Returns the number of ships placed on the board."""
+        return len(self._ship_hp) - 1
+
+    def get_sunk_count(self) -> int:
+        """Returns the number of placed ships with no hp left."""
+        return self._sunk
+
+
+def get_winner(p1_board: FleetBoard, p2_board: FleetBoard) -> Optional[str]:
+    """Determines who (if anyone) has won the game, as get_winner in a1.py
+        does, but in O(1).
+
+    Parameters:
+        p1_board (FleetBoard): Player 1's board
+        p2_board (FleetBoard): Player 2's board
+
+    Returns:
+        The name of the player who has won (if any), otherwise None.
+    """
+    if p2_board.get_player_hp() == 0:
+        return PLAYER_ONE
+
+    if p1_board.get_player_hp() == 0:
+        return PLAYER_TWO
@@ -0,0 +1,725 @@
+import argparse
+import math
+import random
+import struct
+import sys
+import time
+import warnings
+from array import array
+from functools import lru_cache
+from typing import Iterator, Optional
+import numpy as np
+from support import *
+from fleet_board import FleetBoard
+
+# File layout:
+#   header: MAGIC, board size, ship count, index typecode, then the ship
+#           sizes as unsigned shorts
+#   body:   one record per fleet, holding each ship's index into the
+#           candidate segments of its length (see get_segments)
+MAGIC = b'BSFLT1'
+HEADER = struct.Struct('<6sHHc')
+# Fleets generated between writes in bulk mode
+WRITE_BATCH = 10_000
+# Whole fleets drawn before a generator switches to counting completions
+REJECTION_ATTEMPTS = 100
+# The most counts of completions a generator holds as 64-bit integers.
+# Counts too large for those are held as Python ints, which take about
+# five times the space, so a fifth as many are held.
+COUNT_STATE_LIMIT = 32_000_000
+# Draws from the counted completions allowed for one fleet before a
+# generator stops sampling uniformly
+COUNTED_ATTEMPTS = 10_000
+# Ships tried by the fallback search before it gives up
+SEARCH_STEP_LIMIT = 200_000
+
+
+@lru_cache(maxsize=None)
+def get_segments(
+    board_size: int, length: int
+) -> tuple[tuple[int, tuple[Position, ...]], ...]:
+    """Lists every straight placement of a ship of one length, horizontal
+        ones first. The table is cached, so it is only built once per board
+        size and length.
+
+    Parameters:
+        board_size (int): the dimension of the game board
+        length (int): the ship length
+
+    Returns:
+        (tuple[tuple[int, tuple[Position, ...]], ...]): For each placement,
+            its occupancy bitmap, with bit row * board_size + col set for
+            each square, and its positions
+    """
+    segments = []
+    # A ship of length 1 is the same either way round, so list it once
+    for horizontal in (True, False)[: 1 if length == 1 else 2]:
+        for line in range(board_size):
+            for start in range(board_size - length + 1):
+                if horizontal:
+                    ship = tuple((line, start + i) for i in range(length))
+                else:
+                    ship = tuple((start + i, line) for i in range(length))
+                mask = 0
+                for row, col in ship:
+                    mask |= 1 << (row * board_size + col)
+                segments.append((mask, ship))
+    return tuple(segments)
+
+
+@lru_cache(maxsize=None)
+def _segment_indices(board_size: int, length: int) -> dict[int, int]:
+    """Maps each segment's occupancy bitmap to its index in get_segments."""
+    return {
+        mask: index
+        for index, (mask, _) in enumerate(get_segments(board_size, length))
+    }
+
+
+def _index_typecode(board_size: int, ship_sizes: list[int]) -> str:
+    """Returns the smallest array typecode holding every segment index."""
+    largest = max(
+        (len(get_segments(board_size, size)) for size in ship_sizes), default=0
+    )
+    return 'H' if largest <= 0xFFFF else 'I'
+
+
+def _count_capacity(columns: int, dtype: type) -> int:
+    """Returns the most rows a count table with some columns may have."""
+    if dtype is object:
+        return COUNT_STATE_LIMIT // columns // 5
+    return COUNT_STATE_LIMIT // columns
+
+
+class _CountLimitReached(Exception):
+    """Raised when counting completions would hold too many counts."""
+
+
+class _CompletionCounter:
+    """Counts the ways to finish placing a fleet, with ships of the same size
+        interchangeable, by deciding the squares in row-major order. Every
+        square before the first undecided one is decided, so that square is
+        either left empty or is the left or top end of a ship.
+
+        A position is that square, the squares taken from it onwards, and the
+        number of ships of each size left. The positions sharing a square and
+        taken squares make one row of a count table, with a column for each
+        combination of ships left, so all the rows of a square are counted
+        at once with a few array operations per choice.
+
+        To keep the table small, only the squares taken within a window of
+        some rows from the undecided square are remembered. Squares beyond
+        it are counted as free even when a ship covers them, so the counts
+        also include some completions whose ships overlap. Those are
+        sampled as often as any other and then refused, which leaves the
+        completions returned uniform. A window one row shorter than the
+        longest ship forgets nothing.
+    """
+
+    def __init__(
+        self,
+        board_size: int,
+        ship_sizes: list[int],
+        window: int,
+        dtype: type = object,
+    ) -> None:
+        """Counts every completion of an empty board.
+
+        Parameters:
+            board_size (int): the dimension of the game board
+            ship_sizes (list[int]): the size of each ship
+            window (int): the number of rows of taken squares remembered
+            dtype (type): the type of the counts, np.uint64 if the total
+                with a window of no rows fits in it, otherwise object for
+                Python ints
+
+        Raises:
+            _CountLimitReached: if the table would need more rows than
+                capacity
+        """
+        self._size = board_size
+        self._squares = board_size**2
+        self._window = (1 << (window * board_size)) - 1
+        self._lengths = sorted(set(ship_sizes), reverse=True)
+        # The choices at each square: leaving it empty, marked as taking it
+        # alone, then placing each ship which fits with its left or top end
+        # there, as the index of its length and its bitmap relative to the
+        # square
+        self._choices = []
+        for square in range(self._squares):
+            row, col = divmod(square, board_size)
+            choices = [(None, 1)]
+            for i, length in enumerate(self._lengths):
+                if col + length <= board_size:
+                    choices.append((i, (1 << length) - 1))
+                if length > 1 and row + length <= board_size:
+                    vertical = sum(1 << (k * board_size) for k in range(length))
+                    choices.append((i, vertical))
+            self._choices.append(choices)
+        # Column c leaves self._left[i, c] ships of the ith length. Column 0
+        # leaves none and the last the whole fleet, and placing a ship of
+        # the ith length moves self._strides[i] columns towards column 0
+        limits = [ship_sizes.count(length) + 1 for length in self._lengths]
+        self._left = np.indices(limits).reshape(len(limits), -1)
+        self._strides = [math.prod(limits[i + 1 :]) for i in range(len(limits))]
+        self._area = np.array(self._lengths) @ self._left
+        self._start = len(self._area) - 1
+        self._dtype = dtype
+        self.capacity = _count_capacity(len(self._area), dtype)
+
+        self._rows = {}
+        self._keys = []
+        self._table = self._count(self._explore())
+        self.total = self._table.item(self._rows[0, 0], self._start)
+
+    @property
+    def columns(self) -> int:
+        """(int) The number of columns of the table."""
+        return len(self._area)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _add_row(self, key: tuple[int, int]) -> int:
+        """Adds a table row for a square and the squares taken from it,
+        returning its index."""
+        if len(self._keys) >= self.capacity:
+            raise _CountLimitReached()
+        row = self._rows[key] = len(self._keys)
+        self._keys.append(key)
+        return row
+
+    def _skip(self, square: int, taken: int) -> tuple[int, int]:
+        """Moves past the taken squares to the first undecided one, keeping
+        the taken squares within the window."""
+        # taken ^ (taken + 1) has a bit for each taken square before the
+        # first undecided one, and one more
+        skipped = (taken ^ (taken + 1)).bit_length() - 1
+        return square + skipped, (taken >> skipped) & self._window
+
+    def _shift(
+        self,
+        i: Optional[int],
+        columns: np.ndarray,
+        free: np.ndarray,
+        forward: bool,
+    ) -> np.ndarray:
+        """Moves rows of a table across a choice, between the columns of the
+        ships left before it and those left after it.
+
+        Parameters:
+            i (Optional[int]): the index of the length of the ship placed,
+                or None to leave the square empty
+            columns (np.ndarray): the rows, a column per ships left
+            free (np.ndarray): the squares free in each row making the choice
+            forward (bool): True to move the rows making the choice to the
+                columns after it, False to move the rows it reaches back
+
+        Returns:
+            (np.ndarray): The moved rows, zero where the choice is not
+                allowed
+        """
+        moved = np.zeros_like(columns)
+        if i is None:
+            # Leaving a square empty needs a free square to spare, and
+            # there is nothing left to choose once every ship is placed
+            spare = self._area[1:] < free[:, None]
+            moved[:, 1:] = columns[:, 1:] * spare
+        else:
+            before = np.flatnonzero(self._left[i])
+            after = before - self._strides[i]
+            if forward:
+                moved[:, after] = columns[:, before]
+            else:
+                moved[:, before] = columns[:, after]
+        return moved
+
+    def _explore(self) -> list[list[tuple]]:
+        """Finds the rows a fleet can reach and their choices, square by
+        square, dropping the combinations of ships left which do not fit.
+
+        Returns:
+            (list[list[tuple]]): For each square, each of its choices made
+                by some row: the index of the length of the ship placed (None
+                to leave the square empty), then the rows making it, the
+                rows they reach and the squares free in each
+        """
+        squares = self._squares
+        choices = [[] for _ in range(squares)]
+        # The rows reached at each square, each with its reached columns
+        reached = [[] for _ in range(squares + 1)]
+        start = np.zeros((1, len(self._area)), dtype=bool)
+        start[0, self._start] = True
+        reached[0].append((np.array([self._add_row((0, 0))]), start))
+
+        for square in range(squares):
+            if not reached[square]:
+                continue
+            rows = np.concatenate([rows for rows, _ in reached[square]])
+            columns = np.concatenate([cols for _, cols in reached[square]])
+            reached[square] = None
+            # Merge the columns of rows reached more than once
+            order = np.argsort(rows, kind='stable')
+            rows, columns = rows[order], columns[order]
+            firsts = np.flatnonzero(np.diff(rows, prepend=-1))
+            rows = rows[firsts]
+            columns = np.logical_or.reduceat(columns, firsts)
+
+            takens = [self._keys[row][1] for row in rows]
+            free = squares - square - np.array([t.bit_count() for t in takens])
+            # Ships left which no longer fit have no completions, and no
+            # ships left has one
+            columns &= self._area <= free[:, None]
+            columns[:, 0] = False
+
+            # The rows making each choice, the rows they reach and the
+            # squares those are at
+            made = [([], [], []) for _ in self._choices[square]]
+            for k in np.flatnonzero(columns.any(axis=1)).tolist():
+                taken = takens[k]
+                for (_, mask), (parents, children, at) in zip(
+                    self._choices[square], made
+                ):
+                    if not mask & taken:
+                        key = self._skip(square, taken | mask)
+                        row = self._rows.get(key)
+                        if row is None:
+                            row = self._add_row(key)
+                        parents.append(k)
+                        children.append(row)
+                        at.append(key[0])
+
+            for (i, _), (parents, children, at) in zip(
+                self._choices[square], made
+            ):
+                parents = np.array(parents, dtype=np.int64)
+                after = self._shift(i, columns[parents], free[parents], True)
+                kept = after.any(axis=1)
+                parents = parents[kept]
+                children = np.array(children, dtype=np.int64)[kept]
+                child_squares = np.array(at, dtype=np.int64)[kept]
+                after = after[kept]
+                choices[square].append(
+                    (i, rows[parents], children, free[parents])
+                )
+                for child_square in np.unique(child_squares):
+                    if child_square < squares:
+                        at = child_squares == child_square
+                        reached[child_square].append(
+                            (children[at], after[at])
+                        )
+        return choices
+
+    def _count(self, choices: list[list[tuple]]) -> np.ndarray:
+        """Fills in the count table from the last square back.
+
+        Returns:
+            (np.ndarray): The number of completions of each row, in each
+                column of ships left
+        """
+        table = np.zeros((len(self._keys), len(self._area)), self._dtype)
+        table[:, 0] = 1
+        for square in reversed(range(self._squares)):
+            for i, parents, children, free in choices[square]:
+                table[parents] += self._shift(i, table[children], free, False)
+        return table
+
+    def sample(self, rng: random.Random) -> Optional[list[int]]:
+        """Samples a completion of an empty board, uniformly among those
+        counted.
+
+        Returns:
+            (Optional[list[int]]): The occupancy bitmap of each ship, or None
+                if the completion's ships overlap
+        """
+        (square, taken), column = (0, 0), self._start
+        ships = []
+        occupancy = 0
+        while column:
+            row = self._rows[square, taken]
+            pick = rng.randrange(self._table.item(row, column))
+            free = self._squares - square - taken.bit_count()
+            for i, mask in self._choices[square]:
+                if mask & taken:
+                    continue
+                child = self._skip(square, taken | mask)
+                if i is None:
+                    if self._area[column] >= free:
+                        continue
+                    after = column
+                elif self._left[i, column]:
+                    after = column - self._strides[i]
+                else:
+                    continue
+                if child in self._rows:
+                    pick -= self._table.item(self._rows[child], after)
+                    if pick < 0:
+                        break
+            if i is not None:
+                ship = mask << square
+                if ship & occupancy:
+                    return None
+                occupancy |= ship
+                ships.append(ship)
+            (square, taken), column = child, after
+        return ships
+
+
+def _count_completions(
+    board_size: int, ship_sizes: list[int]
+) -> Optional[_CompletionCounter]:
+    """Counts the completions of an empty board with the widest window
+        expected to fit, widening it a row at a time. The rows a window needs
+        are estimated before it is counted: a window of one row has at most
+        2 ** (board_size - 1) rows at each square, and widening it further
+        has been found to multiply the rows by about the power 0.7 of the
+        factor the previous widening did.
+
+    Parameters:
+        board_size (int): the dimension of the game board
+        ship_sizes (list[int]): the size of each ship
+
+    Returns:
+        (Optional[_CompletionCounter]): The counter, or None if even a window
+            of no rows needs too many
+    """
+    try:
+        counter = _CompletionCounter(board_size, ship_sizes, 0)
+    except _CountLimitReached:
+        return None
+    # Each completion of a position reached extends the moves reaching it
+    # to a different completion of the empty board, and a wider window
+    # counts fewer, so every count used fits in 64 bits if this total does
+    dtype = np.uint64 if counter.total < 2**64 else object
+    expected = (board_size**2 + 1) * 2 ** (board_size - 1)
+    for window in range(1, max(ship_sizes)):
+        if expected > _count_capacity(counter.columns, dtype):
+            break
+        try:
+            wider = _CompletionCounter(board_size, ship_sizes, window, dtype)
+        except _CountLimitReached:
+            break
+        expected = len(wider) * (len(wider) / len(counter)) ** 0.7
+        counter = wider
+    return counter
+
+
+class FleetGenerator:
+    """Samples random legal fleets, uniformly over every way of placing the
+        ships in order without overlaps.
+
+        A whole fleet is drawn with each ship among all the segments of its
+        length, and redrawn if any ships overlap, up to REJECTION_ATTEMPTS
+        times. Where that fails, as on crowded boards, ships are chosen in
+        proportion to the number of ways of completing the fleet, counted
+        once per generator. Whether a board is crowded is decided once, by
+        redrawing with a fixed seed, so redrawing stops for good on crowded
+        boards and the fleet for each seed does not depend on the fleets
+        sampled before. If the counts cannot be held, or give no fleet within
+        COUNTED_ATTEMPTS draws, the generator warns and falls back to a
+        bounded depth-first search, whose fleets are not uniformly
+        distributed.
+    """
+
+    def __init__(
+        self, board_size: int, ship_sizes: list[int], seed: Optional[int] = None
+    ) -> None:
+        """Creates a generator for one board size and fleet.
+
+        Parameters:
+            board_size (int): the dimension of the game board
+            ship_sizes (list[int]): the size of each ship, placed in order
+            seed (Optional[int]): the seed for the random choices
+
+        Raises:
+            ValueError: if a ship is longer than the board, or the ships
+                        cover more squares than the board has
+        """
+        for size in ship_sizes:
+            if not 1 <= size <= board_size:
+                raise ValueError(f'a ship of size {size} does not fit')
+        if sum(ship_sizes) > board_size**2:
+            raise ValueError('the fleet does not fit on the board')
+
+        self._board_size = board_size
+        self._ship_sizes = list(ship_sizes)
+        self._segments = [get_segments(board_size, size) for size in ship_sizes]
+        self._masks = [
+            [mask for mask, _ in segments] for segments in self._segments
+        ]
+        # The squares the ships from each one onwards cover
+        self._areas = [sum(ship_sizes[i:]) for i in range(len(ship_sizes))]
+        self._rng = random.Random(seed)
+        self._redrawing = None
+        self._counted = False
+        self._counter = None
+
+    def seed(self, seed: Optional[int]) -> None:
+        """Reseeds the random choices, so one generator can give each of many
+            games its own reproducible fleet without counting again.
+
+        Parameters:
+            seed (Optional[int]): the new seed
+        """
+        self._rng.seed(seed)
+
+    def sample_indices(self) -> list[int]:
+        """Samples a fleet as segment indices.
+
+        Returns:
+            (list[int]): For each ship, its index into get_segments for its
+                         length
+
+        Raises:
+            ValueError: if the fleet cannot fit on the board, or, once
+                        sampling is no longer uniform, no fleet was found
+                        within SEARCH_STEP_LIMIT steps
+        """
+        if self._redrawing is None:
+            self._redrawing = self._redraw(random.Random(0)) is not None
+        if self._redrawing:
+            indices = self._redraw(self._rng)
+            if indices is not None:
+                return indices
+        if not self._counted:
+            # Count once, the first time redrawing fails or is skipped
+            self._counted = True
+            self._counter = _count_completions(
+                self._board_size, self._ship_sizes
+            )
+            if self._counter is None:
+                self._warn('its completions are too many to count')
+            elif not self._counter.total:
+                raise ValueError('the fleet does not fit on the board')
+
+        if self._counter is not None:
+            for _ in range(COUNTED_ATTEMPTS):
+                ships = self._counter.sample(self._rng)
+                if ships is not None:
+                    return self._assign(ships)
+            self._counter = None
+            self._warn(f'no fleet was drawn within {COUNTED_ATTEMPTS} draws')
+        return self._search()
+
+    def _warn(self, reason: str) -> None:
+        """Warns that the fleets from now on are not uniformly distributed."""
+        warnings.warn(
+            f'fleets of {self._ship_sizes} on a {self._board_size}x'
+            f'{self._board_size} board are placed by search from now on, '
+            f'not uniformly: {reason}',
+            RuntimeWarning,
+            stacklevel=3,
+        )
+
+    def _redraw(self, rng: random.Random) -> Optional[list[int]]:
+        """Draws whole fleets until one has no overlaps, at most
+        REJECTION_ATTEMPTS times, returning its indices or None."""
+        randrange = rng.randrange
+        for _ in range(REJECTION_ATTEMPTS):
+            occupancy = 0
+            chosen = []
+            for masks in self._masks:
+                index = randrange(len(masks))
+                if masks[index] & occupancy:
+                    break
+                occupancy |= masks[index]
+                chosen.append(index)
+            else:
+                return chosen
+        return None
+
+    def _assign(self, ships: list[int]) -> list[int]:
+        """Gives the ships of a counted sample to the fleet's ships of the
+        same size at random, returning their segment indices."""
+        by_size = {}
+        for mask in ships:
+            by_size.setdefault(mask.bit_count(), []).append(mask)
+        for masks in by_size.values():
+            self._rng.shuffle(masks)
+        return [
+            _segment_indices(self._board_size, size)[by_size[size].pop()]
+            for size in self._ship_sizes
+        ]
+
+    def _search(self) -> list[int]:
+        """Places the ships by randomized depth-first search."""
+        chosen = [0] * len(self._ship_sizes)
+        steps = [SEARCH_STEP_LIMIT]
+        if not self._place(0, 0, chosen, steps):
+            raise ValueError('the fleet does not fit on the board')
+        return chosen
+
+    def _place(
+        self, depth: int, occupancy: int, chosen: list[int], steps: list[int]
+    ) -> bool:
+        """Places ship depth onwards, given the squares taken so far.
+
+        Returns:
+            (bool): True if every remaining ship was placed
+        """
+        if depth == len(chosen):
+            return True
+        # Prune when the ships left cannot fit in the free squares
+        if self._board_size**2 - occupancy.bit_count() < self._areas[depth]:
+            return False
+
+        masks = self._masks[depth]
+        fitting = [
+            index for index, mask in enumerate(masks) if not mask & occupancy
+        ]
+        randrange = self._rng.randrange
+        while fitting:
+            steps[0] -= 1
+            if steps[0] < 0:
+                raise ValueError(
+                    f'no fleet found within {SEARCH_STEP_LIMIT} steps'
+                )
+            k = randrange(len(fitting))
+            index = fitting[k]
+            if self._place(depth + 1, occupancy | masks[index], chosen, steps):
+                chosen[depth] = index
+                return True
+            # A dead end: drop this choice and try another
+            fitting[k] = fitting[-1]
+            fitting.pop()
+        return False
+
+    def sample(self) -> list[list[Position]]:
+        """Samples a fleet.
+
+        Returns:
+            (list[list[Position]]): The squares of each ship, in order
+        """
+        return indices_to_fleet(
+            self._board_size, self._ship_sizes, self.sample_indices()
+        )
+
+    def sample_board(self) -> FleetBoard:
+        """Samples a fleet and places it on a new board.
+
+        Returns:
+            (FleetBoard): The board, with ship ids in fleet order
+        """
+        board = FleetBoard(self._board_size)
+        for ship in self.sample():
+            board.place_ship(ship)
+        return board
+
+
+def indices_to_fleet(
+    board_size: int, ship_sizes: list[int], indices: list[int]
+) -> list[list[Position]]:
+    """Converts segment indices from sample_indices or a fleet file back into
+        ships.
+
+    Parameters:
+        board_size (int): the dimension of the game board
+        ship_sizes (list[int]): the size of each ship
+        indices (list[int]): each ship's index into get_segments
+
+    Returns:
+        (list[list[Position]]): The squares of each ship
+    """
+    return [
+        list(get_segments(board_size, size)[index][1])
+        for size, index in zip(ship_sizes, indices)
+    ]
+
+
+def write_fleets(
+    path: str,
+    board_size: int,
+    ship_sizes: list[int],
+    count: int,
+    seed: Optional[int] = None,
+) -> None:
+    """Samples many fleets into a compact file of segment indices: two bytes
+        per ship on boards of up to 180 squares, otherwise four.
+
+    Parameters:
+        path (str): the file to write
+        board_size (int): the dimension of the game board
+        ship_sizes (list[int]): the size of each ship
+        count (int): the number of fleets
+        seed (Optional[int]): the seed for the random choices
+    """
+    generator = FleetGenerator(board_size, ship_sizes, seed)
+    typecode = _index_typecode(board_size, ship_sizes)
+    with open(path, 'wb') as file:
+        file.write(
+            HEADER.pack(MAGIC, board_size, len(ship_sizes), typecode.encode())
+        )
+        array('H', ship_sizes).tofile(file)
+        for start in range(0, count, WRITE_BATCH):
+            batch = array(typecode)
+            for _ in range(min(WRITE_BATCH, count - start)):
+                batch.extend(generator.sample_indices())
+            batch.tofile(file)
+
+
+def read_fleets(path: str) -> Iterator[list[list[Position]]]:
+    """Reads the fleets from a file written by write_fleets.
+
+    Parameters:
+        path (str): the file to read
+
+    Returns:
+        (Iterator[list[list[Position]]]): The squares of each ship of each
+                                          fleet, in order
+    """
+    with open(path, 'rb') as file:
+        magic, board_size, ship_count, typecode = HEADER.unpack(
+            file.read(HEADER.size)
+        )
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a fleet file')
+        ship_sizes = array('H')
+        ship_sizes.fromfile(file, ship_count)
+        typecode = typecode.decode()
+        if not ship_count:
+            return
+
+        record_size = ship_count * array(typecode).itemsize
+        while True:
+            data = file.read(record_size * WRITE_BATCH)
+            if not data:
+                return
+            indices = array(typecode, data)
+            for start in range(0, len(indices), ship_count):
+                yield indices_to_fleet(
+                    board_size,
+                    ship_sizes,
+                    indices[start : start + ship_count],
+                )
+
+
+def main() -> None:
+    """Writes random fleets to a file from the command line, e.g.
+    python fleet_gen.py fleets.bin 1000000 --board-size 10 --ship-sizes 5 4 3
+    """
+    parser = argparse.ArgumentParser(
+        description='Generate random battleship fleets in bulk'
+    )
+    parser.add_argument('output')
+    parser.add_argument('count', type=int)
+    parser.add_argument('--board-size', type=int, default=10)
+    parser.add_argument(
+        '--ship-sizes', type=int, nargs='+', default=[5, 4, 3, 3, 2]
+    )
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    write_fleets(
+        args.output, args.board_size, args.ship_sizes, args.count, args.seed
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        f'{args.count} fleets in {elapsed:.2f}s '
+        f'({args.count / elapsed:.0f} fleets/s)',
+        file=sys.stderr,
+    )
+
+
+if __name__ == '__main__':
+    main()
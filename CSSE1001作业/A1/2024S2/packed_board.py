@@ -0,0 +1,249 @@
+from typing import Iterator
+import numpy as np
+from support import *
+
+# The square of each 2 bit code. Attacking a square sets the low bit of its
+# code, and the high bit marks a ship.
+_SQUARES = (EMPTY_SQUARE, MISS_SQUARE, ACTIVE_SHIP_SQUARE, DEAD_SHIP_SQUARE)
+_CODES = {character: code for code, character in enumerate(_SQUARES)}
+# The square of each code as a byte, for rendering many squares at once
+_CHARACTERS = np.frombuffer(''.join(_SQUARES).encode(), dtype=np.uint8)
+SQUARES_PER_BYTE = 4
+_SHIFTS = np.arange(0, 8, 2, dtype=np.uint8)
+# For each code, the number of squares holding it in each possible byte
+_COUNT_TABLES = (
+    (np.arange(256, dtype=np.uint8)[:, None] >> _SHIFTS) & 3
+    == np.arange(4, dtype=np.uint8)[:, None, None]
+).sum(axis=2, dtype=np.uint8)
+# Bulk queries work through this many bytes at a time, so their temporary
+# arrays stay small on huge boards
+CHUNK_BYTES = 1 << 20
+
+
+class PackedBoard:
+    """A square game board stored with 2 bits per square, four squares per
+    byte, in a NumPy array with one row of bytes per board row. A 10000x10000
+    board takes 25 MB.
+
+    Squares are read and changed one at a time in O(1), as with Board, and
+    regions of the board are counted with vectorized table lookups over
+    whole bytes.
+    """
+
+    def __init__(self, board_size: int) -> None:
+        """Creates an empty board.
+
+        Parameters:
+            board_size (int): the size of the game board
+        """
+        self._size = board_size
+        self._row_bytes = -(-board_size // SQUARES_PER_BYTE)
+        self._bits = np.zeros((board_size, self._row_bytes), dtype=np.uint8)
+        # Indexing a memoryview is much faster than indexing the array for
+        # single squares
+        self._flat = memoryview(self._bits.reshape(-1))
+
+    @classmethod
+    def from_rows(cls, rows: list[str]) -> 'PackedBoard':
+        """Creates a board from the list[str] form used by a1.py.
+
+        Parameters:
+            rows (list[str]): one string of squares per row
+
+        Returns:
+            (PackedBoard): A board with the same squares
+        """
+        board = cls(len(rows))
+        lookup = np.zeros(256, dtype=np.uint8)
+        for character, code in _CODES.items():
+            lookup[ord(character)] = code
+        for row, squares in enumerate(rows):
+            codes = lookup[np.frombuffer(squares.encode(), dtype=np.uint8)]
+            board._bits[row] = board._pack(codes)
+        return board
+
+    def _pack(self, codes: np.ndarray) -> np.ndarray:
+        """Packs one row of square codes into bytes."""
+        padded = np.zeros(self._row_bytes * SQUARES_PER_BYTE, dtype=np.uint8)
+        padded[: len(codes)] = codes
+        return (
+            padded.reshape(-1, SQUARES_PER_BYTE) << _SHIFTS
+        ).sum(axis=1, dtype=np.uint8)
+
+    def _unpack(
+        self, top: int, left: int, bottom: int, right: int
+    ) -> np.ndarray:
+        """Returns the square codes of a region as a 2D array."""
+        first, last = left // SQUARES_PER_BYTE, -(-right // SQUARES_PER_BYTE)
+        codes = (self._bits[top:bottom, first:last, None] >> _SHIFTS) & 3
+        codes = codes.reshape(bottom - top, -1)
+        offset = first * SQUARES_PER_BYTE
+        return codes[:, left - offset : right - offset]
+
+    def to_rows(self) -> list[str]:
+        """Renders the board to the list[str] form used by a1.py.
+
+        Returns:
+            (list[str]): one string of squares per row
+        """
+        return list(self)
+
+    def copy(self) -> 'PackedBoard':
+        """Returns an independent copy of the board."""
+        board = PackedBoard(self._size)
+        board._bits[:] = self._bits
+        return board
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[str]:
+        for row in range(self._size):
+            yield self.get_region(row, 0, row + 1, self._size)[0]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PackedBoard):
+            return np.array_equal(self._bits, other._bits)
+        return NotImplemented
+
+    def get_square(self, position: Position) -> str:
+        """Gets the character at the given position on the board.
+
+        Parameters:
+            position (Position): The position to inspect
+
+        Returns:
+            (str): The square at the supplied position
+        """
+        row, col = position
+        byte = self._flat[row * self._row_bytes + (col >> 2)]
+        return _SQUARES[(byte >> ((col & 3) << 1)) & 3]
+
+    def change_square(self, position: Position, character: str) -> None:
+        """Replaces the character at the given position, in place.
+
+        Parameters:
+            position (Position): The position to update
+            character (str): The square to set at the supplied position
+        """
+        row, col = position
+        index = row * self._row_bytes + (col >> 2)
+        shift = (col & 3) << 1
+        self._flat[index] = (self._flat[index] & ~(3 << shift)) | (
+            _CODES[character] << shift
+        )
+
+    def can_place_ship(self, ship: list[Position]) -> bool:
+        """Checks if every square of a proposed ship is empty.
+
+        Parameters:
+            ship (list[Position]): The positions which make up the ship
+
+        Returns:
+            (bool): True iff the ship can be placed without overlapping
+                    existing non-blank squares
+        """
+        for position in ship:
+            if self.get_square(position) != EMPTY_SQUARE:
+                return False
+        return True
+
+    def place_ship(self, ship: list[Position]) -> None:
+        """Places the ship consisting of the given squares on the board.
+
+        Parameters:
+            ship (list[Position]): The squares to place on
+        """
+        for position in ship:
+            self.change_square(position, ACTIVE_SHIP_SQUARE)
+
+    def attack(self, position: Position) -> None:
+        """Fires upon the supplied square, as attack in a1.py does: an active
+            ship square becomes dead, an empty one a miss, and others are
+            unchanged, which is setting the low bit of the code.
+
+        Parameters:
+            position (Position): The position to target in this attack
+        """
+        row, col = position
+        index = row * self._row_bytes + (col >> 2)
+        self._flat[index] |= 1 << ((col & 3) << 1)
+
+    def get_region(
+        self, top: int, left: int, bottom: int, right: int
+    ) -> list[str]:
+        """Renders part of the board, e.g. the part on screen of a huge board.
+
+        Parameters:
+            top (int): the first row
+            left (int): the first column
+            bottom (int): the row after the last
+            right (int): the column after the last
+
+        Returns:
+            (list[str]): one string of squares per row of the region
+        """
+        characters = _CHARACTERS[self._unpack(top, left, bottom, right)]
+        return [row.tobytes().decode() for row in characters]
+
+    def count_region(
+        self, character: str, top: int, left: int, bottom: int, right: int
+    ) -> int:
+        """Counts the squares holding a character in a rectangle of the board.
+            Whole bytes are counted by table lookup, and the squares sharing a
+            byte with the region's edges one column at a time.
+
+        Parameters:
+            character (str): The square to count
+            top (int): the first row
+            left (int): the first column
+            bottom (int): the row after the last
+            right (int): the column after the last
+
+        Returns:
+            (int): The number of matching squares
+        """
+        code = _CODES[character]
+        top, bottom = max(top, 0), min(bottom, self._size)
+        left, right = max(left, 0), min(right, self._size)
+        if top >= bottom or left >= right:
+            return 0
+
+        first = -(-left // SQUARES_PER_BYTE)
+        last = right // SQUARES_PER_BYTE
+        if first < last:
+            edges = list(range(left, first * SQUARES_PER_BYTE)) + list(
+                range(last * SQUARES_PER_BYTE, right)
+            )
+        else:
+            # The region has no whole bytes
+            edges = range(left, right)
+        total = 0
+        for col in edges:
+            shift = (col & 3) << 1
+            column = self._bits[top:bottom, col >> 2]
+            total += int(np.count_nonzero((column >> shift) & 3 == code))
+
+        if first < last:
+            table = _COUNT_TABLES[code]
+            step = max(1, CHUNK_BYTES // (last - first))
+            for start in range(top, bottom, step):
+                end = min(start + step, bottom)
+                chunk = self._bits[start:end, first:last]
+                total += int(table[chunk].sum(dtype=np.int64))
+        return total
+
+    def count(self, character: str) -> int:
+        """Counts the squares holding a character on the whole board.
+
+        Parameters:
+            character (str): The square to count
+
+        Returns:
+            (int): The number of matching squares
+        """
+        return self.count_region(character, 0, 0, self._size, self._size)
+
+    def get_player_hp(self) -> int:
+        """Returns the number of unhit ship squares left on the board."""
+        return self.count(ACTIVE_SHIP_SQUARE)
@@ -0,0 +1,199 @@
+import os
+import sys
+from typing import Iterable, Optional, TextIO
+from support import *
+from coordinates import format_board
+
+# ANSI escape sequences
+CLEAR_SCREEN = '\x1b[2J\x1b[H'
+CLEAR_TO_END_OF_LINE = '\x1b[K'
+# Unchanged characters shorter than this between two changes are rewritten
+# rather than skipped, as moving the cursor costs about as many bytes
+MERGE_GAP = 6
+
+
+def render_player_state(
+    board: Iterable[str], player_name: str, show_ships: bool
+) -> str:
+    """Builds the text _display_player_state in a1.py prints for a player,
+        without the final newline.
+
+    Parameters:
+        board (Iterable[str]): The player's current board state
+        player_name (str): The name to display for this player
+        show_ships (bool): True iff active ships should be made visible
+
+    Returns:
+        (str): The player's lives line followed by their board
+    """
+    rows = list(board)
+    lives = sum(row.count(ACTIVE_SHIP_SQUARE) for row in rows)
+    unit = 'life' if lives == 1 else 'lives'
+    return (
+        f'{player_name}: {lives} {unit} remaining\n'
+        f'{format_board(rows, show_ships)}'
+    )
+
+
+def render_game(
+    p1_board: Iterable[str], p2_board: Iterable[str], show_ships: bool
+) -> str:
+    """Builds the whole text display_game in a1.py prints, in one string.
+
+    Parameters:
+        p1_board (Iterable[str]): The board state for player 1.
+        p2_board (Iterable[str]): The board state for player 2.
+        show_ships (bool): True iff active ships should be made visible
+
+    Returns:
+        (str): The frame, ending with a newline
+    """
+    return (
+        render_player_state(p1_board, PLAYER_ONE, show_ships)
+        + '\n'
+        + render_player_state(p2_board, PLAYER_TWO, show_ships)
+        + '\n'
+    )
+
+
+def _changed_runs(old: str, new: str) -> list[tuple[int, int]]:
+    """Finds the runs of characters of a line which need rewriting.
+
+    Parameters:
+        old (str): The line as last drawn
+        new (str): The line to draw
+
+    Returns:
+        (list[tuple[int, int]]): The start and end index of each run in new
+    """
+    runs = []
+    for col in range(len(new)):
+        if col < len(old) and old[col] == new[col]:
+            continue
+        if runs and col - runs[-1][1] <= MERGE_GAP:
+            runs[-1] = (runs[-1][0], col + 1)
+        else:
+            runs.append((col, col + 1))
+    return runs
+
+
+class FrameRenderer:
+    """Draws game frames with one write each.
+
+    In plain mode each frame is the same text display_game prints. In ANSI
+    mode the first frame clears the screen, and each later frame only moves
+    the cursor to and rewrites the characters which changed, so a spectator
+    display does not flicker.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, ansi: bool = False):
+        """Creates a renderer.
+
+        Parameters:
+            stream (Optional[TextIO]): where to draw, by default stdout
+            ansi (bool): True to only send the changes between frames
+        """
+        self._stream = sys.stdout if stream is None else stream
+        self._ansi = ansi
+        self._previous = None
+        self._bytes_written = 0
+
+    def get_bytes_written(self) -> int:
+        """Returns the number of bytes drawn so far."""
+        return self._bytes_written
+
+    def reset(self) -> None:
+        """Forgets the last frame, so the next one is drawn in full."""
+        self._previous = None
+
+    def draw_game(
+        self,
+        p1_board: Iterable[str],
+        p2_board: Iterable[str],
+        show_ships: bool,
+    ) -> None:
+        """Draws the game state, as display_game in a1.py prints it.
+
+        Parameters:
+            p1_board (Iterable[str]): The board state for player 1.
+            p2_board (Iterable[str]): The board state for player 2.
+            show_ships (bool): True iff active ships should be made visible
+        """
+        self.draw(render_game(p1_board, p2_board, show_ships))
+
+    def draw(self, frame: str) -> None:
+        """Draws a frame of text.
+
+        Parameters:
+            frame (str): The whole frame, one line per screen row
+        """
+        if not self._ansi:
+            self._write(frame)
+            return
+
+        lines = frame.split('\n')
+        if self._previous is None or len(lines) != len(self._previous):
+            self._write(CLEAR_SCREEN + frame)
+        else:
+            self._write(self._diff(self._previous, lines))
+        self._previous = lines
+
+    def _diff(self, old_lines: list[str], new_lines: list[str]) -> str:
+        """Builds the escape sequences turning one frame into another.
+
+        Parameters:
+            old_lines (list[str]): The lines as last drawn
+            new_lines (list[str]): The lines to draw
+
+        Returns:
+            (str): The cursor moves and characters to write, ending with the
+                   cursor after the frame
+        """
+        parts = []
+        for row, (old, new) in enumerate(zip(old_lines, new_lines)):
+            if old == new:
+                continue
+            for start, end in _changed_runs(old, new):
+                # ANSI rows and columns count from 1
+                parts.append(f'\x1b[{row + 1};{start + 1}H{new[start:end]}')
+            if len(new) < len(old):
+                parts.append(
+                    f'\x1b[{row + 1};{len(new) + 1}H{CLEAR_TO_END_OF_LINE}'
+                )
+        if parts:
+            parts.append(f'\x1b[{len(new_lines)};1H')
+        return ''.join(parts)
+
+    def _write(self, text: str) -> None:
+        """Writes text with as few system calls as possible: one, unless the
+            operating system accepts only part of it.
+        """
+        if not text:
+            return
+        data = text.encode()
+        self._bytes_written += len(data)
+        try:
+            fileno = self._stream.fileno()
+        except (AttributeError, OSError):
+            # Not a real file, e.g. io.StringIO
+            self._stream.write(text)
+            return
+
+        self._stream.flush()
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fileno, view) :]
+
+
+def display_game(
+    p1_board: Iterable[str], p2_board: Iterable[str], show_ships: bool
+) -> None:
+    """Displays the current game state, as display_game in a1.py does, but
+        with a single write.
+
+    Parameters:
+        p1_board (Iterable[str]): The board state for player 1.
+        p2_board (Iterable[str]): The board state for player 2.
+        show_ships (bool): True iff active ships should be made visible
+    """
+    FrameRenderer().draw_game(p1_board, p2_board, show_ships)
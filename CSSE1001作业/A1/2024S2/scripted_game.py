@@ -0,0 +1,203 @@
+import json
+import sys
+from typing import Iterable, Iterator, Optional
+from support import *
+from a1 import (
+    attack,
+    build_ship,
+    can_place_ship,
+    coordinate_to_position,
+    create_empty_board,
+    get_player_hp,
+    get_winner,
+    is_valid_coordinate,
+    is_valid_coordinate_sequence,
+    place_ship,
+)
+
+# Values of a result record's 'status'
+FINISHED = 'finished'
+SCRIPT_EXHAUSTED = 'script_exhausted'
+
+
+def _setup_board(
+    board_size: int,
+    ship_sizes: list[int],
+    placements: Iterator[str],
+    player: str,
+    errors: list[dict],
+) -> Optional[list[str]]:
+    """Places a player's ships from a script, as setup_board in a1.py does
+        from input, recording each rejected line instead of printing it.
+
+    Parameters:
+        board_size (int): the dimension of the game board
+        ship_sizes (list[int]): the size of each ship to be constructed
+        placements (Iterator[str]): the raw coordinate sequences to try
+        player (str): the player's name, for the error records
+        errors (list[dict]): where to record rejected lines
+
+    Returns:
+        (Optional[list[str]]) The board with every ship placed, or None if
+                              the script ran out first
+    """
+    board = create_empty_board(board_size)
+    ships_placed = 0
+    while ships_placed < len(ship_sizes):
+        next_ship_size = ship_sizes[ships_placed]
+        raw_coordinates = next(placements, None)
+        if raw_coordinates is None:
+            return None
+
+        is_valid, reason = is_valid_coordinate_sequence(
+            raw_coordinates, next_ship_size, board_size
+        )
+        if is_valid:
+            ship = build_ship(raw_coordinates)
+            if not can_place_ship(board, ship):
+                is_valid, reason = False, INVALID_SHIP_PLACEMENT
+        if not is_valid:
+            errors.append(
+                {
+                    'phase': 'placement',
+                    'player': player,
+                    'input': raw_coordinates,
+                    'message': reason,
+                }
+            )
+            continue
+
+        place_ship(board, ship)
+        ships_placed += 1
+
+    return board
+
+
+def play_scripted_game(
+    board_size: int,
+    ship_sizes: list[int],
+    p1_placements: Iterable[str],
+    p2_placements: Iterable[str],
+    attacks: Iterable[str],
+) -> dict:
+    """Plays a game of battleships from scripts instead of input, following
+        play_game in a1.py: the same validation, the same turn order, and a
+        rejected attack is retried by the same player with the next line.
+
+    Parameters:
+        board_size (int): the dimension of the game board
+        ship_sizes (list[int]): the size of each ship
+        p1_placements (Iterable[str]): player 1's coordinate sequences
+        p2_placements (Iterable[str]): player 2's coordinate sequences
+        attacks (Iterable[str]): the raw attack coordinates of both players,
+                                 in the order play_game would read them
+
+    Returns:
+        (dict): A JSON-ready record of the status (FINISHED, or
+                SCRIPT_EXHAUSTED if a script ran out first), the winner, the
+                number of attacks made, each player's hp, the rejected lines,
+                and both boards
+    """
+    errors = []
+    record = {
+        'status': SCRIPT_EXHAUSTED,
+        'winner': None,
+        'turns': 0,
+        'p1_hp': None,
+        'p2_hp': None,
+        'errors': errors,
+        'p1_board': None,
+        'p2_board': None,
+    }
+
+    # Board placement phase. Separate scripts may share one iterator, as
+    # run_input_script does, so make iterators rather than copies.
+    p1_placements = iter(p1_placements)
+    p2_placements = iter(p2_placements)
+    p1_board = _setup_board(
+        board_size, ship_sizes, p1_placements, PLAYER_ONE, errors
+    )
+    if p1_board is None:
+        return record
+    p2_board = _setup_board(
+        board_size, ship_sizes, p2_placements, PLAYER_TWO, errors
+    )
+    if p2_board is None:
+        return record
+
+    attacks = iter(attacks)
+    is_player_ones_turn = True
+    turns = 0
+    while True:
+        winner = get_winner(p1_board, p2_board)
+        if winner is not None:
+            record['status'] = FINISHED
+            record['winner'] = winner
+            break
+
+        if is_player_ones_turn:
+            target_board = p2_board
+            player = PLAYER_ONE
+        else:
+            target_board = p1_board
+            player = PLAYER_TWO
+
+        raw_coordinate = next(attacks, None)
+        if raw_coordinate is None:
+            break
+        is_valid, reason = is_valid_coordinate(raw_coordinate, len(target_board))
+        if not is_valid:
+            errors.append(
+                {
+                    'phase': 'attack',
+                    'player': player,
+                    'input': raw_coordinate,
+                    'message': reason,
+                }
+            )
+            continue
+
+        attack(target_board, coordinate_to_position(raw_coordinate))
+        turns += 1
+        is_player_ones_turn = not is_player_ones_turn
+
+    record['turns'] = turns
+    record['p1_hp'] = get_player_hp(p1_board)
+    record['p2_hp'] = get_player_hp(p2_board)
+    record['p1_board'] = p1_board
+    record['p2_board'] = p2_board
+    return record
+
+
+def run_input_script(lines: Iterable[str]) -> dict:
+    """Plays a game from the lines play_game in a1.py would read from input:
+        the board size, the ship sizes, both players' placements, then the
+        attacks.
+
+    Parameters:
+        lines (Iterable[str]): the input lines, with or without line endings
+
+    Returns:
+        (dict): The result record, see play_scripted_game
+    """
+    lines = (line.rstrip('\r\n') for line in lines)
+    board_size = int(next(lines))
+    ship_sizes = []
+    for item in next(lines).split(','):
+        ship_sizes.append(int(item))
+    return play_scripted_game(board_size, ship_sizes, lines, lines, lines)
+
+
+def main() -> None:
+    """Plays each script file named on the command line, printing one JSON
+    result record per line, e.g. python scripted_game.py game1.txt game2.txt
+    """
+    for path in sys.argv[1:]:
+        with open(path) as file:
+            record = run_input_script(file)
+        record['script'] = path
+        print(json.dumps(record))
+
+
+if __name__ == '__main__':
+    main()